@@ -0,0 +1,132 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of a capture larger than the collection in RAM, no device or
+#serial port involved. Sweeps are added to an RFESweepDataCollection limited to
+#RAM_SWEEPS with an RFESweepArchive attached, so the oldest ones are paged out to the
+#archive files. It measures the write rate, queries over the whole capture read from
+#the memory mapped files, FindTime, and the peak memory of the process, then checks
+#that a retune to wider sweeps goes on in a new segment of the archive. It requires
+#NumPy, and TOTAL_SWEEPS * points * 4 bytes of free disk in a temporary folder.
+#Usage: python RFE_Benchmark_Archive.py [points] [sweeps]
+#=====================================================================================
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+try:
+    import resource
+except ImportError:
+    resource = None     #not available in Windows
+from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFESweepDataCollection import RFESweepDataCollection
+from RFExplorer.RFESweepArchive import RFESweepArchive
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+SWEEP_POINTS = int(sys.argv[1]) if (len(sys.argv) > 1) else 4096      #data points of every sweep
+TOTAL_SWEEPS = int(sys.argv[2]) if (len(sys.argv) > 2) else 10000     #sweeps added, most of them only in the archive
+RAM_SWEEPS = 500            #sweeps kept in RAM by the collection
+
+def CreateSweeps(nCount, nPoints):
+    arrSweeps = []
+    for _ in range(nCount):
+        objSweep = RFESweepData(100.0, 0.001, nPoints)
+        objSweep.ProcessReceivedBytes(os.urandom(nPoints), 0.0)
+        arrSweeps.append(objSweep)
+    return arrSweeps
+
+def PeakMemoryMB():
+    if (resource is None):
+        return 0.0
+    nMaxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return nMaxRSS / (1024.0 * 1024.0) if (sys.platform == "darwin") else nMaxRSS / 1024.0
+
+def ReportTime(sName, fStart):
+    print(sName + ": " + "{0:.1f}".format((time.perf_counter() - fStart) * 1000) + "ms")
+
+def CheckRetune(sArchiveFolder):
+    #autogrow collection paging 112 point sweeps out, then a sweep of a wider configuration
+    objArchive = RFESweepArchive()
+    objArchive.Open(sArchiveFolder)
+    objCollection = RFESweepDataCollection(20, True)
+    objCollection.Capacity = 20
+    objCollection.Archive = objArchive
+    arrSweeps = CreateSweeps(50, 112) + CreateSweeps(1, 4096)
+    bAdded = all(objCollection.Add(objSweep) for objSweep in arrSweeps)
+    objOldest = objCollection.GetData(0)
+    objNewest = objCollection.GetData(objCollection.UpperBound)
+    bOK = (bAdded and (objCollection.Archive is objArchive) and (not objCollection.IsFull()) and (objCollection.Count == 51) and
+           (objArchive.Segments == 2) and (objOldest.TotalDataPoints == 112) and (objNewest.TotalDataPoints == 4096) and
+           (list(objOldest.m_arrAmplitude) == list(arrSweeps[0].m_arrAmplitude)) and (list(objNewest.m_arrAmplitude) == list(arrSweeps[-1].m_arrAmplitude)))
+    objCollection.Archive = None
+    bOK = bOK and objCollection.Add(arrSweeps[-1]) and (not objCollection.IsFull())     #without archive it keeps the last sweeps
+    objOldest = None
+    objNewest = None
+    objArchive.Close()
+    print("Retune from 112 to 4096 points: " + ("OK" if bOK else "FAILED") + ", " + str(objCollection.Count) + " sweeps after removing the archive")
+    return bOK
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+if (not RFESweepData.IsNumPyAvailable()):
+    print("NumPy is required")
+    sys.exit(1)
+
+sFolder = tempfile.mkdtemp()
+try:
+    print(str(SWEEP_POINTS) + " points, " + str(TOTAL_SWEEPS) + " sweeps, " + str(RAM_SWEEPS) + " in RAM")
+    arrTestSweeps = CreateSweeps(50, SWEEP_POINTS)
+    print("Peak memory before the capture: " + "{0:.0f}".format(PeakMemoryMB()) + "MB")
+
+    objArchive = RFESweepArchive()
+    objArchive.Open(sFolder)
+    objCollection = RFESweepDataCollection(RAM_SWEEPS, True)
+    objCollection.Capacity = RAM_SWEEPS
+    objCollection.Archive = objArchive
+    dtStart = datetime.now()
+    fStart = time.perf_counter()
+    for nInd in range(TOTAL_SWEEPS):
+        objTestSweep = arrTestSweeps[nInd % len(arrTestSweeps)]
+        objTestSweep.CaptureTime = dtStart + timedelta(milliseconds=nInd)     #a sweep every ms, for FindTime
+        objCollection.Add(objTestSweep)
+    objArchive.Flush()
+    fElapsed = time.perf_counter() - fStart
+    print("Add: " + "{0:.0f}".format(TOTAL_SWEEPS / fElapsed) + " sweeps/s, " + "{0:.0f}".format(TOTAL_SWEEPS * objArchive.RowBytes / fElapsed / 1e6) +
+          "MB/s, " + str(objCollection.Count) + " sweeps, " + str(objCollection.PagedOut) + " paged out")
+
+    fStart = time.perf_counter()
+    arrAmplitude = objCollection.GetAmplitudeArray(0, objCollection.UpperBound)
+    ReportTime("GetAmplitudeArray of " + "{0:.0f}".format(arrAmplitude.nbytes / 1e6) + "MB", fStart)
+    fStart = time.perf_counter()
+    objCollection.GetPowerAverage(0, objCollection.UpperBound)
+    ReportTime("GetPowerAverage of all sweeps", fStart)
+    fStart = time.perf_counter()
+    objCollection.GetMedianAverage(0, objCollection.UpperBound)
+    ReportTime("GetMedianAverage of all sweeps", fStart)
+    objMiddle = objCollection.GetData(TOTAL_SWEEPS // 2)
+    fStart = time.perf_counter()
+    for _ in range(1000):
+        objArchive.FindTime(objMiddle.CaptureTime)
+    print("FindTime: " + "{0:.1f}".format((time.perf_counter() - fStart) * 1000) + "us")
+    print("Peak memory, including pages of the archive files read: " + "{0:.0f}".format(PeakMemoryMB()) + "MB, archive of " + "{0:.0f}".format(objArchive.Count * objArchive.RowBytes / 1e6) + "MB")
+
+    arrAmplitude = None
+    objMiddle = None
+    objCollection.Archive = None
+    objArchive.Close()
+
+    if (not CheckRetune(os.path.join(sFolder, "retune"))):
+        sys.exit(1)
+finally:
+    shutil.rmtree(sFolder)
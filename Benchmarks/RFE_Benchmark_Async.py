@@ -0,0 +1,75 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of sweeps delivered to an asyncio coroutine from a simulated
+#spectrum analyzer over a pseudo-terminal (Linux/macOS only, no device needed).
+#It compares RFEAsyncCommunicator.Sweeps with a dispatcher thread bridged into the
+#event loop with call_soon_threadsafe, measuring the sweep latency.
+#=====================================================================================
+
+import asyncio
+import gc
+import statistics
+import time
+import RFExplorer
+from RFExplorer import RFE_Common
+from RFExplorer.RFEAsyncCommunicator import RFEAsyncCommunicator
+from RFExplorer.RFEDeviceSimulator import RFEDeviceSimulator
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+LATENCY_SWEEPS = 200    #sweeps measured in every test
+LATENCY_RATE = 50       #sweeps per second sent
+
+def Report(sName, arrLatencies):
+    arrLatencies.sort()
+    print(sName + ": latency median " + "{0:.3f}".format(statistics.median(arrLatencies)) + "ms p99 " + 
+          "{0:.3f}".format(arrLatencies[int(len(arrLatencies) * 0.99)]) + "ms")
+
+async def MeasureThreadBridge(objSimulator):
+    objLoop = asyncio.get_running_loop()
+    objSweeps = asyncio.Queue()
+    objRFE = RFExplorer.RFECommunicator()
+    objRFE.VerboseLevel = 0
+    objRFE.Subscribe(RFE_Common.eEvent.SWEEP, lambda objRFE, objSweep: objLoop.call_soon_threadsafe(objSweeps.put_nowait, objSweep))
+    objRFE.StartDispatcher()
+    await objLoop.run_in_executor(None, objRFE.ConnectPort, objSimulator.PortName, 500000, False)
+    await objLoop.run_in_executor(None, objRFE.WaitForModel)
+    arrLatencies = []
+    while (len(arrLatencies) < LATENCY_SWEEPS):
+        objSweep = await objSweeps.get()
+        arrLatencies.append((time.monotonic_ns() - objSimulator.GetSweepSentNS(objSweep)) / 1e6)
+    objRFE.SendCommand_Hold()
+    await objLoop.run_in_executor(None, objRFE.Close)
+    return arrLatencies
+
+async def MeasureAsync(objSimulator):
+    objRFE = RFEAsyncCommunicator()
+    objRFE.Communicator.VerboseLevel = 0
+    await objRFE.ConnectPort(objSimulator.PortName, 500000, False)
+    arrLatencies = []
+    async for objSweep in objRFE.Sweeps():
+        arrLatencies.append((time.monotonic_ns() - objSimulator.GetSweepSentNS(objSweep)) / 1e6)
+        if (len(arrLatencies) >= LATENCY_SWEEPS):
+            break
+    await objRFE.SendCommand("CH")
+    await objRFE.Close()
+    return arrLatencies
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+objSimulator = RFEDeviceSimulator(fSweepsPerSecond=LATENCY_RATE)
+if (objSimulator.Start()):
+    try:
+        Report("Dispatcher thread bridged ", asyncio.run(MeasureThreadBridge(objSimulator)))
+        gc.collect()    #RFECommunicator.__del__ sleeps, it must not run in the event loop of the next test
+        Report("RFEAsyncCommunicator      ", asyncio.run(MeasureAsync(objSimulator)))
+    finally:
+        objSimulator.Stop()
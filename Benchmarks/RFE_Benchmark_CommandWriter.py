@@ -0,0 +1,88 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of RFECommandWriter with a port that takes WRITE_MS for every
+#write, as a serial port does, no device needed. It measures how many commands a
+#burst of SendCommand calls costs in port writes, with frequency commands superseded
+#before being written, and checks that coalescing keeps the order of the commands
+#as they were sent.
+#=====================================================================================
+
+import threading
+import time
+from RFExplorer.RFECommandWriter import RFECommandWriter
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+WRITE_MS = 1.0          #time taken by every port write
+BURST_COMMANDS = 1000   #commands sent in the burst test
+
+class SlowPort:
+    def __init__(self):
+        self.m_arrWrites = []
+        self.m_hRelease = threading.Event()
+        self.m_hRelease.set()
+
+    def write(self, arrData):
+        self.m_hRelease.wait()
+        time.sleep(WRITE_MS / 1000.0)
+        self.m_arrWrites.append(arrData)
+
+class PortOwner:
+    #the members of RFECommunicator used by the writer
+    def __init__(self):
+        self.m_objSerialPort = SlowPort()
+        self.StreamRecorder = None
+        self.VerboseLevel = 0
+
+def QueueCommand(objWriter, sCommand):
+    return objWriter.QueueCommand(sCommand, ("#" + chr(len(sCommand) + 2) + sCommand).encode("latin_1"))
+
+def CheckOrder():
+    #a retune superseded while a hold waits behind it must still be written before the hold
+    objOwner = PortOwner()
+    objWriter = RFECommandWriter(objOwner)
+    objWriter.start()
+    objOwner.m_objSerialPort.m_hRelease.clear()
+    QueueCommand(objWriter, "r")
+    time.sleep(0.05)     #the writer is blocked writing "r", the next commands are pending
+    objFirst = QueueCommand(objWriter, "C2-F:A")
+    QueueCommand(objWriter, "CH")
+    objLast = QueueCommand(objWriter, "C2-F:B")
+    objOwner.m_objSerialPort.m_hRelease.set()
+    objWriter.Flush()
+    objWriter.Stop()
+    arrData = b"".join(objOwner.m_objSerialPort.m_arrWrites)
+    bOK = ((objFirst.result() is False) and (objLast.result() is True) and (b"C2-F:A" not in arrData) and
+           (0 <= arrData.find(b"C2-F:B") < arrData.find(b"CH")))
+    print("Order of coalesced commands: " + ("OK" if bOK else "FAILED") + ", written " + str(arrData))
+    return bOK
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+objOwner = PortOwner()
+objWriter = RFECommandWriter(objOwner)
+objWriter.start()
+fStart = time.perf_counter()
+for nInd in range(BURST_COMMANDS):
+    if (nInd % 2):
+        QueueCommand(objWriter, "C2-F:" + "{0:07d},{1:07d},-010,-120".format(5000000 + nInd, 5100000 + nInd))
+    else:
+        QueueCommand(objWriter, "CH")
+fQueued = time.perf_counter() - fStart
+objWriter.Flush()
+fElapsed = time.perf_counter() - fStart
+objWriter.Stop()
+print(str(BURST_COMMANDS) + " commands queued in " + "{0:.1f}".format(fQueued * 1000) + "ms, written in " + "{0:.1f}".format(fElapsed * 1000) +
+      "ms: " + str(objWriter.CommandsWritten) + " written, " + str(objWriter.CommandsCoalesced) + " coalesced, " + str(objWriter.Writes) +
+      " port writes of " + "{0:.1f}".format(WRITE_MS) + "ms")
+
+if (not CheckOrder()):
+    raise SystemExit(1)
@@ -0,0 +1,93 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the RF Explorer protocol framer. It builds synthetic streams
+#of large sweeps as sent by the device, including sweeps interrupted by EEOT and 
+#sweeps with corrupted tails, and replays them in chunks of different sizes to
+#measure frames/s and MB/s. No device is needed to run it.
+#=====================================================================================
+
+import time
+from RFExplorer import RFE_Common
+from RFExplorer.RFEProtocolFramer import RFEProtocolFramer
+from RFExplorer.RFESweepData import RFESweepData
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+SWEEP_POINTS = [4096, 16384, 65535]     #data points of the synthetic sweeps
+CHUNK_SIZES = [64, 4096, 65536]         #bytes per chunk fed to the framer, similar to USB reads of different sizes
+STREAM_SWEEPS = 100                     #sweeps in each synthetic stream
+EEOT_EVERY = 10                         #one sweep out of EEOT_EVERY is interrupted by EEOT
+CORRUPTED_EVERY = 25                    #one sweep out of CORRUPTED_EVERY has a corrupted tail
+DECODE = True                           #also decode amplitudes of every sweep frame, as the receive thread does
+
+def CreateSweep(nPoints, nSeed):
+    """Create a sweep frame with the shortest header valid for the number of points
+    """
+    arrData = bytes((nSeed + nInd) % 200 for nInd in range(nPoints))
+    if (nPoints < 256):
+        return b"$S" + bytes([nPoints]) + arrData + b"\r\n"
+    if (nPoints % 16 == 0 and nPoints <= 4096):
+        return b"$s" + bytes([(nPoints // 16) % 256]) + arrData + b"\r\n"
+    return b"$z" + bytes([nPoints >> 8, nPoints & 0xFF]) + arrData + b"\r\n"
+
+def CreateStream(nPoints):
+    """Create a synthetic stream with a configuration line followed by sweeps, some of them broken
+
+    Returns:
+        Bytes Stream, Integer number of complete sweeps in it
+    """
+    sConfig = "#C2-F:0500000,0010000,-010,-120,%05d,0,000,0240000,0960000,0100000,00110,0000,004\r\n" % (nPoints)
+    arrStream = bytearray(sConfig.encode("latin_1"))
+    nValidSweeps = 0
+    for nInd in range(STREAM_SWEEPS):
+        arrSweep = CreateSweep(nPoints, nInd)
+        if (nInd % EEOT_EVERY == EEOT_EVERY - 1):
+            arrStream += arrSweep[:len(arrSweep) // 2] + RFE_Common.CONST_EEOT_BYTES
+        elif (nInd % CORRUPTED_EVERY == CORRUPTED_EVERY - 1):
+            arrStream += arrSweep[:-10] + b"\r\n" + b"\x00" * 8 + b"\r\n"
+        else:
+            arrStream += arrSweep
+            nValidSweeps += 1
+    return bytes(arrStream), nValidSweeps
+
+def RunFramer(arrStream, nChunkSize):
+    """Feed the stream to a new framer in chunks of nChunkSize bytes
+
+    Returns:
+        Float elapsed seconds, Dictionary frame count per type
+    """
+    objFramer = RFEProtocolFramer()
+    dictFrames = {}
+    objStream = memoryview(arrStream)
+    fStart = time.perf_counter()
+    for nInd in range(0, len(objStream), nChunkSize):
+        for objFrame in objFramer.ProcessBytes(objStream[nInd:nInd + nChunkSize]):
+            if (DECODE and objFrame.Type == RFE_Common.eFrameType.SWEEP):
+                objSweep = RFESweepData(500.0, 0.01, len(objFrame.Data))
+                objSweep.ProcessReceivedBytes(objFrame.Data, 0)
+            dictFrames[objFrame.Type] = dictFrames.get(objFrame.Type, 0) + 1
+    fElapsed = time.perf_counter() - fStart
+    return fElapsed, dictFrames
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+print("NumPy decode: " + str(DECODE and RFESweepData.IsNumPyAvailable()))
+for nPoints in SWEEP_POINTS:
+    arrStream, nValidSweeps = CreateStream(nPoints)
+    for nChunkSize in CHUNK_SIZES:
+        fElapsed, dictFrames = RunFramer(arrStream, nChunkSize)
+        nSweeps = dictFrames.get(RFE_Common.eFrameType.SWEEP, 0)
+        nFrames = sum(dictFrames.values())
+        if (nSweeps != nValidSweeps):
+            print("ERROR: expected " + str(nValidSweeps) + " sweeps, received " + str(nSweeps))
+        print("{0:6d} points, chunk {1:6d} bytes: {2:9.1f} frames/s {3:9.1f} sweeps/s {4:8.1f} MB/s (EEOT {5}, corrupted {6})".format(
+              nPoints, nChunkSize, nFrames / fElapsed, nSweeps / fElapsed, len(arrStream) / fElapsed / 1e6, 
+              dictFrames.get(RFE_Common.eFrameType.EEOT, 0), dictFrames.get(RFE_Common.eFrameType.CORRUPTED, 0)))
@@ -0,0 +1,112 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the cost RFECommunicator.ProcessReceivedObject() adds to every
+#sweep depending on how sweeps are kept: stored in the SweepData collection, only the 
+#last one in the collection (StoreSweep = False) or only the latest one (LatestSweepOnly).
+#Sweeps are processed directly, no device or serial port involved, while a reader thread
+#polls LatestSweep as a live display would do. It also measures Publish and Get of 
+#RFELatestSweep alone. 
+#=====================================================================================
+
+import random
+import threading
+import time
+import RFExplorer
+from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFELatestSweep import RFELatestSweep
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+HOLDER_CALLS = 1000000     #calls measured in the RFELatestSweep test
+TOTAL_SWEEPS = 900          #below the SweepData capacity, so StoreSweep = True does not hold
+SWEEP_POINTS = 4096         #data points of every sweep
+
+def CreateSweeps(nCount):
+    arrSweeps = []
+    for _ in range(nCount):
+        objSweep = RFESweepData(100.0, 0.01, SWEEP_POINTS)
+        for nInd in range(SWEEP_POINTS):
+            objSweep.SetAmplitudeDBM(nInd, random.uniform(-110.0, -30.0))
+        arrSweeps.append(objSweep)
+    return arrSweeps
+
+def RunTest(arrSweeps, bStoreSweep, bLatestSweepOnly):
+    """Process TOTAL_SWEEPS sweeps with a reader thread polling LatestSweep
+
+    Returns:
+        Mean and 99th percentile microseconds per sweep, CPU seconds and sweeps seen by the reader
+    """
+    objRFE = RFExplorer.RFECommunicator()
+    objRFE.VerboseLevel = 0
+    objRFE.StatsEnabled = False
+    objRFE.StoreSweep = bStoreSweep
+    objRFE.LatestSweepOnly = bLatestSweepOnly
+    arrReaderSeen = [0]
+    bRun = [True]
+
+    def Reader():
+        nSequence = 0
+        while (True):
+            bLastRead = not bRun[0]
+            nSequence, objSweep = objRFE.LatestSweep.GetIfNewer(nSequence)
+            if (objSweep is not None):
+                arrReaderSeen[0] += 1
+            if (bLastRead):
+                break
+            time.sleep(0.001)
+
+    objReader = threading.Thread(target=Reader)
+    objReader.start()
+    arrTimes = []
+    fCPUStart = time.process_time()
+    for nInd in range(TOTAL_SWEEPS):
+        nStart = time.perf_counter_ns()
+        objRFE.ProcessReceivedObject(arrSweeps[nInd % len(arrSweeps)])
+        arrTimes.append(time.perf_counter_ns() - nStart)
+    fCPU = time.process_time() - fCPUStart
+    bRun[0] = False
+    objReader.join()
+    objRFE.Close()
+    arrTimes.sort()
+    return sum(arrTimes) / len(arrTimes) / 1000.0, arrTimes[int(len(arrTimes) * 0.99)] / 1000.0, fCPU, arrReaderSeen[0]
+
+def RunHolderTest(objSweep):
+    """Time Publish and Get of RFELatestSweep alone
+
+    Returns:
+        Nanoseconds per Publish and per Get
+    """
+    objLatest = RFELatestSweep()
+    fnPublish = objLatest.Publish
+    fnGet = objLatest.Get
+    nStart = time.perf_counter_ns()
+    for _ in range(HOLDER_CALLS):
+        fnPublish(objSweep)
+    nPublishNS = time.perf_counter_ns() - nStart
+    nStart = time.perf_counter_ns()
+    for _ in range(HOLDER_CALLS):
+        fnGet()
+    nGetNS = time.perf_counter_ns() - nStart
+    return nPublishNS / HOLDER_CALLS, nGetNS / HOLDER_CALLS
+
+def Report(sName, fMeanUS, fP99US, fCPU, nReaderSeen):
+    print(sName + ": mean " + "{0:.1f}".format(fMeanUS) + "us, p99 " + "{0:.1f}".format(fP99US) + "us per sweep, CPU " + 
+          "{0:.3f}".format(fCPU) + "s, reader saw " + str(nReaderSeen) + " sweeps")
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+arrTestSweeps = CreateSweeps(50)
+print(str(TOTAL_SWEEPS) + " sweeps of " + str(SWEEP_POINTS) + " points")
+Report("StoreSweep = True ", *RunTest(arrTestSweeps, True, False))
+Report("StoreSweep = False", *RunTest(arrTestSweeps, False, False))
+Report("LatestSweepOnly   ", *RunTest(arrTestSweeps, True, True))
+fPublishNS, fGetNS = RunHolderTest(arrTestSweeps[0])
+print("RFELatestSweep: Publish " + "{0:.0f}".format(fPublishNS) + "ns, Get " + "{0:.0f}".format(fGetNS) + "ns")
@@ -0,0 +1,138 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of many spectrum analyzers connected at the same time, simulated
+#over pseudo-terminals (Linux/macOS only, no device needed). It compares one receive and
+#dispatcher thread per device with a RFEDeviceManager reading all ports in one thread,
+#measuring threads used, CPU time, sweeps processed and sweep latency. It also checks
+#that a callback of the manager thread can reconfigure its device while the other
+#devices are still read.
+#=====================================================================================
+
+import gc
+import statistics
+import threading
+import time
+import RFExplorer
+from RFExplorer import RFE_Common
+from RFExplorer.RFEDeviceManager import RFEDeviceManager
+from RFExplorer.RFEDeviceSimulator import RFEDeviceSimulator
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+TOTAL_DEVICES = 16      #simulated analyzers
+SWEEP_RATE = 50         #sweeps per second sent by every analyzer
+TEST_SECONDS = 5        #duration of every test
+
+def RunTest(arrSimulators, fnCreateDevice):
+    """Connect one communicator to every simulator, process sweeps with the dispatcher for TEST_SECONDS
+
+    Returns:
+        Number of threads, CPU seconds, sweeps processed and list of latencies in ms
+    """
+    arrLatencies = []
+    arrDevices = []
+    for objSimulator in arrSimulators:
+        objRFE = fnCreateDevice()
+        objRFE.VerboseLevel = 0
+        objRFE.StoreSweep = False    #keep only the last sweep, so the buffer is never full
+        objRFE.Subscribe(RFE_Common.eEvent.SWEEP, lambda objRFE, objSweep, objSimulator=objSimulator: arrLatencies.append((time.monotonic_ns() - objSimulator.GetSweepSentNS(objSweep)) / 1e6))
+        objRFE.StartDispatcher()
+        objRFE.ConnectPort(objSimulator.PortName, 500000, False)
+        objRFE.WaitForModel()
+        arrDevices.append(objRFE)
+
+    del arrLatencies[:]
+    nSweepsStart = sum(objRFE.SweepsProcessed for objRFE in arrDevices)
+    fCPUStart = time.process_time()
+    time.sleep(TEST_SECONDS)
+    fCPU = time.process_time() - fCPUStart
+    nSweeps = sum(objRFE.SweepsProcessed for objRFE in arrDevices) - nSweepsStart
+    nThreads = threading.active_count() - len(arrSimulators) - 1     #simulator threads and main thread not counted
+    arrResult = list(arrLatencies)
+
+    for objRFE in arrDevices:
+        objRFE.SendCommand_Hold()
+        objRFE.Close()
+    arrDevices = None
+    gc.collect()    #RFECommunicator.__del__ sleeps, it must not run in a thread of the next test
+    return nThreads, fCPU, nSweeps, arrResult
+
+def CheckReconfigure(arrSimulators):
+    """A SWEEP callback of one device calls UpdateDeviceConfig, which must be confirmed while another device of the 
+    same RFEDeviceManager thread keeps processing sweeps
+
+    Returns:
+        True if the check passed
+    """
+    objManager = RFEDeviceManager()
+    arrDevices = []
+    for objSimulator in arrSimulators[:2]:
+        objRFE = objManager.CreateDevice()
+        objRFE.VerboseLevel = 0
+        objRFE.StoreSweep = False
+        objRFE.StartDispatcher()
+        objRFE.ConnectPort(objSimulator.PortName, 500000, False)
+        objRFE.WaitForModel()
+        arrDevices.append(objRFE)
+
+    arrResult = []
+    def OnSweep(objRFE, objSweep):
+        if (arrResult):
+            return
+        arrResult.append(None)      #a nested sweep must not reconfigure again
+        nOtherSweeps = arrDevices[1].SweepsProcessed
+        fStart = time.monotonic()
+        bConfirmed = objRFE.UpdateDeviceConfig(5010, 5090)
+        arrResult[0] = (bConfirmed, time.monotonic() - fStart, arrDevices[1].SweepsProcessed - nOtherSweeps)
+    arrDevices[0].Subscribe(RFE_Common.eEvent.SWEEP, OnSweep)
+    fDeadline = time.monotonic() + 5
+    while ((not arrResult or arrResult[0] is None) and (time.monotonic() < fDeadline)):
+        time.sleep(0.1)
+    nThreads = threading.active_count() - len(arrSimulators) - 1
+    for objRFE in arrDevices:
+        objRFE.SendCommand_Hold()
+        objRFE.Close()
+    objManager.Close()
+    arrDevices = None
+    gc.collect()
+
+    bOK = False
+    if (arrResult and arrResult[0]):
+        bConfirmed, fElapsed, nOtherSweeps = arrResult[0]
+        bOK = bConfirmed and (fElapsed < 1.0) and (nOtherSweeps > 0) and (nThreads == 1)
+        print("Reconfigure from a callback: " + ("OK" if bOK else "FAILED") + ", confirmed " + str(bConfirmed) + " in " + "{0:.0f}".format(fElapsed * 1000) +
+              "ms, " + str(nOtherSweeps) + " sweeps of the other device meanwhile, " + str(nThreads) + " manager threads")
+    else:
+        print("Reconfigure from a callback: FAILED, no sweep received")
+    return bOK
+
+def Report(sName, nThreads, fCPU, nSweeps, arrLatencies):
+    arrLatencies.sort()
+    print(sName + ": " + str(nThreads) + " threads, CPU " + "{0:.2f}".format(fCPU) + "s, " + str(nSweeps) + " sweeps, latency median " +
+          "{0:.2f}".format(statistics.median(arrLatencies)) + "ms p99 " + "{0:.2f}".format(arrLatencies[int(len(arrLatencies) * 0.99)]) + "ms")
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+arrSimulators = [RFEDeviceSimulator(fSweepsPerSecond=SWEEP_RATE) for _ in range(TOTAL_DEVICES)]
+for objSimulator in arrSimulators:
+    objSimulator.Start()
+try:
+    print(str(TOTAL_DEVICES) + " devices, " + str(SWEEP_RATE) + " sweeps/s each, " + str(TEST_SECONDS) + "s")
+    Report("Thread per device ", *RunTest(arrSimulators, RFExplorer.RFECommunicator))
+    objManager = RFEDeviceManager()
+    Report("RFEDeviceManager  ", *RunTest(arrSimulators, objManager.CreateDevice))
+    objManager.Close()
+    bReconfigureOK = CheckReconfigure(arrSimulators)
+finally:
+    for objSimulator in arrSimulators:
+        objSimulator.Stop()
+if (not bReconfigureOK):
+    raise SystemExit(1)
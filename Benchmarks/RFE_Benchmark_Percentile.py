@@ -0,0 +1,64 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of percentile traces with the largest sweeps, no device or serial 
+#port involved. It measures RFESweepDataCollection.GetPercentile over the whole 
+#collection, and the cost per sweep of RFESlidingPercentile tracking the median of the 
+#last WINDOW sweeps. It uses NumPy if installed, it is very slow without it.
+#Usage: python RFE_Benchmark_Percentile.py [points] [window]
+#=====================================================================================
+
+import os
+import sys
+import time
+from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFESweepDataCollection import RFESweepDataCollection
+from RFExplorer.RFESlidingPercentile import RFESlidingPercentile
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+SWEEP_POINTS = int(sys.argv[1]) if (len(sys.argv) > 1) else 65535     #data points of every sweep
+WINDOW = int(sys.argv[2]) if (len(sys.argv) > 2) else 1000            #sweeps in the collection and the sliding window
+SLIDING_SWEEPS = 200        #sweeps added to the sliding window after it is full
+
+def CreateSweeps(nCount, nPoints):
+    arrSweeps = []
+    for _ in range(nCount):
+        objSweep = RFESweepData(100.0, 0.001, nPoints)
+        objSweep.ProcessReceivedBytes(os.urandom(nPoints), 0.0)
+        arrSweeps.append(objSweep)
+    return arrSweeps
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+print("NumPy: " + str(RFESweepData.IsNumPyAvailable()) + ", " + str(SWEEP_POINTS) + " points, window of " + str(WINDOW) + " sweeps")
+arrTestSweeps = CreateSweeps(50, SWEEP_POINTS)
+
+objCollection = RFESweepDataCollection(WINDOW, False)
+for nInd in range(WINDOW):
+    objCollection.Add(arrTestSweeps[nInd % len(arrTestSweeps)])
+for fTestPercentile in (50.0, 10.0):
+    fStart = time.perf_counter()
+    objCollection.GetPercentile(0, objCollection.UpperBound, fTestPercentile)
+    print("GetPercentile " + str(fTestPercentile) + " of " + str(objCollection.Count) + " sweeps: " + "{0:.1f}".format((time.perf_counter() - fStart) * 1000) + "ms")
+objCollection = None
+
+objSliding = RFESlidingPercentile(WINDOW, 50.0)
+fStart = time.perf_counter()
+for nInd in range(WINDOW):
+    objSliding.Add(arrTestSweeps[nInd % len(arrTestSweeps)])
+print("RFESlidingPercentile filling the window: " + "{0:.2f}".format((time.perf_counter() - fStart) / WINDOW * 1000) + "ms per sweep")
+fStart = time.perf_counter()
+for nInd in range(SLIDING_SWEEPS):
+    objSliding.Add(arrTestSweeps[nInd % len(arrTestSweeps)])
+fAddMS = (time.perf_counter() - fStart) / SLIDING_SWEEPS * 1000
+fStart = time.perf_counter()
+objTrace = objSliding.Trace
+print("RFESlidingPercentile full window: " + "{0:.2f}".format(fAddMS) + "ms per sweep, Trace " + "{0:.2f}".format((time.perf_counter() - fStart) * 1000) + "ms")
@@ -0,0 +1,109 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the serial port discovery done by GetConnectedPorts, using
+#pseudo-terminals as fake serial ports (Linux/macOS only, no device needed).
+#It compares opening every port one after another with the concurrent probe, with
+#and without USB metadata identifying one of the ports as the CP210x bridge. A
+#pseudo-terminal opens in microseconds, so thread start up makes the concurrent probe
+#slower there. Then opens are made to take OPEN_MS, as USB serial drivers do, and
+#HUNG_PORTS ports to block for HUNG_SEC, as unreachable Bluetooth serial ports do,
+#which is where discovery time is spent with real ports.
+#=====================================================================================
+
+import os
+import time
+from serial.tools.list_ports_common import ListPortInfo
+import RFExplorer
+from RFExplorer import RFE_Common
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+TOTAL_PORTS = 32     #fake ports created
+REPEAT = 5           #times every test is repeated, best time is reported
+OPEN_MS = 20.0       #time to open a port in the slow open tests
+HUNG_PORTS = 2       #ports whose open blocks in the slow open tests
+HUNG_SEC = 3.0       #time the open of those ports blocks, longer than CONST_PORT_PROBE_TIMEOUT_SEC
+
+def CreatePorts(nPorts):
+    """Create pseudo-terminals described as serial ports without USB information
+
+    Returns:
+        List of master file descriptors and list of ListPortInfo
+    """
+    arrMasters = []
+    arrPorts = []
+    for _ in range(nPorts):
+        nMaster, nSlave = os.openpty()
+        objPort = ListPortInfo(os.ttyname(nSlave), skip_link_detection=True)
+        os.close(nSlave)
+        arrMasters.append(nMaster)
+        arrPorts.append(objPort)
+    return arrMasters, arrPorts
+
+def SlowOpen(fnIsConnectedPort, setHungPorts):
+    """Wrap IsConnectedPort so every open takes OPEN_MS, and HUNG_SEC for the ports in setHungPorts
+    """
+    def IsConnectedPort(sPortName):
+        time.sleep(HUNG_SEC if (sPortName in setHungPorts) else (OPEN_MS / 1000.0))
+        return fnIsConnectedPort(sPortName)
+    return IsConnectedPort
+
+def BestTime(fnTest, nRepeat=REPEAT):
+    """Run fnTest nRepeat times
+
+    Returns:
+        Best time in seconds and the last result of fnTest
+    """
+    fBest = None
+    objResult = None
+    for _ in range(nRepeat):
+        fStart = time.perf_counter()
+        objResult = fnTest()
+        fElapsed = time.perf_counter() - fStart
+        if (fBest is None or fElapsed < fBest):
+            fBest = fElapsed
+    return fBest, objResult
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+objRFE = RFExplorer.RFECommunicator()
+objRFE.VerboseLevel = 0
+arrMasters, arrPorts = CreatePorts(TOTAL_PORTS)
+try:
+    fTime, nValid = BestTime(lambda: len([objPort for objPort in arrPorts if objRFE.IsConnectedPort(objPort.device)]))
+    print("Sequential, " + str(TOTAL_PORTS) + " ports:      " + "{0:.4f}".format(fTime) + "s, " + str(nValid) + " valid")
+
+    fTime, arrValid = BestTime(lambda: objRFE.ProbePorts(arrPorts))
+    print("Concurrent, no USB metadata: " + "{0:.4f}".format(fTime) + "s, " + str(len(arrValid)) + " valid")
+
+    #describe one port as the CP210x bridge, the others as generic USB serial ports
+    for nIndex, objPort in enumerate(arrPorts):
+        objPort.vid, objPort.pid = RFE_Common.CONST_RFE_USB_IDS[0] if (nIndex == TOTAL_PORTS // 2) else (0x1234, 0x5678)
+    fTime, arrValid = BestTime(lambda: objRFE.ProbePorts(arrPorts))
+    print("Concurrent, CP210x filtered: " + "{0:.4f}".format(fTime) + "s, " + str(len(arrValid)) + " valid, best: " + arrValid[0].device + " rank " + str(objRFE.GetPortRank(arrValid[0].device)))
+
+    #no USB metadata again, so every port is tried, with slow and hung opens
+    for objPort in arrPorts:
+        objPort.vid, objPort.pid = None, None
+    setHung = set()
+    objRFE.IsConnectedPort = SlowOpen(objRFE.IsConnectedPort, setHung)
+    for nHungPorts in (0, HUNG_PORTS):
+        setHung.update(objPort.device for objPort in arrPorts[:nHungPorts])
+        print("Opens of " + "{0:.0f}".format(OPEN_MS) + "ms, " + str(nHungPorts) + " ports blocking " + "{0:.1f}".format(HUNG_SEC) + "s:")
+        fTime, nValid = BestTime(lambda: len([objPort for objPort in arrPorts if objRFE.IsConnectedPort(objPort.device)]), 1)
+        print("Sequential, " + str(TOTAL_PORTS) + " ports:      " + "{0:.4f}".format(fTime) + "s, " + str(nValid) + " valid")
+        fTime, arrValid = BestTime(lambda: objRFE.ProbePorts(arrPorts), 1)
+        print("Concurrent, no USB metadata: " + "{0:.4f}".format(fTime) + "s, " + str(len(arrValid)) + " valid")
+    time.sleep(HUNG_SEC)    #probes left blocked finish before the ports are closed
+finally:
+    for nMaster in arrMasters:
+        os.close(nMaster)
+    objRFE.Close()
@@ -0,0 +1,133 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the handoff between the receive thread and the consumer, with
+#no device or serial port involved. A producer thread queues sweeps in reads of several
+#frames, as the receive thread does, while a consumer thread processes them. It compares
+#the former queue.Queue wrapped in an extra lock, put/get of one object at a time and
+#put_many/get_many of RFEReceiveQueue, measuring throughput, CPU time and lock operations.
+#=====================================================================================
+
+import queue
+import threading
+import time
+from RFExplorer.RFEReceiveQueue import RFEReceiveQueue
+from RFExplorer.RFESweepData import RFESweepData
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+TOTAL_SWEEPS = 200000       #sweeps queued in every test
+FRAMES_PER_READ = 16        #sweeps framed from every read of the port
+
+class LockedQueue:
+    """Handoff as it was done before RFEReceiveQueue: queue.Queue plus a lock around every put, and around qsize and
+    get_nowait in the consumer
+    """
+    def __init__(self):
+        self.m_objQueue = queue.Queue()
+        self.m_hQueueLock = threading.Lock()
+        self.m_nLockOperations = 0
+
+    def Publish(self, arrObjects):
+        for objNew in arrObjects:
+            self.m_hQueueLock.acquire()
+            self.m_objQueue.put(objNew)
+            self.m_hQueueLock.release()
+            self.m_nLockOperations += 2         #our lock and the one inside queue.Queue
+
+    def Drain(self):
+        arrObjects = []
+        while (True):
+            self.m_hQueueLock.acquire()
+            try:
+                self.m_nLockOperations += 2
+                if (self.m_objQueue.qsize() == 0):
+                    break
+                arrObjects.append(self.m_objQueue.get_nowait())
+                self.m_nLockOperations += 1
+            finally:
+                self.m_hQueueLock.release()
+        if (not arrObjects):
+            time.sleep(0.0002)                  #as a ProcessReceivedString loop does
+        return arrObjects
+
+class SingleQueue:
+    """RFEReceiveQueue used one object at a time, as a queue.Queue
+    """
+    def __init__(self):
+        self.m_objQueue = RFEReceiveQueue(0)
+        self.m_nLockOperations = 0
+
+    def Publish(self, arrObjects):
+        for objNew in arrObjects:
+            self.m_objQueue.put(objNew)
+            self.m_nLockOperations += 1
+
+    def Drain(self):
+        self.m_nLockOperations += 1
+        try:
+            return [self.m_objQueue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+class BatchQueue:
+    """RFEReceiveQueue used by batches, as the receive thread and the dispatcher do now
+    """
+    def __init__(self):
+        self.m_objQueue = RFEReceiveQueue(0)
+        self.m_nLockOperations = 0
+
+    def Publish(self, arrObjects):
+        self.m_objQueue.put_many(arrObjects)
+        self.m_nLockOperations += 1
+
+    def Drain(self):
+        self.m_nLockOperations += 1
+        return self.m_objQueue.get_many(timeout=0.1)
+
+def RunTest(objHandoff):
+    """Queue TOTAL_SWEEPS sweeps from a producer thread and consume them in this thread
+
+    Returns:
+        Seconds elapsed, CPU seconds, lock operations and number of drains returning sweeps
+    """
+    objSweep = RFESweepData(100.0, 0.1, 112)
+    arrRead = [objSweep] * FRAMES_PER_READ
+
+    def Producer():
+        for _ in range(TOTAL_SWEEPS // FRAMES_PER_READ):
+            objHandoff.Publish(arrRead)
+
+    objProducer = threading.Thread(target=Producer)
+    fCPUStart = time.process_time()
+    fStart = time.perf_counter()
+    objProducer.start()
+    nReceived = 0
+    nDrains = 0
+    while (nReceived < TOTAL_SWEEPS):
+        arrObjects = objHandoff.Drain()
+        if (arrObjects):
+            nDrains += 1
+            nReceived += len(arrObjects)
+    fElapsed = time.perf_counter() - fStart
+    fCPU = time.process_time() - fCPUStart
+    objProducer.join()
+    return fElapsed, fCPU, objHandoff.m_nLockOperations, nDrains
+
+def Report(sName, fElapsed, fCPU, nLockOperations, nDrains):
+    print(sName + ": " + "{0:.0f}".format(TOTAL_SWEEPS / fElapsed) + " sweeps/s, CPU " + "{0:.2f}".format(fCPU) + "s, " +
+          str(nLockOperations) + " lock operations, " + str(nDrains) + " drains")
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+print(str(TOTAL_SWEEPS) + " sweeps, " + str(FRAMES_PER_READ) + " sweeps per read")
+Report("queue.Queue + lock     ", *RunTest(LockedQueue()))
+Report("RFEReceiveQueue get    ", *RunTest(SingleQueue()))
+Report("RFEReceiveQueue batched", *RunTest(BatchQueue()))
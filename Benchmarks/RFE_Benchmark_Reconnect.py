@@ -0,0 +1,64 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the setup time of a collector restarting, connected to a
+#simulated signal generator over a pseudo-terminal (Linux/macOS only, no device needed).
+#It measures the time until the model and the internal calibration data are available,
+#without device cache and with a device cache populated by a previous connection.
+#=====================================================================================
+
+import os
+import tempfile
+import time
+import RFExplorer
+from RFExplorer import RFE_Common
+from RFExplorer.RFEDeviceCache import RFEDeviceCache
+from RFExplorer.RFEDeviceSimulator import RFEDeviceSimulator
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+CALIBRATION_DELAY_SEC = 1.0     #time the simulator takes to send the calibration data, as a real device dump
+RESTARTS = 3                    #collector restarts measured with every setting
+
+def Restart(sPortName, sCacheFileName):
+    """Connect as a new collector process would do, and close
+
+    Returns:
+        Seconds until model and calibration data were available, and True if calibration data was available
+    """
+    objRFE = RFExplorer.RFECommunicator()
+    objRFE.VerboseLevel = 0
+    if (sCacheFileName):
+        objRFE.DeviceCache = RFEDeviceCache(sCacheFileName)
+    fStart = time.perf_counter()
+    objRFE.ConnectPort(sPortName, 500000, False)     #a pseudo-terminal is not found by GetConnectedPorts
+    bOk = objRFE.WaitForModel() and objRFE.WaitForGeneratorCalibration()
+    fElapsed = time.perf_counter() - fStart
+    objRFE.Close()
+    return fElapsed, bOk
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+objSimulator = RFEDeviceSimulator(eModel=RFE_Common.eModel.MODEL_RFGEN, bGenerator=True)
+objSimulator.CalibrationDelaySec = CALIBRATION_DELAY_SEC
+if (objSimulator.Start()):
+    sCacheFileName = os.path.join(tempfile.mkdtemp(), RFE_Common.CONST_DEVICE_CACHE_FILE)
+    try:
+        for sName, sFileName in (("No cache", None), ("Device cache", sCacheFileName)):
+            for nRestart in range(RESTARTS):
+                nCalibrationRequests = objSimulator.CommandsReceived.count("Cq")
+                fElapsed, bOk = Restart(objSimulator.PortName, sFileName)
+                print(sName + " restart " + str(nRestart) + ": " + "{0:.3f}".format(fElapsed) + "s to calibrated, " +
+                      str(objSimulator.CommandsReceived.count("Cq") - nCalibrationRequests) + " calibration requests" + ("" if bOk else " - FAILED"))
+    finally:
+        objSimulator.Stop()
+        if (os.path.isfile(sCacheFileName)):
+            os.remove(sCacheFileName)
+        os.rmdir(os.path.dirname(sCacheFileName))
@@ -0,0 +1,87 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the full receive pipeline using a stream recorded from a real
+#device with RFECommunicator.StartRecording(). The recording is replayed through the
+#receive thread and ProcessReceivedString(), as fast as possible or with original 
+#timing, and the sweeps processed per second are reported. No device is needed.
+#Usage: python RFE_Benchmark_Replay.py recording_file [realtime]
+#=====================================================================================
+
+import sys
+import time
+import RFExplorer
+from RFExplorer import RFE_Common
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+if (len(sys.argv) < 2):
+    print("Usage: python RFE_Benchmark_Replay.py recording_file [realtime]")
+    sys.exit(1)
+
+RECORDING_FILE = sys.argv[1]
+REALTIME = (len(sys.argv) > 2 and sys.argv[2] == "realtime")    #False to replay as fast as possible
+
+objRFE = RFExplorer.RFECommunicator()     #Initialize object and thread
+objRFE.VerboseLevel = 0
+objRFE.StoreSweep = False   #keep only the last sweep, so a long recording does not fill SweepData and hold the capture
+g_nFinishedNS = None        #time.monotonic_ns() when all recorded bytes were seen read
+g_nIdleReadNS = None        #end of the first read of the receive thread after that
+g_fLastSweep = 0.0          #time.perf_counter() when the last sweep was processed
+
+def OnSweep(objRFE, objSweep):
+    global g_fLastSweep     #pylint: disable=global-statement
+    g_fLastSweep = time.perf_counter()
+
+def IsReplayDone():
+    """True when the whole recording was read, framed and processed. Bytes of a frame cut at the end of the recording, 
+    as StopRecording leaves it while streaming, stay in the framer waiting for more, so they are not waited for
+
+    Returns:
+        Boolean True when nothing else will be processed
+    """
+    global g_nFinishedNS, g_nIdleReadNS     #pylint: disable=global-statement
+    if (not objRFE.m_objSerialPort.IsFinished):
+        return False
+    nLastReadNS = objRFE.m_objThread.m_nLastReadNS
+    if (g_nFinishedNS is None):
+        g_nFinishedNS = time.monotonic_ns()
+    elif (g_nIdleReadNS is None):
+        if (nLastReadNS > g_nFinishedNS):
+            g_nIdleReadNS = nLastReadNS
+    elif (nLastReadNS > g_nIdleReadNS):
+        #the read which got the last bytes may end after they were seen read, but once another read ends the receive
+        #thread queued everything it got
+        return objRFE.m_objQueue.empty()
+    return False
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+try:
+    if (objRFE.ConnectReplayFile(RECORDING_FILE, REALTIME)):
+        objRFE.Subscribe(RFE_Common.eEvent.SWEEP, OnSweep)
+        fStart = time.perf_counter()
+        while (not objRFE.WaitForCondition(IsReplayDone, RFE_Common.CONST_READ_TIMEOUT_SEC)):
+            pass    #received data is processed while waiting, without polling
+        #idle detection time is not part of the replay
+        fElapsed = (g_fLastSweep if (g_fLastSweep > fStart) else time.perf_counter()) - fStart
+        nBytes = objRFE.m_objThread.m_objFramer.TotalBytes
+        nSweeps = objRFE.SweepsProcessed
+        print("Replayed {0} bytes in {1:.3f} seconds: {2} sweeps, {3:.1f} sweeps/s, {4:.1f} MB/s, {5} sweeps dropped by the receive queue".format(
+              nBytes, fElapsed, nSweeps, nSweeps / fElapsed, nBytes / fElapsed / 1e6, objRFE.m_objQueue.SweepsDropped))
+except Exception as obEx:
+    print("Error: " + str(obEx))
+
+#---------------------------------------------------------
+# Close object and release resources
+#---------------------------------------------------------
+
+objRFE.Close()    #Finish the thread and close port
+objRFE = None 
@@ -0,0 +1,122 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of the full RFECommunicator pipeline connected to a simulated
+#spectrum analyzer over a pseudo-terminal (Linux/macOS only, no device needed). 
+#It measures the connect and reconfigure time, the sustained sweep throughput at 
+#maximum rate and the end-to-end sweep latency for every receive thread read policy.
+#=====================================================================================
+
+import queue
+import time
+import RFExplorer
+from RFExplorer import RFE_Common
+from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFEDeviceSimulator import RFEDeviceSimulator
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+THROUGHPUT_POINTS = [112, 4096, 65535]  #sweep data points used in throughput tests
+THROUGHPUT_SECONDS = 3                  #duration of every throughput test
+LATENCY_SWEEPS = 100                    #sweeps measured in every latency test
+LATENCY_RATE = 20                       #sweeps per second sent in latency tests
+
+def ProcessFor(objRFE, fSeconds, fnStop=None):
+    """Process received data for some time, or until fnStop() returns True
+
+    Returns:
+        Integer number of sweeps processed
+    """
+    nSweeps = 0
+    fStart = time.perf_counter()
+    while ((time.perf_counter() - fStart) < fSeconds):
+        objRFE.ProcessReceivedString(True)
+        nSweeps += objRFE.SweepData.Count
+        bStop = (fnStop and fnStop())
+        objRFE.SweepData.CleanAll()
+        objRFE.HoldMode = False     #a full buffer in a single call must not stop the test
+        if (bStop):
+            break
+        time.sleep(0.0002)
+    return nSweeps
+
+def ReceiveFor(objRFE, fSeconds):
+    """Take sweeps directly from the receive queue for some time, so the receive thread (framing and decoding) 
+    is measured even when the simulator sends faster than ProcessReceivedString can process
+
+    Returns:
+        Integer number of sweeps received
+    """
+    nSweeps = 0
+    fStart = time.perf_counter()
+    while ((time.perf_counter() - fStart) < fSeconds):
+        try:
+            if (isinstance(objRFE.m_objQueue.get(timeout=0.1), RFESweepData)):
+                nSweeps += 1
+        except queue.Empty:
+            pass
+    return nSweeps
+
+def Connect(objSimulator, eReadPolicy):
+    objRFE = RFExplorer.RFECommunicator()
+    objRFE.VerboseLevel = 0
+    objRFE.ReadPolicy = eReadPolicy
+    fStart = time.perf_counter()
+    objRFE.ConnectPort(objSimulator.PortName, 500000, False)
+    objRFE.WaitForModel()
+    return objRFE, time.perf_counter() - fStart
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+objSimulator = RFEDeviceSimulator(nSweepPoints=112, fSweepsPerSecond=LATENCY_RATE)
+if (objSimulator.Start()):
+    try:
+        objRFE, fConnect = Connect(objSimulator, RFE_Common.eReadPolicy.LOW_LATENCY)
+        print("Connect time: {0:.3f} s".format(fConnect))
+
+        #reconfigure time, until the new configuration is confirmed by the device
+        objRFE.UpdateDeviceConfig(5200, 5300)
+        print("Reconfigure time: {0:.3f} s".format(objRFE.ConfigSettleSec))
+
+        #sustained throughput, simulator sending as fast as possible
+        objSimulator.SweepsPerSecond = 0
+        for nPoints in THROUGHPUT_POINTS:
+            objRFE.SendCommand_SweepDataPointsEx(nPoints)
+            ProcessFor(objRFE, 5, lambda: objRFE.FreqSpectrumSteps == nPoints - 1)
+            nSent = objSimulator.SweepsSent
+            nBytes = objSimulator.BytesSent
+            nSweeps = ReceiveFor(objRFE, THROUGHPUT_SECONDS)
+            nSent = objSimulator.SweepsSent - nSent
+            nBytes = objSimulator.BytesSent - nBytes
+            print("{0:6d} points: {1:8.1f} sweeps/s received, {2:8.1f} sweeps/s sent, {3:6.2f} MB/s".format(
+                  nPoints, nSweeps / THROUGHPUT_SECONDS, nSent / THROUGHPUT_SECONDS, nBytes / THROUGHPUT_SECONDS / 1e6))
+        objSimulator.SweepsPerSecond = LATENCY_RATE
+        objRFE.SendCommand_SweepDataPointsEx(RFE_Common.CONST_RFE_MIN_SWEEP_POINTS)
+        objRFE.SendCommand_Hold()   #do not leave large sweeps pending in the port for the next connection
+        ProcessFor(objRFE, 1)
+        objRFE.Close()
+
+        #end-to-end latency, from the sweep starting to be written to the sweep available to the consumer
+        for eReadPolicy in RFE_Common.eReadPolicy:
+            objRFE, fConnect = Connect(objSimulator, eReadPolicy)
+            ProcessFor(objRFE, 1)
+            arrLatency = []
+            while (len(arrLatency) < LATENCY_SWEEPS):
+                if (ProcessFor(objRFE, 1, lambda: objRFE.SweepData.Count > 0) > 0):
+                    arrLatency.append((time.monotonic_ns() - objSimulator.GetSweepSentNS(objRFE.LastSweep)) / 1e6)
+            arrLatency.sort()
+            print("{0:12s} latency: median {1:6.2f} ms, p95 {2:6.2f} ms, max {3:6.2f} ms".format(eReadPolicy.name,
+                  arrLatency[len(arrLatency) // 2], arrLatency[int(len(arrLatency) * 0.95)], arrLatency[-1]))
+            objRFE.SendCommand_Hold()
+            ProcessFor(objRFE, 0.5)
+            objRFE.Close()
+    except Exception as obEx:
+        print("Error: " + str(obEx))
+    objSimulator.Stop()
@@ -0,0 +1,90 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of RFESweepDataCollection, no device or serial port involved. It 
+#adds sweeps to a growing collection until it is full and to a ring buffer collection 
+#replacing its oldest sweeps, then reads every sweep back with GetData, reporting the 
+#microseconds per sweep. Then it measures GetLastAverage for several window lengths, with
+#and without CumulativeSums. It uses NumPy arrays if NumPy is installed.
+#=====================================================================================
+
+import random
+import time
+from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFESweepDataCollection import RFESweepDataCollection
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+TOTAL_SWEEPS = 5000         #sweeps added in every test
+CAPACITY = 1000             #max sweeps in the collection
+AVERAGE_SWEEPS = 200        #averages calculated in every window test
+
+def CreateSweeps(nCount, nPoints):
+    arrSweeps = []
+    for _ in range(nCount):
+        objSweep = RFESweepData(100.0, 0.01, nPoints)
+        objSweep.ProcessReceivedBytes(bytes(random.randrange(60, 240) for _ in range(nPoints)), 0.0)
+        arrSweeps.append(objSweep)
+    return arrSweeps
+
+def RunTest(arrSweeps, bAutogrow):
+    """Add TOTAL_SWEEPS sweeps, or until the collection is full, and read them back
+
+    Returns:
+        Microseconds per Add, microseconds per GetData and sweeps in the collection
+    """
+    objCollection = RFESweepDataCollection(64 if bAutogrow else CAPACITY, bAutogrow)
+    objCollection.Capacity = CAPACITY
+    nAdded = 0
+    fStart = time.perf_counter()
+    for nInd in range(TOTAL_SWEEPS):
+        if (not objCollection.Add(arrSweeps[nInd % len(arrSweeps)])):
+            break
+        nAdded += 1
+    fAddUS = (time.perf_counter() - fStart) / nAdded * 1e6
+    fStart = time.perf_counter()
+    for nInd in range(objCollection.Count):
+        objCollection.GetData(nInd)
+    fGetUS = (time.perf_counter() - fStart) / objCollection.Count * 1e6
+    return fAddUS, fGetUS, objCollection.Count
+
+def RunAverageTest(arrSweeps, bCumulativeSums, nWindow):
+    """Fill a ring buffer collection and ask for the average of the last nWindow sweeps after every new sweep
+
+    Returns:
+        Microseconds per GetLastAverage
+    """
+    objCollection = RFESweepDataCollection(CAPACITY, False)
+    objCollection.CumulativeSums = bCumulativeSums
+    for nInd in range(CAPACITY):
+        objCollection.Add(arrSweeps[nInd % len(arrSweeps)])
+    fTotal = 0.0
+    for nInd in range(AVERAGE_SWEEPS):
+        objCollection.Add(arrSweeps[nInd % len(arrSweeps)])
+        fStart = time.perf_counter()
+        objCollection.GetLastAverage(nWindow)
+        fTotal += time.perf_counter() - fStart
+    return fTotal / AVERAGE_SWEEPS * 1e6
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+print("NumPy backend: " + str(RFESweepDataCollection(1, False).NumPyBackend))
+for nTestPoints in (112, 4096):
+    arrTestSweeps = CreateSweeps(50, nTestPoints)
+    for bTestAutogrow in (True, False):
+        fTestAddUS, fTestGetUS, nTestCount = RunTest(arrTestSweeps, bTestAutogrow)
+        print(str(nTestPoints) + " points, " + ("autogrow" if bTestAutogrow else "ring    ") + ": Add " + "{0:.1f}".format(fTestAddUS) + 
+              "us, GetData " + "{0:.1f}".format(fTestGetUS) + "us per sweep, " + str(nTestCount) + " sweeps kept")
+
+if (RFESweepDataCollection(1, False).NumPyBackend):
+    arrTestSweeps = CreateSweeps(50, 4096)
+    for nTestWindow in (10, 100, 1000):
+        print("4096 points, average of last " + str(nTestWindow) + " sweeps: " + "{0:.1f}".format(RunAverageTest(arrTestSweeps, False, nTestWindow)) + 
+              "us, with CumulativeSums " + "{0:.1f}".format(RunAverageTest(arrTestSweeps, True, nTestWindow)) + "us")
@@ -0,0 +1,60 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=====================================================================================
+#This is a benchmark of RFETraceEngine, no device or serial port involved. It compares 
+#the microseconds per sweep of the max hold calculated point by point with 
+#GetAmplitudeDBM and SetAmplitudeDBM, as RFESweepDataCollection.Add did before, with 
+#RFETraceEngine updating max hold, min hold, average and EMA traces at once. It uses
+#NumPy if installed.
+#=====================================================================================
+
+import random
+import time
+from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFETraceEngine import RFETraceEngine
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+TOTAL_SWEEPS = 1000         #sweeps added in every test
+
+def CreateSweeps(nCount, nPoints):
+    arrSweeps = []
+    for _ in range(nCount):
+        objSweep = RFESweepData(100.0, 0.01, nPoints)
+        objSweep.ProcessReceivedBytes(bytes(random.randrange(60, 240) for _ in range(nPoints)), 0.0)
+        arrSweeps.append(objSweep)
+    return arrSweeps
+
+def PointMaxHold(arrSweeps):
+    objMaxHold = RFESweepData(arrSweeps[0].StartFrequencyMHZ, arrSweeps[0].StepFrequencyMHZ, arrSweeps[0].TotalDataPoints)
+    fStart = time.perf_counter()
+    for nSweep in range(TOTAL_SWEEPS):
+        SweepData = arrSweeps[nSweep % len(arrSweeps)]
+        nInd = 0
+        while nInd < SweepData.TotalDataPoints:
+            if (SweepData.GetAmplitudeDBM(nInd, None, False) > objMaxHold.GetAmplitudeDBM(nInd, None, False)):
+                objMaxHold.SetAmplitudeDBM(nInd, SweepData.GetAmplitudeDBM(nInd, None, False))
+            nInd += 1
+    return (time.perf_counter() - fStart) / TOTAL_SWEEPS * 1e6
+
+def TraceEngine(arrSweeps):
+    objTraces = RFETraceEngine()
+    fStart = time.perf_counter()
+    for nSweep in range(TOTAL_SWEEPS):
+        objTraces.Add(arrSweeps[nSweep % len(arrSweeps)])
+    return (time.perf_counter() - fStart) / TOTAL_SWEEPS * 1e6
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+print("NumPy: " + str(RFESweepData.IsNumPyAvailable()))
+for nTestPoints in (112, 4096):
+    arrTestSweeps = CreateSweeps(50, nTestPoints)
+    print(str(nTestPoints) + " points: max hold point by point " + "{0:.1f}".format(PointMaxHold(arrTestSweeps)) + 
+          "us, RFETraceEngine all traces " + "{0:.1f}".format(TraceEngine(arrTestSweeps)) + "us per sweep")
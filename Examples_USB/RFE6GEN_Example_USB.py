@@ -45,16 +45,16 @@ try:
         #Request RF Explorer Generator configuration
         objRFEGenerator.SendCommand_RequestConfigData()
         #Wait to receive configuration and model details
-        while(objRFEGenerator.ActiveModel == RFExplorer.RFE_Common.eModel.MODEL_NONE):
-            objRFEGenerator.ProcessReceivedString(True)    #Process the received configuration
+        while (not objRFEGenerator.WaitForModel()):    #Process the received configuration, without using CPU meanwhile
+            print("Waiting for device configuration...")
 
         #If object is a generator, we can continue the example
         if (objRFEGenerator.IsGenerator()):  
             #request internal calibration data, if available
             objRFEGenerator.SendCommand("Cq")
             objRFE6GENCal = objRFEGenerator.GetRFE6GENCal() #Object to manage the calibration data from generator
-            while (objRFE6GENCal.GetCalSize() < 0):    
-                objRFEGenerator.ProcessReceivedString(True)    #Process the received configuration
+            while (not objRFEGenerator.WaitForGeneratorCalibration()):    #Process the received calibration data
+                print("Waiting for calibration data...")
               
             #----------- Frequency Sweep Test Section -----------
             #Set Sweep Setting
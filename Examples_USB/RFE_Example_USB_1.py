@@ -65,8 +65,8 @@ try:
         #Request RF Explorer configuration
         objRFE.SendCommand_RequestConfigData()
         #Wait to receive configuration and model details
-        while(objRFE.ActiveModel == RFExplorer.RFE_Common.eModel.MODEL_NONE):
-            objRFE.ProcessReceivedString(True)    #Process the received configuration
+        while (not objRFE.WaitForModel()):    #Process the received configuration, without using CPU meanwhile
+            print("Waiting for device configuration...")
 
         #If object is an analyzer, we can scan for received sweeps
         if (objRFE.IsAnalyzer()):  
@@ -74,15 +74,13 @@ try:
             print("Receiving data...")
             objRFE.SweepData.CleanAll()
             #Process until we complete scan time
-            nLastDisplayIndex=0
+            nLastSweepIndex=objRFE.SweepsProcessed-1
             startTime=datetime.now()
             while ((datetime.now() - startTime).seconds<TOTAL_SECONDS):    
-                #Process all received data from device 
-                objRFE.ProcessReceivedString(True)
-                #Print data if received new sweep only
-                if (objRFE.SweepData.Count>nLastDisplayIndex):
+                #Process received data until a new sweep arrives, without using CPU meanwhile
+                if (objRFE.WaitForSweep(nLastSweepIndex, 1) is not None):
                     PrintPeak(objRFE)      
-                nLastDisplayIndex=objRFE.SweepData.Count
+                    nLastSweepIndex=objRFE.SweepsProcessed-1
         else:
             print("---- Signal Generator Example ----")
             objRFE.RFGenCWFrequencyMHZ = 500;
@@ -107,8 +107,8 @@ try:
         objRFE.SendCommand_RequestConfigData()
 
         #Wait to receive configuration and model details
-        while(objRFE.ActiveModel == RFExplorer.RFE_Common.eModel.MODEL_NONE):
-            objRFE.ProcessReceivedString(True)    #Process the received configuration
+        while (not objRFE.WaitForModel()):    #Process the received configuration, without using CPU meanwhile
+            print("Waiting for device configuration...")
 
         #If object is an analyzer, we can scan for received sweeps
         if(objRFE.IsAnalyzer()):
@@ -123,21 +123,15 @@ try:
             if(SpanSize and StartFreq and StopFreq):
                 nInd = 0
                 while (True): 
-                    #Set new configuration into device
-                    objRFE.UpdateDeviceConfig(StartFreq, StopFreq)
-
-                    objSweep=None
-                    #Wait for new configuration to arrive (as it will clean up old sweep data)
-                    while(True):
-                        objRFE.ProcessReceivedString(True);
-                        if (objRFE.SweepData.Count>0):
-                            objSweep=objRFE.SweepData.GetData(objRFE.SweepData.Count-1)
-
-                            nInd += 1
-                            print("Freq range["+ str(nInd) + "]: " + str(StartFreq) +" - "+ str(StopFreq) + "MHz" )
-                            PrintPeak(objRFE)
-                        if(math.fabs(objRFE.StartFrequencyMHZ - StartFreq) <= 0.001):
-                                break
+                    #Set new configuration into device, it returns when the device confirms it (this also cleans up old sweep data)
+                    if (not objRFE.UpdateDeviceConfig(StartFreq, StopFreq)):
+                        print("Configuration not confirmed by the device")
+
+                    #Wait for the first sweep with the new configuration
+                    if (objRFE.WaitForSweep()):
+                        nInd += 1
+                        print("Freq range["+ str(nInd) + "]: " + str(StartFreq) +" - "+ str(StopFreq) + "MHz" )
+                        PrintPeak(objRFE)
   
                     #set new frequency range
                     StartFreq = StopFreq
@@ -154,8 +148,8 @@ try:
             #request internal calibration data, if available
             objRFE.SendCommand("Cq")
             objRFE6GENCal = objRFE.GetRFE6GENCal() #Object to manage the calibration data from generator
-            while (objRFE6GENCal.GetCalSize() < 0):    
-                objRFE.ProcessReceivedString(True)    #Process the received configuration
+            while (not objRFE.WaitForGeneratorCalibration()):    #Process the received calibration data
+                print("Waiting for calibration data...")
 
             objRFE.RFGenCWFrequencyMHZ = 500;
             if(objRFE.ExpansionBoardActive):
@@ -0,0 +1,86 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except, R0801
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#=======================================================================================
+#This is an example code for RFExplorer python functionality.
+#Display amplitude value in dBm and frequency in MHz of the maximum value of every sweep
+#received, using callbacks notified by the dispatcher thread instead of a polling loop.
+#In order to avoid USB issues, connect only RF Explorer Spectrum Analyzer to run this example
+#=======================================================================================
+
+import time
+import math
+import RFExplorer
+from RFExplorer import RFE_Common
+
+#---------------------------------------------------------
+# Helper functions
+#---------------------------------------------------------
+
+def OnModel(objAnalazyer, sLine):
+    """Called when the device model is received
+	"""
+    print("Model received: " + sLine)
+
+def OnConfig(objAnalazyer, objConfiguration):
+    """Called when a new configuration is received
+	"""
+    print("Configuration: " + str(objAnalazyer.StartFrequencyMHZ) + " - " + str(objAnalazyer.StopFrequencyMHZ) + "MHz")
+
+def OnSweep(objAnalazyer, objSweep):
+    """Called for every new sweep, prints the amplitude and frequency peak
+	"""
+    nStep = objSweep.GetPeakDataPoint()      #Get index of the peak
+    fAmplitudeDBM = objSweep.GetAmplitude_DBM(nStep)    #Get amplitude of the peak
+    fCenterFreq = objSweep.GetFrequencyMHZ(nStep)   #Get frequency of the peak
+    fCenterFreq = math.floor(fCenterFreq * 10 ** 3) / 10 ** 3   #truncate to 3 decimals
+
+    print("Sweep[" + str(objAnalazyer.SweepData.Count - 1) + "]: Peak: " + "{0:.3f}".format(fCenterFreq) + "MHz  " + str(fAmplitudeDBM) + "dBm")
+
+#---------------------------------------------------------
+# global variables and initialization
+#---------------------------------------------------------
+
+SERIALPORT = None    #serial port identifier, use None to autodetect
+BAUDRATE = 500000
+
+objRFE = RFExplorer.RFECommunicator()     #Initialize object and thread
+TOTAL_SECONDS = 10           #Initialize time span to display activity
+
+#---------------------------------------------------------
+# Main processing loop
+#---------------------------------------------------------
+
+try:
+    #Find and show valid serial ports
+    objRFE.GetConnectedPorts()
+
+    #Register callbacks and let the dispatcher thread process all received data
+    objRFE.Subscribe(RFE_Common.eEvent.MODEL, OnModel)
+    objRFE.Subscribe(RFE_Common.eEvent.CONFIG, OnConfig)
+    objRFE.Subscribe(RFE_Common.eEvent.SWEEP, OnSweep)
+    objRFE.StartDispatcher()
+
+    #Connect to available port
+    if (objRFE.ConnectPort(SERIALPORT, BAUDRATE)):
+        #Request RF Explorer configuration and wait for it without using CPU
+        objRFE.SendCommand_RequestConfigData()
+        if (objRFE.WaitForModel(10) and objRFE.IsAnalyzer()):
+            print("---- Spectrum Analyzer Example ----")
+            print("Receiving data...")
+            time.sleep(TOTAL_SECONDS)   #sweeps are printed by OnSweep meanwhile
+        else:
+            print("Error: Spectrum Analyzer configuration not received")
+    else:
+        print("Not Connected")
+except Exception as obEx:
+    print("Error: " + str(obEx))
+
+#---------------------------------------------------------
+# Close object and release resources
+#---------------------------------------------------------
+
+objRFE.Close()    #Finish the dispatcher and receive threads and close port
+objRFE = None
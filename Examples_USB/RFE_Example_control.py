@@ -70,8 +70,8 @@ try:
         #Request RF Explorer configuration
         objRFE.SendCommand_RequestConfigData()
         #Wait to receive configuration and model details
-        while(objRFE.ActiveModel == RFExplorer.RFE_Common.eModel.MODEL_NONE):
-            objRFE.ProcessReceivedString(True)    #Process the received configuration
+        while (not objRFE.WaitForModel()):    #Process the received configuration, without using CPU meanwhile
+            print("Waiting for device configuration...")
 
         while True:
             #create a list for saving the recorded values
@@ -83,16 +83,14 @@ try:
                 if (objRFE.IsAnalyzer()):
                     print("Receiving data...")
                     #Process until we complete scan time
-                    nLastDisplayIndex=0
+                    nLastSweepIndex=objRFE.SweepsProcessed-1
                     startTime=datetime.now()
                     while ((datetime.now() - startTime).seconds<TOTAL_SECONDS):
-                        #Process all received data from device
-                        objRFE.ProcessReceivedString(True)
-                        #Print data if received new sweep only
-                        if (objRFE.SweepData.Count>nLastDisplayIndex):
+                        #Process received data until a new sweep arrives, without using CPU meanwhile
+                        if (objRFE.WaitForSweep(nLastSweepIndex, 1) is not None):
                             peak_value = PrintPeak(objRFE)
                             sample_value.append(peak_value)
-                        nLastDisplayIndex=objRFE.SweepData.Count
+                            nLastSweepIndex=objRFE.SweepsProcessed-1
                     print ("The average values of the sampling values is:", round(np.mean(sample_value), 2), "dBm")
                 else:
                     print("Error: Device connected is a Signal Generator. \nPlease, connect a Spectrum Analyzer")
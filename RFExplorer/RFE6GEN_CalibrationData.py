@@ -395,6 +395,24 @@ class RFE6GEN_CalibrationData:
 		"""
         self.m_arrSignalGeneratorEmbeddedCalibrationActual30DBM = None
 
+    def GetCalData(self):
+        """Return a copy of the -30dBm adjusted values, to store them and restore them later with SetCalData
+
+        Returns:
+            List -30dBm adjusted values, None if there is no calibration data
+		"""
+        if (self.m_arrSignalGeneratorEmbeddedCalibrationActual30DBM):
+            return list(self.m_arrSignalGeneratorEmbeddedCalibrationActual30DBM)
+        return None
+
+    def SetCalData(self, arrActual30DBM):
+        """Restore -30dBm adjusted values previously returned by GetCalData
+
+        Parameters:
+            arrActual30DBM -- List of -30dBm adjusted values
+		"""
+        self.m_arrSignalGeneratorEmbeddedCalibrationActual30DBM = list(arrActual30DBM)
+
     def InitializeCal(self, nSize, sLine):
         """Initialize calibration data collection 
         
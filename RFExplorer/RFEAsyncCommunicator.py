@@ -0,0 +1,295 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import asyncio
+import threading
+import time
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFELogging import g_objCommunicatorLog
+from RFExplorer.RFExplorer import RFECommunicator
+
+class RFEAsyncCommunicator:
+    """asyncio front end of RFECommunicator. The port is read by the event loop as soon as it is readable, and all
+    received data is processed in the event loop thread, so sweeps are delivered to coroutines without any thread
+    in between. Must be created from a coroutine running in the event loop that will use it.
+    Ports which can not be watched by the event loop, such as Windows serial ports or replay files, are read every
+    CONST_MANAGER_POLL_SEC instead
+    """
+    def __init__(self):
+        self.m_objLoop = asyncio.get_running_loop()
+        self.m_objLoopThread = threading.current_thread()
+        self.m_objStateChanged = asyncio.Event()
+        self.m_arrSweepQueues = []      #list of (asyncio.Queue, max sweeps) of every Sweeps iterator
+        self.m_nFD = -1                 #file descriptor watched by the event loop, -1 if not watched
+        self.m_objPollHandle = None     #timer reading ports without file descriptor
+        self.m_bReading = False
+        self.m_bPaused = False
+        self.m_bDispatch = False
+        self.m_objRFE = RFECommunicator(self)
+        self.m_objRFE.CommandWriter.start()    #port writes may block, they are not done in the event loop
+        self.m_objRFE.Subscribe(RFE_Common.eEvent.SWEEP, self.OnSweep)
+        self.m_objRFE.StartDispatcher()     #received data is processed in the event loop thread
+
+    @property
+    def Communicator(self):
+        """RFECommunicator used, for all properties of the device and commands not available here. Its blocking
+        methods such as WaitFor* must not be called from the event loop thread
+        """
+        return self.m_objRFE
+
+    @property
+    def IsReadingPaused(self):
+        """True while the port is not read because a Sweeps iterator has too many sweeps waiting to be consumed
+        """
+        return self.m_bPaused
+
+#region Interface used by RFECommunicator, same as RFEDeviceManager
+    def AddPort(self, objRFE):
+        self.m_objLoop.call_soon_threadsafe(self.StartReading)
+
+    def RemovePort(self, objRFE):
+        self.RunInLoop(self.StopReading)
+
+    def StartDispatch(self, objRFE):
+        self.m_bDispatch = True
+        return self.m_objLoopThread
+
+    def StopDispatch(self, objRFE):
+        self.m_bDispatch = False
+
+    def RemoveDevice(self, objRFE):
+        pass
+#endregion
+
+    def RunInLoop(self, fnCall):
+        """Run a function in the event loop thread and wait for it
+
+        Parameters:
+            fnCall -- Function without parameters
+        """
+        if ((threading.current_thread() is self.m_objLoopThread) or self.m_objLoop.is_closed()):
+            fnCall()
+            return
+        hDone = threading.Event()
+        def RunAndSet():
+            try:
+                fnCall()
+            finally:
+                hDone.set()
+        self.m_objLoop.call_soon_threadsafe(RunAndSet)
+        hDone.wait()
+
+    def StartReading(self):
+        """Watch the port in the event loop, called in the event loop thread once the port is connected
+        """
+        self.m_bReading = True
+        self.m_objRFE.m_objThread.m_objFramer.Reset()
+        self.ResumeReading()
+
+    def StopReading(self):
+        """Stop watching the port and finish all Sweeps iterators, called in the event loop thread before the port is closed
+        """
+        self.m_bReading = False
+        self.PauseReading()
+        self.m_bPaused = False
+        for objQueue, _ in self.m_arrSweepQueues:
+            objQueue.put_nowait(None)
+
+    def ResumeReading(self):
+        if (not self.m_bReading or (self.m_nFD >= 0) or self.m_objPollHandle):
+            return
+        self.m_bPaused = False
+        try:
+            self.m_nFD = self.m_objRFE.m_objSerialPort.fileno()
+            self.m_objLoop.add_reader(self.m_nFD, self.OnReadable)
+        except (AttributeError, OSError, ValueError, NotImplementedError):
+            self.m_nFD = -1
+            self.m_objPollHandle = self.m_objLoop.call_soon(self.OnPoll)
+
+    def PauseReading(self):
+        if (self.m_nFD >= 0):
+            self.m_objLoop.remove_reader(self.m_nFD)
+            self.m_nFD = -1
+        if (self.m_objPollHandle):
+            self.m_objPollHandle.cancel()
+            self.m_objPollHandle = None
+        self.m_bPaused = self.m_bReading
+
+    def OnReadable(self):
+        self.ReadPort(True)
+
+    def OnPoll(self):
+        self.m_objPollHandle = None
+        self.ReadPort(False)
+        if (self.m_bReading and not self.m_bPaused):
+            self.m_objPollHandle = self.m_objLoop.call_later(RFE_Common.CONST_MANAGER_POLL_SEC, self.OnPoll)
+
+    def ReadPort(self, bReady):
+        """Read all bytes available in the port and process them in the event loop thread
+
+        Parameters:
+            bReady -- True if the event loop reported the port readable
+        """
+        if (not self.m_objRFE.m_objThread.ReadAvailableBytes(bReady)):
+            self.StopReading()
+        if (self.m_bDispatch):
+            for objNew in self.m_objRFE.m_objQueue.get_many(block=False):
+                try:
+                    self.m_objRFE.ProcessReceivedObject(objNew)
+                except Exception as obEx:
+                    g_objCommunicatorLog.error("RFEAsyncCommunicator: %s", obEx)
+            #wake up all coroutines waiting for a new state
+            self.m_objStateChanged.set()
+            self.m_objStateChanged = asyncio.Event()
+
+    def OnSweep(self, objRFE, objSweep):
+        """SWEEP callback, the sweep object is handed over to every Sweeps iterator. Reading stops while any of them
+        is full, so a slow consumer holds back the device instead of growing the queue forever
+        """
+        bFull = False
+        for objQueue, nMaxSweeps in self.m_arrSweepQueues:
+            objQueue.put_nowait(objSweep)
+            if (objQueue.qsize() >= nMaxSweeps):
+                bFull = True
+        if (bFull):
+            self.PauseReading()
+
+    async def Sweeps(self, nMaxSweeps=RFE_Common.CONST_ASYNC_SWEEP_QUEUE):
+        """Asynchronous iterator returning every sweep received from now on, use as: async for objSweep in objRFE.Sweeps().
+        It finishes when the port is closed. Reading the port stops while nMaxSweeps sweeps are waiting to be
+        consumed, and resumes once the consumer catches up. When leaving the loop early, use contextlib.aclosing so 
+        the iterator is finished right away instead of when it is garbage collected
+
+        Parameters:
+            nMaxSweeps -- Max sweeps waiting in this iterator
+        Returns:
+            Asynchronous generator of RFESweepData
+        """
+        objQueue = asyncio.Queue()
+        objEntry = (objQueue, max(1, nMaxSweeps))
+        self.m_arrSweepQueues.append(objEntry)
+        try:
+            while (True):
+                objSweep = await objQueue.get()
+                if (objSweep is None):
+                    return
+                if (self.m_bPaused and all(objOther.qsize() < nOtherMax for objOther, nOtherMax in self.m_arrSweepQueues)):
+                    self.ResumeReading()
+                yield objSweep
+        finally:
+            self.m_arrSweepQueues.remove(objEntry)
+            if (self.m_bPaused):
+                self.ResumeReading()
+
+    async def WaitForCondition(self, fnCondition, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait until fnCondition() returns True or the timeout expires, checked every time received data is processed
+
+        Parameters:
+            fnCondition -- Function without parameters returning True when the expected state is reached
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if the condition was reached, False if the timeout expired
+        """
+        fDeadline = time.monotonic() + fTimeoutSec
+        while (not fnCondition()):
+            fRemaining = fDeadline - time.monotonic()
+            if (fRemaining <= 0):
+                return False
+            try:
+                await asyncio.wait_for(self.m_objStateChanged.wait(), fRemaining)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    async def WaitForModel(self, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """See RFECommunicator.WaitForModel
+        """
+        objRFE = self.m_objRFE
+        return await self.WaitForCondition(lambda: objRFE.ActiveModel != RFE_Common.eModel.MODEL_NONE, fTimeoutSec)
+
+    async def WaitForSweep(self, nAfterIndex=None, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """See RFECommunicator.WaitForSweep
+        """
+        objRFE = self.m_objRFE
+        if (nAfterIndex is None):
+            nAfterIndex = objRFE.SweepsProcessed - 1
+        if (await self.WaitForCondition(lambda: (objRFE.SweepsProcessed - 1) > nAfterIndex, fTimeoutSec)):
+            return objRFE.LastSweep
+        return None
+
+    async def ConnectPort(self, sUserPort, nBaudRate, bValidatePort=True, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Connect the port and wait for the device model and configuration, see RFECommunicator.ConnectPort.
+        The port is opened in the default executor, so the event loop is never blocked
+
+        Parameters:
+            sUserPort     -- Serial port name, None to autodetect
+            nBaudRate     -- Usually 500000 or 2400
+            bValidatePort -- False to open sUserPort without validating it
+            fTimeoutSec   -- Max time to wait for the device configuration, 0 to not wait
+        Returns:
+            Boolean True if port is open and, unless fTimeoutSec is 0, the configuration was received
+        """
+        bConnected = await self.m_objLoop.run_in_executor(None, self.m_objRFE.ConnectPort, sUserPort, nBaudRate, bValidatePort)
+        if (bConnected and (fTimeoutSec > 0)):
+            bConnected = await self.WaitForModel(fTimeoutSec)
+        return bConnected
+
+    async def SendCommand(self, sCommand):
+        """Send a command and wait until it is written to the port, see RFECommunicator.SendCommand
+
+        Parameters:
+            sCommand -- Unformatted command from http://www.rf-explorer.com/API
+        Returns:
+            Boolean True when the command is written, False if it was superseded by a newer command
+        """
+        return await asyncio.wrap_future(self.m_objRFE.SendCommand(sCommand))
+
+    async def UpdateDeviceConfig(self, fStartMHZ, fEndMHZ, fTopDBM=0, fBottomDBM=-120, fRBW_KHZ=0.0, fTimeoutSec=RFE_Common.CONST_CONFIG_TIMEOUT_SEC):
+        """Send a new configuration and wait until the device confirms it, see RFECommunicator.UpdateDeviceConfig
+
+        Returns:
+            Boolean True if the device confirmed the new configuration, False otherwise
+        """
+        objRFE = self.m_objRFE
+        if (not objRFE.PortConnected):
+            return False
+        nConfigsProcessed = objRFE.m_nConfigsProcessed
+        fStartTime = time.monotonic()
+        objRFE.UpdateDeviceConfig(fStartMHZ, fEndMHZ, fTopDBM, fBottomDBM, fRBW_KHZ, 0)     #sent without waiting
+        fStartMHZ = int(fStartMHZ * 1000) / 1000.0
+        fEndMHZ = int(fEndMHZ * 1000) / 1000.0
+        bConfirmed = await self.WaitForCondition(lambda: ((objRFE.m_nConfigsProcessed > nConfigsProcessed) and objRFE.IsFrequencyRange(fStartMHZ, fEndMHZ)), fTimeoutSec)
+        objRFE.m_fConfigSettleSec = time.monotonic() - fStartTime
+        return bConfirmed
+
+    async def ClosePort(self):
+        """Close the port in the default executor, see RFECommunicator.ClosePort. Sweeps iterators finish
+        """
+        return await self.m_objLoop.run_in_executor(None, self.m_objRFE.ClosePort)
+
+    async def Close(self):
+        """Close the port and finish the command writer, see RFECommunicator.Close
+        """
+        await self.m_objLoop.run_in_executor(None, self.m_objRFE.Close)
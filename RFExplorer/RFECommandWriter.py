@@ -0,0 +1,195 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import threading
+from concurrent.futures import Future
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFELogging import g_objCommunicatorLog
+
+def GetCoalesceKey(sCommand):
+    """Commands with the same key supersede each other while waiting to be written, so only the latest is sent
+
+    Parameters:
+        sCommand -- Unformatted command
+    Returns:
+        String key of the command, None if the command must always be sent
+    """
+    for sPrefix in RFE_Common.CONST_COALESCED_COMMANDS:
+        if (sCommand.startswith(sPrefix)):
+            return sPrefix
+    return None
+
+class RFECommandWriter(threading.Thread):
+    """The thread writing commands to the device. Commands are queued by RFECommunicator.SendCommand from any thread,
+    all commands pending are written together in a single write, so commands queued while a write is in progress
+    are batched, and configuration commands superseded by a newer one before being written are discarded. For a 
+    device of RFEDeviceManager the thread is not started, the loop thread reading the port writes its commands instead
+    """
+    def __init__(self, objRFECommunicator):
+        threading.Thread.__init__(self, daemon=True)
+        self.m_objRFECommunicator = objRFECommunicator
+        self.m_hCondition = threading.Condition()
+        self.m_arrPending = []          #list of (command, formatted bytes, Future) waiting to be written
+        self.m_bWriting = False
+        self.m_bRunThread = True
+        self.m_objLoop = None           #RFEDeviceLoop writing the commands instead of this thread, see Loop
+        self.m_nCommandsWritten = 0
+        self.m_nCommandsCoalesced = 0
+        self.m_nWrites = 0
+
+    def run(self):
+        self.WriterThreadfunc()
+
+    @property
+    def Loop(self):
+        """Get/Set RFEDeviceLoop thread writing the commands instead of this thread, which is not started then. None 
+        to use this thread
+        """
+        return self.m_objLoop
+    @Loop.setter
+    def Loop(self, value):
+        self.m_objLoop = value
+
+    @property
+    def CommandsWritten(self):
+        """Number of commands written to the port
+        """
+        return self.m_nCommandsWritten
+
+    @property
+    def CommandsCoalesced(self):
+        """Number of commands discarded because a newer command superseded them before being written
+        """
+        return self.m_nCommandsCoalesced
+
+    @property
+    def Writes(self):
+        """Number of port writes, less than CommandsWritten when several commands were batched in a write
+        """
+        return self.m_nWrites
+
+    def QueueCommand(self, sCommand, arrCompleteCommand):
+        """Queue a command to be written by the thread
+
+        Parameters:
+            sCommand           -- Unformatted command, used to find superseded commands
+            arrCompleteCommand -- Bytes to write, including '#' and length decorator
+        Returns:
+            concurrent.futures.Future Completed with True when the command is written, False if it was superseded
+            by a newer one, which is written in its place, or with the exception raised by the port
+        """
+        objFuture = Future()
+        sKey = GetCoalesceKey(sCommand)
+        with self.m_hCondition:
+            nSuperseded = -1
+            if (sKey):
+                for nInd, objPending in enumerate(self.m_arrPending):
+                    if (GetCoalesceKey(objPending[0]) == sKey):
+                        nSuperseded = nInd
+                        break
+            if (nSuperseded >= 0):
+                #the newer command takes the place of the superseded one, so it is still written before the commands 
+                #queued after that one
+                self.m_arrPending[nSuperseded][2].set_result(False)
+                self.m_arrPending[nSuperseded] = (sCommand, arrCompleteCommand, objFuture)
+                self.m_nCommandsCoalesced += 1
+            else:
+                self.m_arrPending.append((sCommand, arrCompleteCommand, objFuture))
+            self.m_hCondition.notify_all()
+        if (self.m_objLoop):
+            self.m_objLoop.QueueWriter(self)
+        return objFuture
+
+    def Flush(self, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait until all queued commands are written
+
+        Parameters:
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if all commands were written, False if the timeout expired
+        """
+        if (threading.current_thread() is self):
+            return False    #a command callback cannot wait for itself
+        if (self.m_objLoop and ((threading.current_thread() is self.m_objLoop) or not self.m_objLoop.is_alive())):
+            #the loop thread would wait for itself
+            while (self.WritePending()):
+                pass
+            return True
+        with self.m_hCondition:
+            return self.m_hCondition.wait_for(lambda: not self.m_arrPending and not self.m_bWriting, fTimeoutSec)
+
+    def Stop(self):
+        """Write all pending commands and finish the thread
+        """
+        if (self.m_objLoop):
+            self.Flush()
+        with self.m_hCondition:
+            self.m_bRunThread = False
+            self.m_hCondition.notify_all()
+        if (self.is_alive() and (threading.current_thread() is not self)):
+            self.join()
+
+    def WriterThreadfunc(self):
+        """Write queued commands until Stop is called
+        """
+        while (True):
+            with self.m_hCondition:
+                self.m_hCondition.wait_for(lambda: self.m_arrPending or not self.m_bRunThread)
+                if (not self.m_arrPending):
+                    break
+            self.WritePending()
+
+    def WritePending(self):
+        """Write all commands pending in a single write, called by the thread or by the Loop thread
+
+        Returns:
+            Boolean True if any command was written or failed, False if none was pending
+        """
+        with self.m_hCondition:
+            if (not self.m_arrPending):
+                return False
+            arrBatch = self.m_arrPending
+            self.m_arrPending = []
+            self.m_bWriting = True
+
+        arrData = b"".join(objPending[1] for objPending in arrBatch)
+        try:
+            self.m_objRFECommunicator.m_objSerialPort.write(arrData)
+            self.m_nWrites += 1
+            self.m_nCommandsWritten += len(arrBatch)
+            objRecorder = self.m_objRFECommunicator.StreamRecorder
+            if (objRecorder):
+                objRecorder.Record(RFE_Common.eStreamDirection.TX, arrData)
+            for objPending in arrBatch:
+                objPending[2].set_result(True)
+        except Exception as obEx:
+            g_objCommunicatorLog.error("Error writing command: %s", obEx)
+            for objPending in arrBatch:
+                objPending[2].set_exception(obEx)
+
+        with self.m_hCondition:
+            self.m_bWriting = False
+            self.m_hCondition.notify_all()
+        return True
@@ -0,0 +1,156 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import json
+import os
+import threading
+
+from RFExplorer import RFE_Common
+
+class RFEDeviceCache:
+    """Devices known from previous connections, stored in a JSON file. Every device is identified by port name and
+    serial number and keeps its model, firmware and internal calibration data, so RFECommunicator can reconnect
+    to a known port without scanning all ports and without requesting the calibration data again
+    """
+    def __init__(self, sFileName=None):
+        if (not sFileName):
+            sFileName = os.path.join(os.path.expanduser("~"), RFE_Common.CONST_DEVICE_CACHE_FILE)
+        self.m_sFileName = sFileName
+        self.m_hLock = threading.Lock()
+        self.m_dicDevices = {}
+        self.m_sLastPort = ""
+        self.Load()
+
+    @property
+    def FileName(self):
+        """Name of the cache file
+        """
+        return self.m_sFileName
+
+    @property
+    def LastPort(self):
+        """Port of the last device stored, empty if the cache is empty
+        """
+        return self.m_sLastPort
+
+    @property
+    def Count(self):
+        """Number of devices in the cache
+        """
+        return len(self.m_dicDevices)
+
+    @staticmethod
+    def GetKey(sPortName, sSerialNumber):
+        return sPortName + "|" + sSerialNumber
+
+    def Load(self):
+        """Read the cache file, an empty cache is used if the file does not exist or is not valid
+
+        Returns:
+            Boolean True if the file was read, False otherwise
+        """
+        with self.m_hLock:
+            self.m_dicDevices = {}
+            self.m_sLastPort = ""
+            if (not os.path.isfile(self.m_sFileName)):
+                return False
+            try:
+                with open(self.m_sFileName, "r") as objFile:
+                    dicCache = json.load(objFile)
+                self.m_dicDevices = dict(dicCache.get("Devices", {}))
+                self.m_sLastPort = str(dicCache.get("LastPort", ""))
+            except Exception as obEx:
+                print("Error in RFEDeviceCache - Load(): " + str(obEx))
+                return False
+        return True
+
+    def Save(self):
+        """Write the cache file. A temporary file is replaced, so the cache is never left half written
+
+        Returns:
+            Boolean True if the file was written, False otherwise
+        """
+        with self.m_hLock:
+            sTempFileName = self.m_sFileName + ".tmp"
+            try:
+                with open(sTempFileName, "w") as objFile:
+                    json.dump({"LastPort": self.m_sLastPort, "Devices": self.m_dicDevices}, objFile, indent=1)
+                os.replace(sTempFileName, self.m_sFileName)
+            except Exception as obEx:
+                print("Error in RFEDeviceCache - Save(): " + str(obEx))
+                return False
+        return True
+
+    def GetDevice(self, sPortName, sSerialNumber):
+        """Find a device stored in the cache
+
+        Parameters:
+            sPortName     -- Port the device was connected to
+            sSerialNumber -- Raw serial number, as received in #Sn
+        Returns:
+            Dictionary with the stored device values, None if the device is not in the cache
+        """
+        with self.m_hLock:
+            dicDevice = self.m_dicDevices.get(RFEDeviceCache.GetKey(sPortName, sSerialNumber))
+            return dict(dicDevice) if dicDevice else None
+
+    def SetDevice(self, sPortName, sSerialNumber, dicDevice):
+        """Store a device in the cache, use Save to write it to the file
+
+        Parameters:
+            sPortName     -- Port the device is connected to
+            sSerialNumber -- Raw serial number, as received in #Sn
+            dicDevice     -- Dictionary with JSON serializable device values
+        """
+        with self.m_hLock:
+            self.m_dicDevices[RFEDeviceCache.GetKey(sPortName, sSerialNumber)] = dict(dicDevice, Port=sPortName, SerialNumber=sSerialNumber)
+            self.m_sLastPort = sPortName
+
+    def RemoveDevice(self, sPortName, sSerialNumber):
+        """Remove a device from the cache, use Save to write it to the file
+
+        Parameters:
+            sPortName     -- Port the device was connected to
+            sSerialNumber -- Raw serial number, as received in #Sn
+        """
+        with self.m_hLock:
+            self.m_dicDevices.pop(RFEDeviceCache.GetKey(sPortName, sSerialNumber), None)
+
+    def IsKnownPort(self, sPortName):
+        """True if some device in the cache was connected to the port
+
+        Parameters:
+            sPortName -- Port name
+        Returns:
+            Boolean True if the port is in the cache, False otherwise
+        """
+        with self.m_hLock:
+            return any((dicDevice.get("Port") == sPortName) for dicDevice in self.m_dicDevices.values())
+
+    def Clear(self):
+        """Remove all devices, use Save to write it to the file
+        """
+        with self.m_hLock:
+            self.m_dicDevices = {}
+            self.m_sLastPort = ""
@@ -0,0 +1,320 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import selectors
+import socket
+import threading
+from collections import deque
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFELogging import g_objCommunicatorLog
+from RFExplorer.RFExplorer import RFECommunicator
+
+class RFEDeviceLoop(threading.Thread):
+    """One thread reading the ports of several devices with a selector, it blocks until any of them receives data.
+    Ports without a file descriptor, such as Windows serial ports or replay files, are read every CONST_MANAGER_POLL_SEC.
+    The same thread writes the commands sent to those devices, see RFECommandWriter.Loop. A callback run by this thread
+    can wait for a reply, as WaitForCondition runs the loop meanwhile, see RunOnce
+    """
+    def __init__(self):
+        threading.Thread.__init__(self, daemon=True)
+        self.m_objSelector = selectors.DefaultSelector()
+        self.m_objWakeReader, self.m_objWakeWriter = socket.socketpair()
+        self.m_objWakeReader.setblocking(False)
+        self.m_objSelector.register(self.m_objWakeReader, selectors.EVENT_READ, None)
+        self.m_hChangesLock = threading.Lock()
+        self.m_arrChanges = deque()     #(function, hDone Event) to run in the loop thread, taken one at a time
+        self.m_arrWriters = deque()     #RFECommandWriter objects with commands to write, taken one at a time
+        self.m_arrDevices = []          #devices with a connected port
+        self.m_arrPolledDevices = []    #devices with a port which can not be used with the selector
+        self.m_setDispatched = set()    #devices whose received data is processed in this thread, see StartDispatch
+        self.m_dicDispatchPending = {}  #device: deque of objects taken from its queue and not processed yet
+        self.m_bRunThread = True
+
+    def run(self):
+        self.LoopThreadfunc()
+
+    @property
+    def DeviceCount(self):
+        """Number of devices with a connected port read by this loop
+        """
+        return len(self.m_arrDevices)
+
+    def RunInLoop(self, fnChange):
+        """Run a function in the loop thread and wait for it, so the selector is only used by one thread
+
+        Parameters:
+            fnChange -- Function without parameters
+        """
+        if (threading.current_thread() is self or not self.is_alive()):
+            fnChange()
+            return
+        hDone = threading.Event()
+        with self.m_hChangesLock:
+            self.m_arrChanges.append((fnChange, hDone))
+        self.m_objWakeWriter.send(b"\x00")
+        hDone.wait()
+
+    def QueueWriter(self, objWriter):
+        """Have the loop thread write the commands pending in an RFECommandWriter
+
+        Parameters:
+            objWriter -- RFECommandWriter with commands queued
+        """
+        with self.m_hChangesLock:
+            if (objWriter in self.m_arrWriters):
+                return
+            self.m_arrWriters.append(objWriter)
+        if (threading.current_thread() is not self):
+            self.m_objWakeWriter.send(b"\x00")
+
+    def AddPort(self, objRFE):
+        self.RunInLoop(lambda: self.RegisterPort(objRFE))
+
+    def RemovePort(self, objRFE):
+        self.RunInLoop(lambda: self.UnregisterPort(objRFE))
+
+    def StartDispatch(self, objRFE):
+        self.RunInLoop(lambda: self.SetDispatch(objRFE, True))
+
+    def StopDispatch(self, objRFE):
+        self.RunInLoop(lambda: self.SetDispatch(objRFE, False))
+
+    def Stop(self):
+        """Finish the thread, ports are not closed
+        """
+        self.m_bRunThread = False
+        self.m_objWakeWriter.send(b"\x00")
+        if (self.is_alive() and (threading.current_thread() is not self)):
+            self.join()
+
+    def RegisterPort(self, objRFE):
+        if (objRFE in self.m_arrDevices):
+            return
+        self.m_arrDevices.append(objRFE)
+        objRFE.m_objThread.m_objFramer.Reset()
+        try:
+            self.m_objSelector.register(objRFE.m_objSerialPort.fileno(), selectors.EVENT_READ, objRFE)
+        except (AttributeError, OSError, ValueError):
+            self.m_arrPolledDevices.append(objRFE)
+
+    def UnregisterPort(self, objRFE):
+        if (objRFE not in self.m_arrDevices):
+            return
+        self.m_arrDevices.remove(objRFE)
+        if (objRFE in self.m_arrPolledDevices):
+            self.m_arrPolledDevices.remove(objRFE)
+        else:
+            for objKey in list(self.m_objSelector.get_map().values()):
+                if (objKey.data is objRFE):
+                    self.m_objSelector.unregister(objKey.fileobj)
+
+    def SetDispatch(self, objRFE, bDispatch):
+        if (bDispatch):
+            self.m_setDispatched.add(objRFE)
+            self.DispatchDevice(objRFE)     #process anything received before
+        else:
+            self.m_setDispatched.discard(objRFE)
+            self.m_dicDispatchPending.pop(objRFE, None)     #a DispatchDevice running below a callback finishes its objects
+
+    def ApplyChanges(self):
+        #one at a time, so a change run by a nested RunOnce does not overtake the ones queued before it
+        while (True):
+            with self.m_hChangesLock:
+                if (not self.m_arrChanges):
+                    return
+                fnChange, hDone = self.m_arrChanges.popleft()
+            try:
+                fnChange()
+            except Exception as obEx:
+                g_objCommunicatorLog.error("Error in RFEDeviceLoop: %s", obEx)
+            hDone.set()
+
+    def WriteCommands(self):
+        while (True):
+            with self.m_hChangesLock:
+                if (not self.m_arrWriters):
+                    return
+                objWriter = self.m_arrWriters.popleft()
+            objWriter.WritePending()
+
+    def RunOnce(self, fTimeoutSec=None):
+        """Wait for any port to receive data and process it once, then write pending commands and apply changes. It is 
+        the body of the loop, also run by WaitForCondition when a callback of this thread waits for a reply, so the 
+        ports are still read meanwhile
+
+        Parameters:
+            fTimeoutSec -- Max time to wait for data, None to wait until any port is ready or the loop is woken up
+        """
+        if (self.m_arrPolledDevices):
+            fTimeoutSec = RFE_Common.CONST_MANAGER_POLL_SEC if (fTimeoutSec is None) else min(fTimeoutSec, RFE_Common.CONST_MANAGER_POLL_SEC)
+        for objKey, _ in self.m_objSelector.select(fTimeoutSec):
+            if (objKey.data is None):
+                try:
+                    self.m_objWakeReader.recv(4096)
+                except BlockingIOError:
+                    pass
+            else:
+                self.ReadDevice(objKey.data, True)
+        for objRFE in list(self.m_arrPolledDevices):
+            self.ReadDevice(objRFE, False)
+        self.WriteCommands()
+        self.ApplyChanges()
+
+    def LoopThreadfunc(self):
+        """Wait for any port to receive data and process it, until Stop is called
+        """
+        while (self.m_bRunThread):
+            self.RunOnce()
+        self.WriteCommands()
+        self.ApplyChanges()     #nobody must keep waiting for a change
+        self.m_objSelector.close()
+        self.m_objWakeReader.close()
+        self.m_objWakeWriter.close()
+
+    def ReadDevice(self, objRFE, bSelected):
+        """Read all bytes available in a device port and process them
+
+        Parameters:
+            objRFE    -- RFECommunicator whose port may have data available
+            bSelected -- True if the selector reported the port ready
+        """
+        if (not objRFE.m_objThread.ReadAvailableBytes(bSelected)):
+            self.UnregisterPort(objRFE)     #a port failing would wake up the selector forever
+        elif (objRFE in self.m_setDispatched):
+            self.DispatchDevice(objRFE)
+
+    def DispatchDevice(self, objRFE):
+        """Process all objects queued by a device, as its dispatcher thread would do
+
+        Parameters:
+            objRFE -- RFECommunicator dispatched by this loop
+        """
+        #objects are taken one at a time from a list shared with a nested RunOnce, started by a callback waiting for a 
+        #reply, so they are processed in order
+        arrPending = self.m_dicDispatchPending.setdefault(objRFE, deque())
+        arrPending.extend(objRFE.m_objQueue.get_many(block=False))
+        while (arrPending):
+            try:
+                objRFE.ProcessReceivedObject(arrPending.popleft())
+            except Exception as obEx:
+                g_objCommunicatorLog.error("DispatchDevice: %s", obEx)
+
+class RFEDeviceManager:
+    """Owner of several RFECommunicator objects whose ports are read by a small fixed pool of RFEDeviceLoop threads,
+    instead of one receive thread per device. Every device keeps the RFECommunicator interface, and StartDispatcher
+    processes its data in the pool too, so no thread per device is needed to get sweeps
+    """
+    def __init__(self, nThreads=1):
+        self.m_arrLoops = [RFEDeviceLoop() for _ in range(max(1, nThreads))]
+        for objLoop in self.m_arrLoops:
+            objLoop.start()
+        self.m_arrDevices = []
+        self.m_dicDeviceLoop = {}
+        self.m_hLock = threading.Lock()
+
+    @property
+    def Devices(self):
+        """List of RFECommunicator objects created with CreateDevice and not closed yet
+        """
+        return list(self.m_arrDevices)
+
+    @property
+    def ThreadCount(self):
+        """Number of threads reading device ports
+        """
+        return len(self.m_arrLoops)
+
+    def CreateDevice(self):
+        """Create a new RFECommunicator read by this manager, use its ConnectPort as usual
+
+        Returns:
+            RFECommunicator New device, without receive and command writer threads
+        """
+        objRFE = RFECommunicator(self)
+        with self.m_hLock:
+            self.m_arrDevices.append(objRFE)
+            objDeviceLoop = min(self.m_arrLoops, key=lambda objLoop: sum(1 for objLoopUsed in self.m_dicDeviceLoop.values() if objLoopUsed is objLoop))
+            self.m_dicDeviceLoop[objRFE] = objDeviceLoop
+        objRFE.CommandWriter.Loop = objDeviceLoop   #commands are written by the loop thread, no writer thread per device
+        return objRFE
+
+    def GetLoop(self, objRFE):
+        """Loop thread reading the port of a device
+
+        Parameters:
+            objRFE -- RFECommunicator created with CreateDevice
+        Returns:
+            RFEDeviceLoop thread, None if the device was removed
+        """
+        with self.m_hLock:
+            return self.m_dicDeviceLoop.get(objRFE)
+
+    def AddPort(self, objRFE):
+        """Start reading the port of a device, called by RFECommunicator when the port is connected
+        """
+        objLoop = self.GetLoop(objRFE)
+        if (objLoop):
+            objLoop.AddPort(objRFE)
+
+    def RemovePort(self, objRFE):
+        """Stop reading the port of a device, called by RFECommunicator before the port is closed
+        """
+        objLoop = self.GetLoop(objRFE)
+        if (objLoop):
+            objLoop.RemovePort(objRFE)
+
+    def StartDispatch(self, objRFE):
+        """Process received data of a device in its loop thread, called by RFECommunicator.StartDispatcher
+
+        Returns:
+            RFEDeviceLoop thread processing the data, None if the device was removed
+        """
+        objLoop = self.GetLoop(objRFE)
+        if (objLoop):
+            objLoop.StartDispatch(objRFE)
+        return objLoop
+
+    def StopDispatch(self, objRFE):
+        """Stop processing received data of a device, called by RFECommunicator.StopDispatcher
+        """
+        objLoop = self.GetLoop(objRFE)
+        if (objLoop):
+            objLoop.StopDispatch(objRFE)
+
+    def RemoveDevice(self, objRFE):
+        """Forget a device, called by RFECommunicator.Close once its port is closed
+        """
+        with self.m_hLock:
+            if (objRFE in self.m_arrDevices):
+                self.m_arrDevices.remove(objRFE)
+            self.m_dicDeviceLoop.pop(objRFE, None)
+
+    def Close(self):
+        """Close all devices and finish the loop threads
+        """
+        for objRFE in self.Devices:
+            objRFE.Close()
+        for objLoop in self.m_arrLoops:
+            objLoop.Stop()
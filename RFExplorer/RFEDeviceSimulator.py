@@ -0,0 +1,422 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import os
+import random
+import select
+import threading
+import time
+
+try:
+    import tty
+except ImportError:
+    tty = None      #pseudo-terminals are only available on POSIX systems
+
+from RFExplorer import RFE_Common 
+
+class RFEDeviceSimulator:
+    """Simulated RF Explorer device speaking the serial protocol over a pseudo-terminal, so RFECommunicator can 
+    connect to PortName as if it was a real device. It simulates a spectrum analyzer streaming sweeps at a 
+    configurable rate, or a signal generator, and it is intended for load and latency tests without hardware.
+    Only available on POSIX systems
+    """
+    def __init__(self, eModel=RFE_Common.eModel.MODEL_6G, bGenerator=False, fStartMHZ=5000.0, fEndMHZ=5100.0, nSweepPoints=112, fSweepsPerSecond=10.0):
+        self.m_eModel = eModel
+        self.m_bGenerator = bGenerator
+        self.m_sFirmware = RFE_Common.CONST_RFESA_FIRMWARE_CERTIFIED
+        self.m_sSerialNumber = "SIM0000000000001"
+        self.m_fMinFreqMHZ = 15.0
+        self.m_fMaxFreqMHZ = 6100.0
+        self.m_fMaxSpanMHZ = 600.0
+        self.m_nStartKHZ = int(fStartMHZ * 1000)
+        self.m_nEndKHZ = int(fEndMHZ * 1000)
+        self.m_nTopDBM = -10
+        self.m_nBottomDBM = -120
+        self.m_nSweepPoints = nSweepPoints
+        self.m_nCalculator = RFE_Common.eCalculator.NORMAL.value
+        self.m_fSweepsPerSecond = fSweepsPerSecond
+        self.m_nEEOTEvery = 0
+        self.m_fCalibrationDelaySec = 0.0
+        self.m_bPowerON = False
+        self.m_nCWKHZ = 2400000
+        self.m_nPowerLevel = 0
+        self.m_bHighPowerSwitch = False
+        self.m_bStreaming = False
+        self.m_arrSweepVariants = []
+        self.m_nSweepsSent = 0
+        self.m_nLastSweepSentNS = 0
+        self.m_arrVariantSentNS = []    #time.monotonic_ns() the last sweep of every variant started to be sent
+        self.m_nBytesSent = 0
+        self.m_arrCommandsReceived = []
+        self.m_arrOutput = bytearray()
+        self.m_arrInput = bytearray()
+        self.m_hLock = threading.Lock()
+        self.m_nMasterFD = -1
+        self.m_nSlaveFD = -1
+        self.m_sPortName = ""
+        self.m_bRunThread = False
+        self.m_objThread = None
+
+    @property
+    def PortName(self):
+        """Name of the pseudo-terminal to use with RFECommunicator.ConnectPort
+        """
+        return self.m_sPortName
+
+    @property
+    def SweepsPerSecond(self):
+        """Get/Set sweeps sent per second while streaming, 0 to send them as fast as the port accepts them
+        """
+        return self.m_fSweepsPerSecond
+    @SweepsPerSecond.setter
+    def SweepsPerSecond(self, value):
+        self.m_fSweepsPerSecond = value
+
+    @property
+    def EEOTEvery(self):
+        """Get/Set how often a sweep is cut off with an EEOT marker, for instance 10 to interrupt one sweep out of 10. 
+        0 to never interrupt sweeps
+        """
+        return self.m_nEEOTEvery
+    @EEOTEvery.setter
+    def EEOTEvery(self, value):
+        self.m_nEEOTEvery = value
+
+    @property
+    def CalibrationDelaySec(self):
+        """Get/Set time the simulator takes to answer "Cq" with the internal calibration data, to simulate the slow 
+        dump of a real device. 0 to answer right away
+        """
+        return self.m_fCalibrationDelaySec
+    @CalibrationDelaySec.setter
+    def CalibrationDelaySec(self, value):
+        self.m_fCalibrationDelaySec = value
+
+    @property
+    def SweepPoints(self):
+        """Data points of the sweeps currently sent
+        """
+        return self.m_nSweepPoints
+
+    @property
+    def SweepsSent(self):
+        """Number of complete sweeps sent since the simulator started
+        """
+        return self.m_nSweepsSent
+
+    @property
+    def LastSweepSentNS(self):
+        """time.monotonic_ns() when the last complete sweep started to be written to the port. It is taken before the 
+        write, so a sweep is never received before its time is set, but the sweep received may be an older one if 
+        the reader is slower than the sweep rate, see GetSweepSentNS
+        """
+        return self.m_nLastSweepSentNS
+
+    def GetSweepSentNS(self, objSweep):
+        """Time when a sweep received from the simulator started to be written to the port. Sweeps are sent in turn 
+        from a few variants, the variant is found by the position of its peak, so the time is right as long as the
+        sweep is received before the next sweep of the same variant is sent
+
+        Parameters:
+            objSweep -- RFESweepData received from this simulator, with its current number of data points
+        Returns:
+            Integer time.monotonic_ns() the sweep started to be written, 0 if it is unknown
+        """
+        arrVariantSentNS = self.m_arrVariantSentNS
+        arrAmplitude = objSweep.m_arrAmplitude
+        if (not arrVariantSentNS or (len(arrAmplitude) != self.m_nSweepPoints)):
+            return 0
+        nPeak = max(range(len(arrAmplitude)), key=arrAmplitude.__getitem__)
+        nVariant = ((nPeak * 16) // len(arrAmplitude)) // 2
+        if (nVariant >= len(arrVariantSentNS)):
+            return 0
+        return arrVariantSentNS[nVariant]
+
+    @property
+    def BytesSent(self):
+        """Number of bytes written to the port since the simulator started
+        """
+        return self.m_nBytesSent
+
+    @property
+    def CommandsReceived(self):
+        """List of all commands received, without the '#' and length decorator
+        """
+        return self.m_arrCommandsReceived
+
+    def Start(self):
+        """Create the pseudo-terminal and start the simulator thread
+
+        Returns:
+            Boolean True if started, False otherwise
+        """
+        if (tty is None):
+            print("Error in RFEDeviceSimulator - Start(): pseudo-terminals are not available in this system")
+            return False
+        self.m_nMasterFD, self.m_nSlaveFD = os.openpty()
+        tty.setraw(self.m_nSlaveFD)     #no echo nor line end translation, bytes are sent as they are
+        os.set_blocking(self.m_nMasterFD, False)
+        self.m_sPortName = os.ttyname(self.m_nSlaveFD)
+        self.m_bRunThread = True
+        self.m_objThread = threading.Thread(target=self.SimulatorThreadfunc, daemon=True)
+        self.m_objThread.start()
+        return True
+
+    def Stop(self):
+        """Stop the simulator thread and close the pseudo-terminal
+        """
+        self.m_bRunThread = False
+        if (self.m_objThread):
+            self.m_objThread.join()
+            self.m_objThread = None
+        for nFD in (self.m_nMasterFD, self.m_nSlaveFD):
+            if (nFD >= 0):
+                os.close(nFD)
+        self.m_nMasterFD = -1
+        self.m_nSlaveFD = -1
+
+    def SendLine(self, sLine):
+        """Queue a text line to be sent, \\r\\n is added
+
+        Parameters:
+            sLine -- Text to send
+        """
+        self.SendBytes((sLine + "\r\n").encode("latin_1"))
+
+    def SendBytes(self, arrData):
+        """Queue raw bytes to be sent
+
+        Parameters:
+            arrData -- Bytes to send
+        """
+        self.m_hLock.acquire()
+        self.m_arrOutput += arrData
+        self.m_hLock.release()
+
+    def GetConfigLine(self):
+        """Current spectrum analyzer configuration as sent by the device
+
+        Returns:
+            String #C2-F line, or #C2-f if the number of data points needs 5 digits
+        """
+        nStepHZ = int(round((self.m_nEndKHZ - self.m_nStartKHZ) * 1000.0 / (self.m_nSweepPoints - 1)))
+        sStep = "{:07d}".format(nStepHZ) if (nStepHZ < 10000000) else "{:08d}".format(nStepHZ)
+        if (self.m_nSweepPoints > 9999):
+            sHeader = "#C2-f:"
+            sPoints = "{:05d}".format(self.m_nSweepPoints)
+        else:
+            sHeader = "#C2-F:"
+            sPoints = "{:04d}".format(self.m_nSweepPoints)
+        nRBWKHZ = max(3, (self.m_nEndKHZ - self.m_nStartKHZ) // self.m_nSweepPoints)
+        return (sHeader + "{:07d},".format(self.m_nStartKHZ) + sStep + ",{:04d},{:04d},".format(self.m_nTopDBM, self.m_nBottomDBM) + sPoints + 
+                ",0,000,{:07d},{:07d},{:07d},{:05d},{:04d},{:03d}".format(int(self.m_fMinFreqMHZ * 1000), int(self.m_fMaxFreqMHZ * 1000), 
+                int(self.m_fMaxSpanMHZ * 1000), nRBWKHZ, 0, self.m_nCalculator))
+
+    def GetGeneratorStatusLine(self):
+        """Current signal generator configuration as sent by the device
+
+        Returns:
+            String #C3-* full status line
+        """
+        return "#C3-*:{:07d},{:07d},{:04d},{:07d},{:d},{:d},{:04d},{:d},{:d},{:d},{:d},{:d},{:05d}".format(self.m_nCWKHZ, self.m_nCWKHZ, 0, 0,
+                int(self.m_bHighPowerSwitch), self.m_nPowerLevel, 0, 0, 0, 0, 0, int(self.m_bPowerON), 0)
+
+    def SendConfiguration(self):
+        """Send model and current configuration lines, as the device does when C0 is received
+        """
+        if (self.m_bGenerator):
+            self.SendLine("#C3-M:{:03d},{:03d},{}".format(self.m_eModel.value, RFE_Common.eModel.MODEL_NONE.value, self.m_sFirmware))
+            self.SendLine(self.GetGeneratorStatusLine())
+        else:
+            self.SendLine("#C2-M:{:03d},{:03d},{}".format(self.m_eModel.value, RFE_Common.eModel.MODEL_NONE.value, self.m_sFirmware))
+            self.SendLine(self.GetConfigLine())
+
+    def UpdateSweepVariants(self):
+        """Create a few different sweeps for the current configuration, they are sent in turn with a moving peak.
+        Amplitude bytes are -2*dBm, as decoded by RFESweepData
+        """
+        self.m_arrSweepVariants = []
+        self.m_arrVariantSentNS = []
+        nPoints = self.m_nSweepPoints
+        if (nPoints < 256):
+            arrHeader = b"$S" + bytes([nPoints])
+        elif ((nPoints % 16 == 0) and (nPoints <= 4096)):
+            arrHeader = b"$s" + bytes([(nPoints // 16) & 0xFF])
+        else:
+            arrHeader = b"$z" + bytes([nPoints >> 8, nPoints & 0xFF])
+        objRandom = random.Random(nPoints)
+        for nVariant in range(8):
+            arrData = bytearray(objRandom.randint(190, 210) for _ in range(nPoints))
+            nPeak = (nPoints * (2 * nVariant + 1)) // 16
+            arrData[nPeak] = 60     #-30dBm
+            self.m_arrSweepVariants.append(arrHeader + bytes(arrData) + b"\r\n")
+        self.m_arrVariantSentNS = [0] * len(self.m_arrSweepVariants)
+
+    def ProcessCommand(self, sCommand):
+        """Answer a command received from the client
+
+        Parameters:
+            sCommand -- Command without the '#' and length decorator
+        """
+        self.m_arrCommandsReceived.append(sCommand)
+        if (sCommand == "C0"):
+            self.SendConfiguration()
+            self.m_bStreaming = not self.m_bGenerator
+        elif (sCommand.startswith("C2-F:")):
+            arrFields = sCommand[5:].split(",")
+            self.m_nStartKHZ = int(arrFields[0])
+            self.m_nEndKHZ = int(arrFields[1])
+            if (len(arrFields) > 3):
+                self.m_nTopDBM = int(arrFields[2])
+                self.m_nBottomDBM = int(arrFields[3])
+            if (len(arrFields) > 4):
+                self.m_nSweepPoints = int(arrFields[4]) + 1
+            self.ApplyConfiguration()
+        elif (sCommand.startswith("CJ") and len(sCommand) == 3):
+            self.m_nSweepPoints = (ord(sCommand[2]) + 1) * 16
+            self.ApplyConfiguration()
+        elif (sCommand.startswith("Cj") and len(sCommand) == 4):
+            self.m_nSweepPoints = max(RFE_Common.CONST_RFE_MIN_SWEEP_POINTS, (ord(sCommand[2]) << 8) + ord(sCommand[3]))
+            self.ApplyConfiguration()
+        elif (sCommand.startswith("C+") and len(sCommand) == 3):
+            self.m_nCalculator = ord(sCommand[2])
+            self.ApplyConfiguration()
+        elif (sCommand == "CH"):
+            self.m_bStreaming = False
+        elif (sCommand == "Cq"):
+            if (self.m_fCalibrationDelaySec > 0):
+                threading.Timer(self.m_fCalibrationDelaySec, self.SendCalibrationDump).start()
+            else:
+                self.SendCalibrationDump()
+        elif (sCommand == "Cn"):
+            self.SendLine("#Sn" + self.m_sSerialNumber)
+        elif (sCommand == "r"):
+            self.m_bStreaming = False
+            self.SendLine(RFE_Common.CONST_RESETSTRING + "2012-2020")
+        elif (self.m_bGenerator and (sCommand.startswith("C3-") or sCommand.startswith("CP"))):
+            if (sCommand == "CP0" or sCommand == "CP1"):
+                self.m_bPowerON = (sCommand == "CP1")
+            elif (sCommand.startswith("C3-F:") and len(sCommand) >= 16):
+                self.m_nCWKHZ = int(sCommand[5:12])
+                self.m_bHighPowerSwitch = (sCommand[13] == '1')
+                self.m_nPowerLevel = int(sCommand[15])
+                self.m_bPowerON = True
+            self.SendLine(RFE_Common.CONST_ACKNOWLEDGE)
+            self.SendLine(self.GetGeneratorStatusLine())
+
+    def ApplyConfiguration(self):
+        """Send the new configuration and restart sweeps with it
+        """
+        self.m_nSweepPoints = min(max(self.m_nSweepPoints, 16), RFE_Common.CONST_MAX_SPECTRUM_STEPS)
+        self.UpdateSweepVariants()
+        self.SendLine(self.GetConfigLine())
+        self.m_bStreaming = not self.m_bGenerator
+
+    def SendCalibrationDump(self):
+        """Send internal calibration data as $q, with small non zero offsets
+        """
+        nSize = 128
+        if (self.m_eModel == RFE_Common.eModel.MODEL_6G):
+            nSize = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_6G + 64
+        arrData = bytes((nInd % 5) for nInd in range(nSize))
+        self.SendBytes(b"$q" + bytes([nSize]) + arrData + b"\r\n")
+
+    def ProcessInput(self):
+        """Extract all complete commands received, formatted as '#', total length and command
+        """
+        while (len(self.m_arrInput) >= 2):
+            nStart = self.m_arrInput.find(b"#")
+            if (nStart < 0):
+                del self.m_arrInput[:]
+                break
+            if (nStart > 0):
+                del self.m_arrInput[:nStart]
+            if (len(self.m_arrInput) < 2):
+                break
+            nLen = self.m_arrInput[1]
+            if (nLen < 2):
+                del self.m_arrInput[:2]
+                continue
+            if (len(self.m_arrInput) < nLen):
+                break
+            sCommand = bytes(self.m_arrInput[2:nLen]).decode("latin_1")
+            del self.m_arrInput[:nLen]
+            self.ProcessCommand(sCommand)
+
+    def QueueNextSweep(self):
+        """Queue the next sweep to send, cut off with EEOT if it is the turn of one
+        """
+        if (not self.m_arrSweepVariants):
+            self.UpdateSweepVariants()
+        nVariant = self.m_nSweepsSent % len(self.m_arrSweepVariants)
+        arrSweep = self.m_arrSweepVariants[nVariant]
+        self.m_nSweepsSent += 1
+        if (self.m_nEEOTEvery > 0 and (self.m_nSweepsSent % self.m_nEEOTEvery) == 0):
+            arrSweep = arrSweep[:len(arrSweep) // 2] + RFE_Common.CONST_EEOT_BYTES
+        else:
+            #set before the bytes are written, a fast reader must not find the time of the previous sweep
+            nSentNS = time.monotonic_ns()
+            self.m_arrVariantSentNS[nVariant] = nSentNS
+            self.m_nLastSweepSentNS = nSentNS
+        self.SendBytes(arrSweep)
+
+    def SimulatorThreadfunc(self):
+        """Answer commands and stream sweeps until Stop is called
+        """
+        nNextSweepNS = time.monotonic_ns()
+        while (self.m_bRunThread):
+            fTimeout = 0.05
+            if (self.m_bStreaming and not self.m_arrOutput and self.m_fSweepsPerSecond > 0):
+                fTimeout = min(fTimeout, max(0, nNextSweepNS - time.monotonic_ns()) / 1e9)
+            arrWrite = [self.m_nMasterFD] if (self.m_arrOutput or (self.m_bStreaming and self.m_fSweepsPerSecond <= 0)) else []
+            try:
+                arrReadable, arrWritable, _ = select.select([self.m_nMasterFD], arrWrite, [], fTimeout)
+            except (OSError, ValueError):
+                break
+
+            if (arrReadable):
+                try:
+                    self.m_arrInput += os.read(self.m_nMasterFD, 4096)
+                    self.ProcessInput()
+                except BlockingIOError:
+                    pass
+                except OSError:
+                    time.sleep(0.01)    #nobody has the port open
+
+            if (self.m_bStreaming and not self.m_arrOutput):
+                if (self.m_fSweepsPerSecond <= 0 or time.monotonic_ns() >= nNextSweepNS):
+                    self.QueueNextSweep()
+                    if (self.m_fSweepsPerSecond > 0):
+                        nNextSweepNS = max(nNextSweepNS + int(1e9 / self.m_fSweepsPerSecond), time.monotonic_ns())
+
+            if (self.m_arrOutput and (arrWritable or not arrWrite)):
+                self.m_hLock.acquire()
+                try:
+                    nWritten = os.write(self.m_nMasterFD, self.m_arrOutput)
+                    del self.m_arrOutput[:nWritten]
+                    self.m_nBytesSent += nWritten
+                except (BlockingIOError, OSError):
+                    pass
+                finally:
+                    self.m_hLock.release()
@@ -0,0 +1,79 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+
+class RFELatestSweep:
+    """Holder of the newest sweep processed, for readers which only need the last trace, such as live displays.
+    Publish replaces a single (sequence, sweep) tuple, which is an atomic reference assignment, so Get never takes a
+    lock nor waits for the thread publishing, and it always returns a sequence and sweep matching each other.
+    Published sweeps are never modified afterwards, so no copy or second buffer is needed for readers to use them.
+    This costs a tuple per Publish, which is still cheaper than two preallocated slots: those need a sequence 
+    check and retry in every Get to not return a slot being written
+    """
+    def __init__(self):
+        self.m_tLatest = (0, None)      #(sequence, RFESweepData), replaced as a whole on every Publish
+
+    def Publish(self, objSweep):
+        """Make a sweep the latest one, must be called from a single thread
+
+        Parameters:
+            objSweep -- RFESweepData processed, it must not be modified afterwards
+        """
+        self.m_tLatest = (self.m_tLatest[0] + 1, objSweep)
+
+    def Get(self):
+        """Latest sweep published, lock-free
+
+        Returns:
+            Tuple (sequence, RFESweepData) with the number of sweeps published so far and the last of them, or (0, None)
+        """
+        return self.m_tLatest
+
+    def GetIfNewer(self, nSequence):
+        """Latest sweep published only if it was not read yet, so a display can poll at its own rate
+
+        Parameters:
+            nSequence -- Sequence returned by a previous Get or GetIfNewer, 0 if none
+        Returns:
+            Tuple (sequence, RFESweepData), sweep is None if nothing was published after nSequence
+        """
+        nLatest, objSweep = self.m_tLatest
+        if (nLatest == nSequence):
+            return nSequence, None
+        return nLatest, objSweep
+
+    def Reset(self):
+        self.m_tLatest = (0, None)
+
+    @property
+    def Sequence(self):
+        """Number of sweeps published since created or reset
+        """
+        return self.m_tLatest[0]
+
+    @property
+    def Sweep(self):
+        """Latest RFESweepData published, None if none yet
+        """
+        return self.m_tLatest[1]
@@ -0,0 +1,169 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import logging
+import sys
+import threading
+import time
+from collections import deque
+
+from RFExplorer import RFE_Common
+
+#Diagnostics of the library go to one logger per subsystem, children of "RFExplorer", so they can be configured with the
+#standard logging module. Nothing is configured by default, so a disabled level costs a single isEnabledFor call
+TRACE = 5   #per read and per frame details, below logging.DEBUG
+logging.addLevelName(TRACE, "TRACE")
+
+g_objLog = logging.getLogger("RFExplorer")
+g_objReceiveLog = logging.getLogger("RFExplorer.Receive")             #port reads and framing, in the receive thread
+g_objSweepLog = logging.getLogger("RFExplorer.Sweep")                 #sweep decoding
+g_objCommunicatorLog = logging.getLogger("RFExplorer.Communicator")   #processing of received objects and callbacks
+
+g_objConsoleHandler = None  #handler printing to stdout installed by SetVerboseLevel
+g_hLock = threading.Lock()
+
+class RFELazyString:
+    """Message argument formatted only if the log record is emitted, for expensive texts such as hex dumps
+
+    Parameters:
+        fnFormat -- Function returning the text
+        *args    -- Parameters of fnFormat
+    """
+    def __init__(self, fnFormat, *args):
+        self.m_fnFormat = fnFormat
+        self.m_arrArgs = args
+
+    def __str__(self):
+        return str(self.m_fnFormat(*self.m_arrArgs))
+
+class RFETraceBuffer(logging.Handler):
+    """Logging handler keeping the last records in memory instead of writing them, with a limited rate of records 
+    accepted per second, so tracing can stay enabled in production and be dumped when a problem is detected
+    """
+    def __init__(self, nCapacity=RFE_Common.CONST_TRACE_RECORDS, fMaxPerSecond=RFE_Common.CONST_TRACE_RATE):
+        logging.Handler.__init__(self)
+        self.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+        self.m_arrRecords = deque(maxlen=nCapacity)
+        self.m_fMaxPerSecond = fMaxPerSecond
+        self.m_fTokens = fMaxPerSecond
+        self.m_fLastRefill = time.monotonic()
+        self.m_nDropped = 0
+
+    @property
+    def Dropped(self):
+        """Number of records discarded because the rate limit was exceeded
+        """
+        return self.m_nDropped
+
+    @property
+    def Count(self):
+        """Number of records kept
+        """
+        return len(self.m_arrRecords)
+
+    def emit(self, record):
+        #the handler lock is held here, see logging.Handler.handle
+        fNow = time.monotonic()
+        self.m_fTokens = min(self.m_fMaxPerSecond, self.m_fTokens + (fNow - self.m_fLastRefill) * self.m_fMaxPerSecond)
+        self.m_fLastRefill = fNow
+        if (self.m_fTokens < 1.0):
+            self.m_nDropped += 1
+            return
+        self.m_fTokens -= 1.0
+        try:
+            #formatted now, arguments such as frame views are not valid later
+            self.m_arrRecords.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def Dump(self):
+        """Records kept, oldest first
+
+        Returns:
+            List of formatted strings
+        """
+        with self.lock:
+            return list(self.m_arrRecords)
+
+    def Clear(self):
+        with self.lock:
+            self.m_arrRecords.clear()
+            self.m_nDropped = 0
+
+def StartTrace(nLevel=TRACE, nCapacity=RFE_Common.CONST_TRACE_RECORDS, fMaxPerSecond=RFE_Common.CONST_TRACE_RATE):
+    """Keep library diagnostics up to a level in a memory ring buffer
+
+    Parameters:
+        nLevel        -- Lowest logging level traced, TRACE for everything
+        nCapacity     -- Max number of records kept
+        fMaxPerSecond -- Max records accepted per second, the rest are counted in RFETraceBuffer.Dropped
+    Returns:
+        RFETraceBuffer handler receiving the records, use its Dump method to get them
+    """
+    objTrace = RFETraceBuffer(nCapacity, fMaxPerSecond)
+    objTrace.setLevel(nLevel)
+    with g_hLock:
+        g_objLog.addHandler(objTrace)
+        UpdateLevel()
+    return objTrace
+
+def StopTrace(objTrace):
+    """Stop sending records to a buffer created with StartTrace, records already kept can still be dumped
+    """
+    with g_hLock:
+        g_objLog.removeHandler(objTrace)
+        UpdateLevel()
+
+def UpdateLevel():
+    """Set the "RFExplorer" logger level to the lowest level of the trace buffers and console handler installed by this
+    module, or leave it unset if there are none. Must be called with g_hLock held
+    """
+    arrLevels = [objHandler.level for objHandler in g_objLog.handlers if (isinstance(objHandler, RFETraceBuffer) or (objHandler is g_objConsoleHandler))]
+    g_objLog.setLevel(min(arrLevels) if arrLevels else logging.NOTSET)
+
+def SetVerboseLevel(nVerboseLevel):
+    """Show diagnostics up to a RFECommunicator.VerboseLevel in the console, as the former print based diagnostics.
+    Levels up to 4 leave the logging configuration as it was, so applications configuring logging are not affected
+
+    Parameters:
+        nVerboseLevel -- Higher than 9 for TRACE, higher than 5 for DEBUG, higher than 4 for INFO
+    """
+    global g_objConsoleHandler  #pylint: disable=global-statement
+    with g_hLock:
+        if (nVerboseLevel > 4):
+            if (g_objConsoleHandler is None):
+                g_objConsoleHandler = logging.StreamHandler(sys.stdout)
+                g_objConsoleHandler.setFormatter(logging.Formatter("%(message)s"))
+                g_objLog.addHandler(g_objConsoleHandler)
+            if (nVerboseLevel > 9):
+                nLevel = TRACE
+            elif (nVerboseLevel > 5):
+                nLevel = logging.DEBUG
+            else:
+                nLevel = logging.INFO
+            g_objConsoleHandler.setLevel(nLevel)
+        elif (g_objConsoleHandler):
+            g_objLog.removeHandler(g_objConsoleHandler)
+            g_objConsoleHandler = None
+        UpdateLevel()
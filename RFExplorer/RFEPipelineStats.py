@@ -0,0 +1,173 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import time
+
+from RFExplorer import RFE_Common
+
+class RFEHistogram:
+    """Histogram of non negative integer values, such as durations in nanoseconds or sizes in bytes. Every power of two
+    is split in 8 buckets, so adding a value is O(1), needs no memory and percentiles are within 12.5% of the real value
+    """
+    def __init__(self):
+        self.m_arrBuckets = [0] * (8 + 61 * 8)
+        self.m_nCount = 0
+        self.m_nSum = 0
+        self.m_nMin = 0
+        self.m_nMax = 0
+
+    @staticmethod
+    def GetBucket(nValue):
+        """Index of the bucket of a value, values below 8 have their own bucket
+        """
+        if (nValue < 8):
+            return nValue
+        nShift = min(nValue.bit_length(), 64) - 4
+        return 8 + nShift * 8 + ((nValue >> nShift) & 7)
+
+    @staticmethod
+    def GetBucketLimit(nBucket):
+        """Highest value of a bucket
+        """
+        if (nBucket < 8):
+            return nBucket
+        nShift, nSub = divmod(nBucket - 8, 8)
+        return ((9 + nSub) << nShift) - 1
+
+    def Add(self, nValue):
+        """Add a new value, negative values are counted as 0
+        """
+        if (nValue < 0):
+            nValue = 0
+        self.m_arrBuckets[self.GetBucket(nValue)] += 1
+        if ((self.m_nCount == 0) or (nValue < self.m_nMin)):
+            self.m_nMin = nValue
+        if (nValue > self.m_nMax):
+            self.m_nMax = nValue
+        self.m_nCount += 1
+        self.m_nSum += nValue
+
+    @property
+    def Count(self):
+        return self.m_nCount
+
+    @property
+    def Sum(self):
+        return self.m_nSum
+
+    @property
+    def Mean(self):
+        return (self.m_nSum / self.m_nCount) if self.m_nCount else 0.0
+
+    def Percentile(self, fPercent):
+        """Approximate value below which a percentage of the values are
+
+        Parameters:
+            fPercent -- Percentage, from 0 to 100
+        Returns:
+            Integer upper limit of the bucket containing the percentile, within Min and Max. 0 if there are no values
+        """
+        if (self.m_nCount == 0):
+            return 0
+        nTarget = max(1, int(self.m_nCount * fPercent / 100.0 + 0.5))
+        nCumulative = 0
+        for nBucket, nBucketCount in enumerate(self.m_arrBuckets):
+            nCumulative += nBucketCount
+            if (nCumulative >= nTarget):
+                return max(self.m_nMin, min(self.m_nMax, self.GetBucketLimit(nBucket)))
+        return self.m_nMax
+
+    def Snapshot(self):
+        """Summary of the values added
+
+        Returns:
+            Dictionary with Count, Sum, Mean, Min, Max, P50, P90 and P99
+        """
+        return {"Count": self.m_nCount, "Sum": self.m_nSum, "Mean": self.Mean, "Min": self.m_nMin, "Max": self.m_nMax,
+                "P50": self.Percentile(50), "P90": self.Percentile(90), "P99": self.Percentile(99)}
+
+class RFEPipelineStats:
+    """Counters and histograms of every stage of the receive pipeline: port reads, framing, sweep decoding, receive
+    queue and consumer processing. The receive thread and the consumer update different fields without locking, so a 
+    snapshot taken while data is being received may be off by the values of a single read
+    """
+    def __init__(self):
+        self.Reset()
+
+    def Reset(self):
+        """Clear all counters and histograms
+        """
+        self.m_nStartNS = time.monotonic_ns()
+        self.m_nBytesRead = 0
+        self.m_objReadSize = RFEHistogram()         #bytes returned by every port read with data
+        self.m_arrFrames = [0] * len(RFE_Common.eFrameType)
+        self.m_objFramingNS = RFEHistogram()        #time finding frames in every read, without processing them
+        self.m_objDecodeNS = RFEHistogram()         #time converting the bytes of a sweep into amplitudes
+        self.m_objQueueWaitNS = RFEHistogram()      #time a sweep waited in the receive queue
+        self.m_objProcessNS = RFEHistogram()        #time the consumer took to process an object, callbacks included
+        self.m_objLatencyNS = RFEHistogram()        #time from the last byte of a sweep read to its SWEEP notification
+
+    def AddRead(self, nBytes):
+        self.m_nBytesRead += nBytes
+        self.m_objReadSize.Add(nBytes)
+
+    def AddFrame(self, eType):
+        self.m_arrFrames[eType.value] += 1
+
+    def AddFraming(self, nElapsedNS):
+        self.m_objFramingNS.Add(nElapsedNS)
+
+    def AddDecode(self, nElapsedNS):
+        self.m_objDecodeNS.Add(nElapsedNS)
+
+    def AddQueueWait(self, nElapsedNS):
+        self.m_objQueueWaitNS.Add(nElapsedNS)
+
+    def AddProcess(self, nElapsedNS):
+        self.m_objProcessNS.Add(nElapsedNS)
+
+    def AddLatency(self, nElapsedNS):
+        self.m_objLatencyNS.Add(nElapsedNS)
+
+    def Snapshot(self):
+        """Current value of all counters. Times are in nanoseconds and sizes in bytes
+
+        Returns:
+            Dictionary with ElapsedSec, BytesRead, BytesPerSecond, ReadSize, Frames (count per RFE_Common.eFrameType name),
+            EEOTAborts, CorruptedFrames, FramingNS, DecodeNS, QueueWaitNS, ProcessNS and LatencyNS. Histograms are 
+            dictionaries as returned by RFEHistogram.Snapshot
+        """
+        fElapsedSec = (time.monotonic_ns() - self.m_nStartNS) / 1e9
+        return {"ElapsedSec": fElapsedSec,
+                "BytesRead": self.m_nBytesRead,
+                "BytesPerSecond": (self.m_nBytesRead / fElapsedSec) if (fElapsedSec > 0) else 0.0,
+                "ReadSize": self.m_objReadSize.Snapshot(),
+                "Frames": {eType.name: self.m_arrFrames[eType.value] for eType in RFE_Common.eFrameType},
+                "EEOTAborts": self.m_arrFrames[RFE_Common.eFrameType.EEOT.value],
+                "CorruptedFrames": self.m_arrFrames[RFE_Common.eFrameType.CORRUPTED.value],
+                "FramingNS": self.m_objFramingNS.Snapshot(),
+                "DecodeNS": self.m_objDecodeNS.Snapshot(),
+                "QueueWaitNS": self.m_objQueueWaitNS.Snapshot(),
+                "ProcessNS": self.m_objProcessNS.Snapshot(),
+                "LatencyNS": self.m_objLatencyNS.Snapshot()}
@@ -0,0 +1,314 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import time
+from collections import deque
+
+from RFExplorer import RFE_Common 
+
+class RFEFrame:
+    """A single frame found in the received byte stream by RFEProtocolFramer
+    """
+    def __init__(self, eType, objData, nHeader=0, nFirstByteNS=0, nLastByteNS=0):
+        self.m_eType = eType
+        self.m_objData = objData
+        self.m_nHeader = nHeader
+        self.m_nFirstByteNS = nFirstByteNS
+        self.m_nLastByteNS = nLastByteNS
+
+    @property
+    def Type(self):
+        """Frame type, one of RFE_Common.eFrameType values
+        """
+        return self.m_eType
+
+    @property
+    def Data(self):
+        """Frame payload as a zero-copy memoryview of the framer buffer. It is only valid until the next call
+        to RFEProtocolFramer.ProcessBytes, use bytes(Data) to keep a copy. For sweeps it contains one byte per data point,
+        for text lines and calibration frames the full frame without the ending \\r\\n
+        """
+        return self.m_objData
+
+    @property
+    def Header(self):
+        """Frame type character as an integer, for instance ord('S'), ord('s') or ord('z') for sweeps. Zero if not used
+        """
+        return self.m_nHeader
+
+    @property
+    def FirstByteNS(self):
+        """time.monotonic_ns() when the first byte of the frame was read from the port
+        """
+        return self.m_nFirstByteNS
+
+    @property
+    def LastByteNS(self):
+        """time.monotonic_ns() when the last byte of the frame was read from the port
+        """
+        return self.m_nLastByteNS
+
+    def GetString(self):
+        """Decode the frame payload as a latin_1 string, as used by the legacy string based APIs
+
+        Returns:
+            String Frame payload text
+        """
+        return str(self.m_objData, "latin_1")
+
+class RFEProtocolFramer:
+    """Incremental parser of the RF Explorer byte stream. It accepts chunks of any size, keeps partial frames
+    between calls and returns typed frames as soon as they are complete. It has no dependency on the port or 
+    the communicator, so it can be used with any source of bytes
+    """
+    def __init__(self, nMaxPendingBytes=RFE_Common.CONST_MAX_PENDING_BYTES):
+        self.m_arrReceived = bytearray()    #Raw bytes received from the device, pending data starts at m_nReceivedStart
+        self.m_nReceivedStart = 0           #Read offset inside m_arrReceived, bytes before it were already processed
+        self.m_nMaxPendingBytes = nMaxPendingBytes
+        self.m_nTotalBytes = 0
+        self.m_nScannedBytes = 0            #Pending bytes of the current partial sweep already searched for EEOT, so they are not searched again
+        self.m_arrArrivals = deque()        #(stream offset where a chunk ends, time.monotonic_ns() it was read) of pending chunks
+
+    @property
+    def PendingBytes(self):
+        """Number of received bytes still pending to be processed, usually part of an incomplete frame
+        """
+        return len(self.m_arrReceived) - self.m_nReceivedStart
+
+    @property
+    def TotalBytes(self):
+        """Total number of bytes processed since the framer was created
+        """
+        return self.m_nTotalBytes
+
+    def Reset(self):
+        """Discard all received bytes pending to be processed
+        """
+        try:
+            del self.m_arrReceived[:]
+        except BufferError:
+            #some frame still holds a view of the old buffer, leave it to that view and start a new one
+            self.m_arrReceived = bytearray()
+        self.m_nReceivedStart = 0
+        self.m_nScannedBytes = 0
+        self.m_arrArrivals.clear()
+
+    def ProcessBytes(self, objChunk, nArrivalNS=None, nFirstByteNS=None):
+        """Add a new chunk of received bytes and yield all frames completed with it. Incomplete frames are
+        kept and completed on later calls
+
+        Parameters:
+            objChunk     -- Bytes-like object with new data received from the device
+            nArrivalNS   -- time.monotonic_ns() when the chunk was read, None to use the current time
+            nFirstByteNS -- time.monotonic_ns() when the first byte of the chunk was read, if it was read before the 
+                            rest. None if all bytes arrived at nArrivalNS
+        Returns:
+            Generator of RFEFrame objects, in the same order they were received
+        """
+        self.AppendBytes(objChunk, nArrivalNS, nFirstByteNS)
+        while (True):
+            objFrame = self.GetNextFrame()
+            if (objFrame is None):
+                break
+            yield objFrame
+        if (self.PendingBytes > self.m_nMaxPendingBytes):
+            #Safety code, some error prevented the buffer from being processed in several calls. Reset it.
+            nStreamStart = self.m_nTotalBytes - self.PendingBytes
+            objFrame = RFEFrame(RFE_Common.eFrameType.OVERFLOW, bytes(memoryview(self.m_arrReceived)[self.m_nReceivedStart:]), 0, 
+                                self.GetArrivalNS(nStreamStart), self.GetArrivalNS(self.m_nTotalBytes - 1))
+            self.Reset()
+            yield objFrame
+
+    def AppendBytes(self, objChunk, nArrivalNS=None, nFirstByteNS=None):
+        """Add new bytes at the end of the receive buffer, compacting it first if most of the buffer was already
+        processed. Compaction happens at most once per chunk, so the cost of moving pending data is amortized 
+        over all the frames processed in between
+
+        Parameters:
+            objChunk     -- Bytes-like object with the new data received from the device
+            nArrivalNS   -- See ProcessBytes
+            nFirstByteNS -- See ProcessBytes
+        """
+        if (not objChunk):
+            return
+        if (nArrivalNS is None):
+            nArrivalNS = time.monotonic_ns()
+        if ((nFirstByteNS is not None) and (len(objChunk) > 1)):
+            self.m_arrArrivals.append((self.m_nTotalBytes + 1, nFirstByteNS))
+        self.m_nTotalBytes += len(objChunk)
+        self.m_arrArrivals.append((self.m_nTotalBytes, nArrivalNS))
+        if (self.m_nReceivedStart > 0 and (self.m_nReceivedStart * 2) >= len(self.m_arrReceived)):
+            try:
+                del self.m_arrReceived[:self.m_nReceivedStart]
+            except BufferError:
+                self.m_arrReceived = bytearray(memoryview(self.m_arrReceived)[self.m_nReceivedStart:])
+            self.m_nReceivedStart = 0
+        try:
+            self.m_arrReceived += objChunk
+        except BufferError:
+            self.m_arrReceived = self.m_arrReceived[self.m_nReceivedStart:] + objChunk
+            self.m_nReceivedStart = 0
+
+    def GetArrivalNS(self, nStreamOffset):
+        """Time a pending byte was read from the port
+
+        Parameters:
+            nStreamOffset -- Position of the byte in the whole stream, counted from the first byte in TotalBytes
+        Returns:
+            Integer time.monotonic_ns() when the chunk containing the byte was read
+        """
+        for nChunkEnd, nArrivalNS in self.m_arrArrivals:
+            if (nStreamOffset < nChunkEnd):
+                return nArrivalNS
+        return self.m_arrArrivals[-1][1] if self.m_arrArrivals else time.monotonic_ns()
+
+    def ConsumeBytes(self, nBytes):
+        """Mark bytes at the start of the pending data as processed. The buffer is not copied here, only the
+        read offset is moved
+
+        Parameters:
+            nBytes -- Number of bytes to consume
+        """
+        self.m_nReceivedStart += nBytes
+        self.m_nScannedBytes = 0
+        if (self.m_nReceivedStart >= len(self.m_arrReceived)):
+            self.Reset()
+        else:
+            nStreamStart = self.m_nTotalBytes - self.PendingBytes
+            while (self.m_arrArrivals and (self.m_arrArrivals[0][0] <= nStreamStart)):
+                self.m_arrArrivals.popleft()
+
+    def CreateFrame(self, eType, nStart, nEnd, nConsumed, nHeader=0):
+        """Create a frame with a zero-copy view of the receive buffer and consume it
+
+        Parameters:
+            eType     -- Frame type, one of RFE_Common.eFrameType values
+            nStart    -- Start of the frame payload, absolute index in the receive buffer
+            nEnd      -- End of the frame payload (not included), absolute index in the receive buffer
+            nConsumed -- Total bytes to consume from the start of pending data
+            nHeader   -- Frame type character, see RFEFrame.Header
+        Returns:
+            RFEFrame New frame, stamped with the time its first and last bytes were read
+        """
+        nStreamStart = self.m_nTotalBytes - self.PendingBytes
+        objFrame = RFEFrame(eType, memoryview(self.m_arrReceived)[nStart:nEnd], nHeader, self.GetArrivalNS(nStreamStart), self.GetArrivalNS(nStreamStart + nConsumed - 1))
+        self.ConsumeBytes(nConsumed)
+        return objFrame
+
+    def GetNextFrame(self):
+        """Find the next complete frame at the start of pending data and consume it
+
+        Returns:
+            RFEFrame Next frame, or None if more data is needed
+        """
+        arrReceived = self.m_arrReceived
+        nStart = self.m_nReceivedStart
+        nLen = len(arrReceived) - nStart
+        if (nLen <= 1):
+            return None
+
+        nFirst = arrReceived[nStart]
+        if (nFirst == ord('$')):
+            nSecond = arrReceived[nStart + 1]
+            if (nLen > 4 and (nSecond == ord('C'))):
+                nSize = 2 #account for cr+lf
+                #calibration data
+                if (arrReceived[nStart + 2] == ord('c')) or (arrReceived[nStart + 2] == ord('d')): 
+                    nSize += arrReceived[nStart + 3] + 4
+                elif (arrReceived[nStart + 2] == ord('b')): 
+                    nSize += (arrReceived[nStart + 4] + 1) * 16 + 10
+                if (nSize > 2 and nLen >= nSize):
+                    return self.CreateFrame(RFE_Common.eFrameType.CALIBRATION_DATA, nStart, nStart + nSize - 2, nSize, nSecond)
+            elif (nLen > 2 and ((nSecond == ord('q')) or (nSecond == ord('Q')))):
+                #this is internal calibration data dump
+                nReceivedLength = arrReceived[nStart + 2]
+                nExtraLength = 3
+                if (nSecond == ord('Q')):
+                    if (nLen <= 3):
+                        return None
+                    nReceivedLength += 0x100 * arrReceived[nStart + 3]
+                    nExtraLength = 4
+
+                if (nLen >= (nExtraLength + nReceivedLength + 2)):
+                    return self.CreateFrame(RFE_Common.eFrameType.CALIBRATION_DUMP, nStart, nStart + nExtraLength + nReceivedLength, nExtraLength + nReceivedLength + 2, nSecond)
+            elif (nSecond == ord('D')):
+                #This is dump screen data, 128x8 bytes
+                if (nLen >= (4 + 128 * 8)):
+                    return self.CreateFrame(RFE_Common.eFrameType.SCREEN_DUMP, nStart + 2, nStart + 2 + 128 * 8, 4 + 128 * 8, nSecond)
+            elif (nLen > 3 and ((nSecond == ord('S')) or (nSecond == ord('s')) or (nSecond == ord('z')))):
+                return self.GetSweepFrame(nStart, nLen, nSecond)
+            return None
+
+        #'#' configuration and status lines, as well as any other text line
+        nEndPos = arrReceived.find(b"\r\n", nStart)
+        if (nEndPos >= 0):
+            return self.CreateFrame(RFE_Common.eFrameType.TEXT_LINE, nStart, nEndPos, nEndPos + 2 - nStart, nFirst)
+        return None
+
+    def GetSweepFrame(self, nStart, nLen, nSweepType):
+        """Find a standard spectrum analyzer data frame ($S, $s or $z) at the start of pending data
+
+        Parameters:
+            nStart     -- Absolute index in the receive buffer where the frame starts
+            nLen       -- Number of pending bytes in the receive buffer
+            nSweepType -- Second byte of the frame: 'S', 's' or 'z'
+        Returns:
+            RFEFrame Sweep frame, EEOT or CORRUPTED frame, or None if more data is needed
+        """
+        arrReceived = self.m_arrReceived
+        nReceivedLength = arrReceived[nStart + 2]
+        nSizeChars = 3
+        if (nSweepType == ord('s')):
+            if (nReceivedLength == 0):
+                nReceivedLength = 256
+            nReceivedLength *= 16
+        elif (nSweepType == ord('z')):
+            nReceivedLength *= 256
+            nReceivedLength += arrReceived[nStart + 3]
+            nSizeChars+=1
+        nEndData = nStart + nSizeChars + nReceivedLength
+        bLengthOK = (nLen >= (nSizeChars + nReceivedLength + 2))    #OK if received data >= header command($S,$s or $z) + data length + end of line('\n\r')
+        if (bLengthOK and (arrReceived[nEndData] == ord('\r')) and (arrReceived[nEndData + 1] == ord('\n'))):
+            #So we are here because received the full set of chars expected, and all them are apparently of valid characters
+            return self.CreateFrame(RFE_Common.eFrameType.SWEEP, nStart + nSizeChars, nEndData, nSizeChars + nReceivedLength + 2, nSweepType)
+
+        #Check if not all bytes were received but EEOT is detected. Resume the search where the previous call stopped,
+        #overlapping it in case EEOT was split between two chunks. EEOT can only interrupt this frame, so do not search
+        #beyond its expected end or an EEOT of a later frame would discard valid frames in between
+        nScanStart = nStart + max(0, self.m_nScannedBytes - len(RFE_Common.CONST_EEOT_BYTES) + 1)
+        nIndexEEOT = arrReceived.find(RFE_Common.CONST_EEOT_BYTES, nScanStart, nEndData + 2 + len(RFE_Common.CONST_EEOT_BYTES)) 
+        if (nIndexEEOT == -1):
+            self.m_nScannedBytes = nLen
+        else:
+            #If EEOT detected, remove from received buffer so we ignore the partially received data
+            return self.CreateFrame(RFE_Common.eFrameType.EEOT, nStart, nIndexEEOT, nIndexEEOT + len(RFE_Common.CONST_EEOT_BYTES) - nStart, nSweepType)
+
+        if (bLengthOK):
+            #So we are here because the string doesn't end with the expected chars, but has the right length.
+            #The most likely cause is a truncated string was received, and some chars are from next string, not
+            #this one therefore we truncate the line to avoid being much larger, and start over again next time.
+            nPosNextLine = arrReceived.find(b"\r\n", nStart)
+            if (nPosNextLine >= 0):
+                return self.CreateFrame(RFE_Common.eFrameType.CORRUPTED, nStart, nPosNextLine, nPosNextLine + 2 - nStart, nSweepType)
+        return None
@@ -0,0 +1,243 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import queue
+import threading
+import time
+from collections import deque
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFESweepData import RFESweepData
+
+class RFEReceiveQueue:
+    """Queue of objects received from the device, waiting to be processed by RFECommunicator. It can be used as a
+    queue.Queue, but the number of sweeps it holds is limited to Capacity and OverflowPolicy decides which sweeps are
+    discarded beyond it. Any other object, such as configurations or #ACK, is never discarded nor counted
+    """
+    def __init__(self, nCapacity=RFE_Common.CONST_RECEIVE_QUEUE_SWEEPS, eOverflowPolicy=RFE_Common.eOverflowPolicy.DROP_OLDEST):
+        self.m_hCondition = threading.Condition()
+        self.m_arrObjects = deque()
+        self.m_nSweeps = 0              #sweeps in m_arrObjects
+        self.m_nCapacity = nCapacity
+        self.m_eOverflowPolicy = eOverflowPolicy
+        self.m_nSweepsDropped = 0
+        self.m_nOverflows = 0
+        self.m_nMaxSweeps = 0
+
+    @property
+    def Capacity(self):
+        """Get/Set max number of sweeps in the queue, 0 for no limit
+        """
+        return self.m_nCapacity
+    @Capacity.setter
+    def Capacity(self, value):
+        with self.m_hCondition:
+            self.m_nCapacity = value
+            self.m_hCondition.notify_all()
+
+    @property
+    def OverflowPolicy(self):
+        """Get/Set RFE_Common.eOverflowPolicy applied when a sweep arrives and the queue holds Capacity sweeps
+        """
+        return self.m_eOverflowPolicy
+    @OverflowPolicy.setter
+    def OverflowPolicy(self, value):
+        with self.m_hCondition:
+            self.m_eOverflowPolicy = value
+            self.m_hCondition.notify_all()
+
+    @property
+    def SweepsDropped(self):
+        """Number of sweeps discarded because the queue was full
+        """
+        return self.m_nSweepsDropped
+
+    @property
+    def Overflows(self):
+        """Number of sweeps which arrived when the queue was full, whatever the policy applied
+        """
+        return self.m_nOverflows
+
+    @property
+    def MaxSweeps(self):
+        """Highest number of sweeps waiting in the queue at the same time
+        """
+        return self.m_nMaxSweeps
+
+    @property
+    def Sweeps(self):
+        """Number of sweeps waiting in the queue
+        """
+        return self.m_nSweeps
+
+    def IsFull(self):
+        return (self.m_nCapacity > 0) and (self.m_nSweeps >= self.m_nCapacity)
+
+    def DropSweeps(self, nMaxDropped):
+        """Discard the oldest sweeps queued, must be called with the lock held. Only the objects before the last sweep
+        dropped are visited, so it does not depend on the number of objects queued
+
+        Parameters:
+            nMaxDropped -- Max number of sweeps to discard
+        """
+        arrKept = []        #objects which are not sweeps found before the sweeps dropped, usually none
+        nDropped = 0
+        while (self.m_arrObjects and (nDropped < nMaxDropped)):
+            objOld = self.m_arrObjects.popleft()
+            if (isinstance(objOld, RFESweepData)):
+                nDropped += 1
+            else:
+                arrKept.append(objOld)
+        if (arrKept):
+            self.m_arrObjects.extendleft(reversed(arrKept))
+        self.m_nSweeps -= nDropped
+        self.m_nSweepsDropped += nDropped
+
+    def AddObject(self, objNew, fnKeepWaiting):
+        """Queue a new object applying OverflowPolicy, must be called with the lock held
+
+        Returns:
+            Boolean False if the object was discarded
+        """
+        if (isinstance(objNew, RFESweepData)):
+            if (self.IsFull()):
+                self.m_nOverflows += 1
+                eOverflowPolicy = self.m_eOverflowPolicy
+                if (eOverflowPolicy == RFE_Common.eOverflowPolicy.DROP_NEWEST):
+                    self.m_nSweepsDropped += 1
+                    return False
+                if (eOverflowPolicy == RFE_Common.eOverflowPolicy.DROP_OLDEST):
+                    self.DropSweeps(self.m_nSweeps - self.m_nCapacity + 1)
+                elif (eOverflowPolicy == RFE_Common.eOverflowPolicy.LATEST):
+                    self.DropSweeps(self.m_nSweeps)
+                elif (fnKeepWaiting):
+                    self.m_hCondition.notify_all()     #objects added before in the same batch can be taken meanwhile
+                    while (self.IsFull() and (self.m_eOverflowPolicy == RFE_Common.eOverflowPolicy.BLOCK)):
+                        if (not fnKeepWaiting()):
+                            self.m_nSweepsDropped += 1
+                            return False
+                        self.m_hCondition.wait(RFE_Common.CONST_READ_TIMEOUT_SEC)
+            self.m_nSweeps += 1
+            if (self.m_nSweeps > self.m_nMaxSweeps):
+                self.m_nMaxSweeps = self.m_nSweeps
+        self.m_arrObjects.append(objNew)
+        return True
+
+    def put(self, objNew, fnKeepWaiting=None):
+        """Queue a new object, applying OverflowPolicy if it is a sweep and the queue is full
+
+        Parameters:
+            objNew        -- Object to queue, a string, RFEConfiguration or RFESweepData
+            fnKeepWaiting -- Function returning False when a blocked put must give up, the sweep is discarded then.
+                             None to never block, so eOverflowPolicy.BLOCK queues the sweep beyond Capacity, this is
+                             used when the thread queuing sweeps is also the one processing them
+        """
+        with self.m_hCondition:
+            if (self.AddObject(objNew, fnKeepWaiting)):
+                self.m_hCondition.notify_all()
+
+    def put_many(self, arrObjects, fnKeepWaiting=None):
+        """Queue several objects in order taking the lock and waking up the consumer only once, as put does for each
+
+        Parameters:
+            arrObjects    -- List of objects to queue
+            fnKeepWaiting -- See put
+        """
+        if (not arrObjects):
+            return
+        with self.m_hCondition:
+            bAdded = False
+            for objNew in arrObjects:
+                bAdded = self.AddObject(objNew, fnKeepWaiting) or bAdded
+            if (bAdded):
+                self.m_hCondition.notify_all()
+
+    def WaitForObjects(self, fTimeoutSec):
+        """Wait for the queue to be not empty, must be called with the lock held
+
+        Parameters:
+            fTimeoutSec -- Max time to wait in seconds, None to wait forever
+        """
+        fDeadline = None if (fTimeoutSec is None) else (time.monotonic() + fTimeoutSec)
+        while (not self.m_arrObjects):
+            fRemaining = None if (fDeadline is None) else (fDeadline - time.monotonic())
+            if ((fRemaining is not None) and (fRemaining <= 0)):
+                break
+            self.m_hCondition.wait(fRemaining)
+
+    def get(self, block=True, timeout=None):
+        """Take the oldest object queued, as queue.Queue.get
+
+        Parameters:
+            block   -- False to not wait if the queue is empty
+            timeout -- Max time to wait in seconds, None to wait forever
+        Returns:
+            Object taken, raises queue.Empty if none was available
+        """
+        with self.m_hCondition:
+            if (block):
+                self.WaitForObjects(timeout)
+            if (not self.m_arrObjects):
+                raise queue.Empty
+            objNew = self.m_arrObjects.popleft()
+            if (isinstance(objNew, RFESweepData)):
+                self.m_nSweeps -= 1
+                if (self.m_eOverflowPolicy == RFE_Common.eOverflowPolicy.BLOCK):
+                    self.m_hCondition.notify_all()  #a blocked put may continue
+            return objNew
+
+    def get_many(self, nMaxObjects=0, block=True, timeout=None):
+        """Take all objects queued, or the oldest nMaxObjects, with a single lock acquisition
+
+        Parameters:
+            nMaxObjects -- Max number of objects to take, 0 for all of them
+            block       -- False to not wait if the queue is empty
+            timeout     -- Max time to wait in seconds, None to wait forever
+        Returns:
+            List of objects taken in arrival order, empty if none was available
+        """
+        with self.m_hCondition:
+            if (block):
+                self.WaitForObjects(timeout)
+            if ((nMaxObjects <= 0) or (nMaxObjects >= len(self.m_arrObjects))):
+                arrObjects = list(self.m_arrObjects)
+                self.m_arrObjects.clear()
+                nSweeps = self.m_nSweeps
+            else:
+                arrObjects = [self.m_arrObjects.popleft() for _ in range(nMaxObjects)]
+                nSweeps = sum(1 for objNew in arrObjects if isinstance(objNew, RFESweepData))
+            if (nSweeps):
+                self.m_nSweeps -= nSweeps
+                if (self.m_eOverflowPolicy == RFE_Common.eOverflowPolicy.BLOCK):
+                    self.m_hCondition.notify_all()
+            return arrObjects
+
+    def get_nowait(self):
+        return self.get(False)
+
+    def qsize(self):
+        return len(self.m_arrObjects)
+
+    def empty(self):
+        return not self.m_arrObjects
@@ -0,0 +1,194 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None   #NumPy is optional, data points are updated one by one without it
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFESweepData import RFESweepData
+
+class RFESlidingPercentile:
+    """Percentile of every data point over the last sweeps added, such as the median for continuous noise floor 
+    tracking. Every data point keeps a histogram of the amplitudes in the window, in steps of the resolution, and the 
+    histogram bin holding the percentile, which moves only a few bins when a sweep enters the window and the oldest one
+    leaves it. So every Add costs O(data points) whatever the window length, and Trace needs no sorting at all. 
+    Memory used is 2 bytes per data point for every sweep in the window, plus 2 bytes (4 for windows of 65535 sweeps 
+    or more) per data point and histogram bin. The traces restart when a sweep with a different configuration is added
+    """
+    def __init__(self, nWindow, fPercentile=50.0, fResolutionDB=RFE_Common.CONST_PERCENTILE_RESOLUTION_DB):
+        """Parameters:
+            nWindow       -- Number of sweeps in the window
+            fPercentile   -- Percentile from 0.0 to 100.0, 50.0 for the median
+            fResolutionDB -- Amplitude step of the histogram in dB
+        """
+        self.m_nWindow = max(1, nWindow)
+        self.m_fPercentile = min(100.0, max(0.0, fPercentile))
+        self.m_fResolutionDB = fResolutionDB
+        self.m_nBins = int(round((RFE_Common.CONST_MAX_AMPLITUDE_DBM - RFE_Common.CONST_MIN_AMPLITUDE_DBM) / fResolutionDB)) + 1
+        self.m_bResetPending = False
+        self.m_tConfig = None           #(start MHz, step MHz, data points) of the sweeps in the window
+        self.m_nCount = 0               #sweeps in the window
+        self.m_arrWindow = None         #histogram bin of every data point of every sweep in the window, oldest first
+        self.m_nHead = 0                #row of m_arrWindow with the oldest sweep, if NumPy is available
+        self.m_arrCounts = None         #number of sweeps in the window in every histogram bin of every data point
+        self.m_arrBin = None            #histogram bin holding the percentile of every data point
+        self.m_arrBelow = None          #number of sweeps in the window in bins lower than m_arrBin, every data point
+
+    @property
+    def Window(self):
+        """Number of sweeps in the window, the percentile is calculated with less while it is filling
+        """
+        return self.m_nWindow
+
+    @property
+    def Percentile(self):
+        """Percentile calculated, from 0.0 to 100.0
+        """
+        return self.m_fPercentile
+
+    @property
+    def Count(self):
+        """Number of sweeps in the window now
+        """
+        return 0 if self.m_bResetPending else self.m_nCount
+
+    @property
+    def Trace(self):
+        """RFESweepData with the percentile of every data point over the sweeps in the window, rounded to the 
+        resolution. None if no sweep was added
+        """
+        if (self.Count == 0):
+            return None
+        fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints = self.m_tConfig
+        if (np is not None):
+            arrAmplitude = (self.m_arrBin * self.m_fResolutionDB + RFE_Common.CONST_MIN_AMPLITUDE_DBM).astype(np.float32)
+        else:
+            arrAmplitude = [nBin * self.m_fResolutionDB + RFE_Common.CONST_MIN_AMPLITUDE_DBM for nBin in self.m_arrBin]
+        return RFESweepData(fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints, arrAmplitude)
+
+    def Reset(self):
+        """Empty the window. It is applied by the next Add, so it can be called from any thread
+        """
+        self.m_bResetPending = True
+
+    def GetRank(self):
+        """Position in the sorted values of the window of the percentile, the one RFESweepDataCollection.GetPercentile uses
+        """
+        return min(self.m_nCount - 1, int(self.m_fPercentile * self.m_nCount / 100.0))
+
+    def Add(self, objSweep):
+        """Add a sweep to the window, the oldest one leaves it if the window is full
+
+        Parameters:
+            objSweep -- RFESweepData to add
+        """
+        tConfig = (objSweep.StartFrequencyMHZ, objSweep.StepFrequencyMHZ, objSweep.TotalDataPoints)
+        if (self.m_bResetPending or (tConfig != self.m_tConfig)):
+            self.m_bResetPending = False
+            self.m_tConfig = tConfig
+            self.m_nCount = 0
+        if (np is not None):
+            self.AddNumPy(objSweep.m_arrAmplitude)
+        else:
+            self.AddPython(objSweep.m_arrAmplitude)
+
+    def AddNumPy(self, arrAmplitude):
+        arrBins = np.rint((np.asarray(arrAmplitude, dtype=np.float32) - RFE_Common.CONST_MIN_AMPLITUDE_DBM) / self.m_fResolutionDB)
+        arrBins = np.clip(arrBins, 0, self.m_nBins - 1).astype(np.uint16)
+        nPoints = len(arrBins)
+        arrPoints = np.arange(nPoints)
+        if (self.m_nCount == 0):
+            if ((self.m_arrWindow is None) or (self.m_arrWindow.shape[1] != nPoints)):
+                self.m_arrWindow = np.empty((self.m_nWindow, nPoints), dtype=np.uint16)
+                self.m_arrCounts = np.zeros((nPoints, self.m_nBins), dtype=(np.uint16 if self.m_nWindow < 65535 else np.uint32))
+            else:
+                self.m_arrCounts.fill(0)
+            self.m_nHead = 0
+            self.m_arrBin = arrBins.astype(np.int32)
+            self.m_arrBelow = np.zeros(nPoints, dtype=np.int32)
+        else:
+            self.m_arrBelow += (arrBins < self.m_arrBin)
+        self.m_arrCounts[arrPoints, arrBins] += 1
+        if (self.m_nCount == self.m_nWindow):
+            #the oldest sweep leaves the window, its row is used by the new one
+            arrOldBins = self.m_arrWindow[self.m_nHead]
+            self.m_arrCounts[arrPoints, arrOldBins] -= 1
+            self.m_arrBelow -= (arrOldBins < self.m_arrBin)
+            self.m_arrWindow[self.m_nHead] = arrBins
+            self.m_nHead = (self.m_nHead + 1) % self.m_nWindow
+        else:
+            self.m_arrWindow[(self.m_nHead + self.m_nCount) % self.m_nWindow] = arrBins
+            self.m_nCount += 1
+
+        #move the percentile bin of the data points where it is not valid anymore, only a few bins per sweep
+        nRank = self.GetRank()
+        arrMove = np.nonzero(self.m_arrBelow > nRank)[0]
+        while (len(arrMove) > 0):
+            self.m_arrBin[arrMove] -= 1
+            self.m_arrBelow[arrMove] -= self.m_arrCounts[arrMove, self.m_arrBin[arrMove]]
+            arrMove = arrMove[self.m_arrBelow[arrMove] > nRank]
+        arrMove = np.nonzero((self.m_arrBelow + self.m_arrCounts[arrPoints, self.m_arrBin]) <= nRank)[0]
+        while (len(arrMove) > 0):
+            self.m_arrBelow[arrMove] += self.m_arrCounts[arrMove, self.m_arrBin[arrMove]]
+            self.m_arrBin[arrMove] += 1
+            arrMove = arrMove[(self.m_arrBelow[arrMove] + self.m_arrCounts[arrMove, self.m_arrBin[arrMove]]) <= nRank]
+
+    def AddPython(self, arrAmplitude):
+        nMaxBin = self.m_nBins - 1
+        arrBins = [min(nMaxBin, max(0, int(round((fDBM - RFE_Common.CONST_MIN_AMPLITUDE_DBM) / self.m_fResolutionDB)))) for fDBM in arrAmplitude]
+        nPoints = len(arrBins)
+        if (self.m_nCount == 0):
+            self.m_arrWindow = deque()
+            self.m_arrCounts = [[0] * self.m_nBins for _ in range(nPoints)]
+            self.m_arrBin = list(arrBins)
+            self.m_arrBelow = [0] * nPoints
+        arrOldBins = self.m_arrWindow.popleft() if (self.m_nCount == self.m_nWindow) else None
+        self.m_arrWindow.append(arrBins)
+        if (arrOldBins is None):
+            self.m_nCount += 1
+        nRank = self.GetRank()
+        for nInd in range(nPoints):
+            arrCounts = self.m_arrCounts[nInd]
+            nBin = self.m_arrBin[nInd]
+            nBelow = self.m_arrBelow[nInd]
+            arrCounts[arrBins[nInd]] += 1
+            if (arrBins[nInd] < nBin):
+                nBelow += 1
+            if (arrOldBins is not None):
+                arrCounts[arrOldBins[nInd]] -= 1
+                if (arrOldBins[nInd] < nBin):
+                    nBelow -= 1
+            while (nBelow > nRank):
+                nBin -= 1
+                nBelow -= arrCounts[nBin]
+            while ((nBelow + arrCounts[nBin]) <= nRank):
+                nBelow += arrCounts[nBin]
+                nBin += 1
+            self.m_arrBin[nInd] = nBin
+            self.m_arrBelow[nInd] = nBelow
@@ -0,0 +1,227 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+import struct
+import threading
+import time
+
+from RFExplorer import RFE_Common 
+
+#Every record is stored as time in nanoseconds since the recording started, direction and data length, followed by data
+g_objRecordHeader = struct.Struct("<QBI")
+
+def ReadStreamRecords(sFileName):
+    """Read all records stored in a file written by RFEStreamRecorder
+
+    Parameters:
+        sFileName -- Name of the recording file
+    Returns:
+        List of tuples (time in nanoseconds since recording start, RFE_Common.eStreamDirection, Bytes data)
+    """
+    arrRecords = []
+    with open(sFileName, "rb") as objFile:
+        arrContent = objFile.read()
+    nMagic = len(RFE_Common.CONST_STREAM_RECORD_MAGIC)
+    if (arrContent[:nMagic] != RFE_Common.CONST_STREAM_RECORD_MAGIC):
+        raise ValueError("Not a valid RF Explorer stream recording: " + sFileName)
+    nPos = nMagic
+    while ((nPos + g_objRecordHeader.size) <= len(arrContent)):
+        nTimeNS, nDirection, nLen = g_objRecordHeader.unpack_from(arrContent, nPos)
+        nPos += g_objRecordHeader.size
+        if ((nPos + nLen) > len(arrContent)):
+            #last record truncated, most likely the recording was not closed properly
+            break
+        arrRecords.append((nTimeNS, RFE_Common.eStreamDirection(nDirection), arrContent[nPos:nPos + nLen]))
+        nPos += nLen
+    return arrRecords
+
+class RFEStreamRecorder:
+    """Store the raw byte stream exchanged with the device in a compact binary file, with the time every 
+    chunk was read or written, so it can be replayed later with RFEStreamReplayPort
+    """
+    def __init__(self, sFileName):
+        self.m_sFileName = sFileName
+        self.m_hLock = threading.Lock()
+        self.m_objFile = open(sFileName, "wb")
+        self.m_objFile.write(RFE_Common.CONST_STREAM_RECORD_MAGIC)
+        self.m_nStartTimeNS = time.monotonic_ns()
+        self.m_nTotalBytes = 0
+
+    @property
+    def FileName(self):
+        """Name of the recording file
+        """
+        return self.m_sFileName
+
+    @property
+    def IsRecording(self):
+        """True while the recording file is open
+        """
+        return (self.m_objFile is not None)
+
+    @property
+    def TotalBytes(self):
+        """Total number of data bytes recorded, in both directions
+        """
+        return self.m_nTotalBytes
+
+    def Record(self, eDirection, objData):
+        """Add a chunk of bytes to the recording, stamped with the current time
+
+        Parameters:
+            eDirection -- RFE_Common.eStreamDirection of the data
+            objData    -- Bytes-like object as read from or written to the port
+        """
+        nTimeNS = time.monotonic_ns() - self.m_nStartTimeNS
+        self.m_hLock.acquire()
+        try:
+            if (self.m_objFile):
+                self.m_objFile.write(g_objRecordHeader.pack(nTimeNS, eDirection.value, len(objData)))
+                self.m_objFile.write(objData)
+                self.m_nTotalBytes += len(objData)
+        finally:
+            self.m_hLock.release()
+
+    def Close(self):
+        """Flush and close the recording file
+        """
+        self.m_hLock.acquire()
+        try:
+            if (self.m_objFile):
+                self.m_objFile.close()
+                self.m_objFile = None
+        finally:
+            self.m_hLock.release()
+
+class RFEStreamReplayPort:
+    """Serial port replacement that plays back the bytes received in a file written by RFEStreamRecorder.
+    It implements the subset of serial.Serial used by RFECommunicator and ReceiveSerialThread, so the full
+    receive pipeline can run offline. Bytes sent to it are ignored
+    """
+    def __init__(self, sFileName, bRealtime=True):
+        self.port = sFileName
+        self.baudrate = 500000
+        self.bytesize = 8
+        self.stopbits = 1
+        self.Parity = "N"
+        self.timeout = RFE_Common.CONST_READ_TIMEOUT_SEC
+        self.m_bRealtime = bRealtime
+        self.m_hLock = threading.Lock()
+        self.m_arrRecords = [(nTimeNS, arrData) for nTimeNS, eDirection, arrData in ReadStreamRecords(sFileName)
+                             if (eDirection == RFE_Common.eStreamDirection.RX and arrData)]
+        self.m_nRecord = 0          #next record to read
+        self.m_nRecordOffset = 0    #bytes of the next record already read
+        self.m_nStartTimeNS = 0
+        self.m_bOpen = False
+
+    @property
+    def is_open(self):
+        return self.m_bOpen
+
+    @property
+    def Realtime(self):
+        """True to deliver every record at its original time, False to deliver them as fast as they are read
+        """
+        return self.m_bRealtime
+
+    @property
+    def IsFinished(self):
+        """True when all recorded bytes were already read
+        """
+        return (self.m_nRecord >= len(self.m_arrRecords))
+
+    def open(self):
+        """Start the replay from the beginning of the recording
+        """
+        self.m_nRecord = 0
+        self.m_nRecordOffset = 0
+        self.m_nStartTimeNS = time.monotonic_ns()
+        self.m_bOpen = True
+
+    def close(self):
+        self.m_bOpen = False
+
+    def write(self, objData):
+        return len(objData)
+
+    def GetAvailableRecords(self):
+        """Index of the first record not yet due, records before it can be read now. In fast mode only the
+        next record is available each time, so reads keep the original chunk sizes
+
+        Returns:
+            Integer Record index
+        """
+        if (self.IsFinished):
+            return self.m_nRecord
+        if (not self.m_bRealtime):
+            return self.m_nRecord + 1
+        nElapsedNS = time.monotonic_ns() - self.m_nStartTimeNS
+        nEnd = self.m_nRecord
+        while (nEnd < len(self.m_arrRecords) and self.m_arrRecords[nEnd][0] <= nElapsedNS):
+            nEnd += 1
+        return nEnd
+
+    @property
+    def in_waiting(self):
+        self.m_hLock.acquire()
+        try:
+            nEnd = self.GetAvailableRecords()
+            nBytes = -self.m_nRecordOffset if (nEnd > self.m_nRecord) else 0
+            for nInd in range(self.m_nRecord, nEnd):
+                nBytes += len(self.m_arrRecords[nInd][1])
+            return nBytes
+        finally:
+            self.m_hLock.release()
+
+    def read(self, nSize=1):
+        """Read up to nSize bytes, waiting up to timeout seconds if nothing is available yet
+
+        Parameters:
+            nSize -- Max number of bytes to read
+        Returns:
+            Bytes Data read, empty if nothing was available before timeout
+        """
+        if (self.in_waiting == 0 and self.m_bOpen):
+            #wait for the next record time, or the whole timeout if the recording is finished
+            fWait = self.timeout if (self.timeout is not None) else RFE_Common.CONST_READ_TIMEOUT_SEC
+            if (not self.IsFinished and self.m_bRealtime):
+                nDueNS = self.m_arrRecords[self.m_nRecord][0] - (time.monotonic_ns() - self.m_nStartTimeNS)
+                fWait = min(fWait, max(0, nDueNS) / 1e9)
+            time.sleep(fWait)
+
+        arrData = bytearray()
+        self.m_hLock.acquire()
+        try:
+            nEnd = self.GetAvailableRecords()
+            while (self.m_nRecord < nEnd and len(arrData) < nSize):
+                arrRecord = self.m_arrRecords[self.m_nRecord][1]
+                nCopy = min(nSize - len(arrData), len(arrRecord) - self.m_nRecordOffset)
+                arrData += arrRecord[self.m_nRecordOffset:self.m_nRecordOffset + nCopy]
+                self.m_nRecordOffset += nCopy
+                if (self.m_nRecordOffset >= len(arrRecord)):
+                    self.m_nRecord += 1
+                    self.m_nRecordOffset = 0
+        finally:
+            self.m_hLock.release()
+        return bytes(arrData)
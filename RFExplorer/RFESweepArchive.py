@@ -0,0 +1,394 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+
+import bisect
+import json
+import os
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None   #NumPy is required by RFESweepArchive
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFESweepData import RFESweepData, MonotonicToTimeNS, TimeNSToDateTime
+from RFExplorer.RFELogging import g_objSweepLog
+
+if (np is not None):
+    #record of the index file for every sweep in the archive
+    g_objIndexType = np.dtype([("TimeNS", "<i8"), ("FirstByteNS", "<i8"), ("LastByteNS", "<i8"), ("ConfigID", "<i4"), ("Reserved", "<i4")])
+else:
+    g_objIndexType = None
+
+class RFESweepArchive:
+    """Append-only archive of sweeps in a folder, for captures larger than RAM. Amplitudes are stored in a file as a 
+    float32 matrix with a fixed number of data points per sweep, Width, and every sweep has a record in an index file 
+    with its wall clock time, arrival times and configuration; configurations are stored in a JSON header. Both files
+    are read through memory maps, so queries over any number of sweeps return slices of the files without loading or
+    copying them. A sweep wider than Width starts a new amplitude file, a segment, with its width, so a device can be
+    reconfigured at any time. Sweeps are appended with ordinary writes, and the archive can be opened again to add 
+    more sweeps. It requires NumPy
+    """
+    def __init__(self):
+        self.m_sFolder = ""
+        self.m_hLock = threading.RLock()
+        self.m_objAmplitudeFile = None
+        self.m_objIndexFile = None
+        self.m_nWidth = 0
+        self.m_nCount = 0
+        self.m_arrSegments = []         #[index of the first sweep, data points per sweep] of every amplitude file
+        self.m_arrConfigs = []          #(start MHz, step MHz, data points) of the sweeps in the archive
+        self.m_dictConfigIDs = {}
+        self.m_arrRow = None            #float32 buffer to write a sweep
+        self.m_arrIndexRecord = None    #index record buffer to write a sweep
+        self.m_arrAmplitudeMaps = []    #memory map of the amplitude file of every segment, None if it is not mapped
+        self.m_arrIndexMap = None       #memory map of the index file, m_nMappedRows sweeps
+        self.m_nMappedRows = 0
+
+    @property
+    def Folder(self):
+        """Folder of the archive files, empty if it is not open
+        """
+        return self.m_sFolder
+
+    @property
+    def IsOpen(self):
+        return (self.m_objAmplitudeFile is not None)
+
+    @property
+    def Count(self):
+        """Number of sweeps in the archive
+        """
+        return self.m_nCount
+
+    @property
+    def Width(self):
+        """Data points stored for every sweep in the current segment, a wider sweep starts a new one. 0 until the first
+        sweep is added to a new archive, if no width was given to Open
+        """
+        return self.m_nWidth
+
+    @property
+    def Segments(self):
+        """Number of amplitude files, one more every time a sweep wider than Width is added
+        """
+        return len(self.m_arrSegments)
+
+    @property
+    def RowBytes(self):
+        """Bytes used by every sweep of the current segment in the archive files
+        """
+        return self.m_nWidth * 4 + g_objIndexType.itemsize
+
+    def GetFileName(self, sName):
+        return os.path.join(self.m_sFolder, sName)
+
+    def GetAmplitudeFileName(self, nSegment):
+        """Amplitude file of a segment, the first one has no number
+        """
+        sName = RFE_Common.CONST_ARCHIVE_AMPLITUDE_FILE
+        if (nSegment > 0):
+            sRoot, sExtension = os.path.splitext(sName)
+            sName = "{0}_{1:03d}{2}".format(sRoot, nSegment, sExtension)
+        return self.GetFileName(sName)
+
+    def GetSegment(self, nIndex):
+        """Segment of a sweep
+
+        Returns:
+            Integer Index of the segment, first sweep of the segment and first sweep of the next one
+        """
+        nSegment = bisect.bisect_right([arrSegment[0] for arrSegment in self.m_arrSegments], nIndex) - 1
+        return nSegment, self.m_arrSegments[nSegment][0], self.GetSegmentEnd(nSegment)
+
+    def GetSegmentEnd(self, nSegment):
+        if (nSegment + 1 < len(self.m_arrSegments)):
+            return self.m_arrSegments[nSegment + 1][0]
+        return self.m_nCount
+
+    def Open(self, sFolder, nWidth=0):
+        """Open an archive, it is created if the folder does not contain one. Any sweep partially written when the 
+        archive was not closed properly is discarded
+
+        Parameters:
+            sFolder -- Folder of the archive files, it is created if it does not exist
+            nWidth  -- Data points stored for every sweep of a new archive, 0 to use the data points of the first sweep.
+                       Sweeps with more data points start a new segment
+        Returns:
+		    Boolean True if the archive was opened, otherwise False
+        """
+        self.Close()
+        if (np is None):
+            g_objSweepLog.error("Error in RFESweepArchive - Open(): NumPy is required")
+            return False
+        with self.m_hLock:
+            try:
+                self.m_sFolder = sFolder
+                os.makedirs(sFolder, exist_ok=True)
+                self.m_arrSegments = [[0, nWidth]]
+                self.m_arrConfigs = []
+                if (os.path.isfile(self.GetFileName(RFE_Common.CONST_ARCHIVE_HEADER_FILE))):
+                    with open(self.GetFileName(RFE_Common.CONST_ARCHIVE_HEADER_FILE), "r") as objFile:
+                        dicHeader = json.load(objFile)
+                    self.m_arrSegments = [[int(nFirst), int(nSegmentWidth)] for nFirst, nSegmentWidth in dicHeader["Segments"]]
+                    self.m_arrConfigs = [tuple(arrConfig) for arrConfig in dicHeader["Configs"]]
+                self.m_dictConfigIDs = {tConfig: nConfigID for nConfigID, tConfig in enumerate(self.m_arrConfigs)}
+                self.m_arrAmplitudeMaps = [None] * len(self.m_arrSegments)
+                nFirst, self.m_nWidth = self.m_arrSegments[-1]
+                sAmplitudeFile = self.GetAmplitudeFileName(len(self.m_arrSegments) - 1)
+                sIndexFile = self.GetFileName(RFE_Common.CONST_ARCHIVE_INDEX_FILE)
+                self.m_nCount = nFirst
+                if (self.m_nWidth > 0 and os.path.isfile(sAmplitudeFile) and os.path.isfile(sIndexFile)):
+                    self.m_nCount = min(nFirst + os.path.getsize(sAmplitudeFile) // (self.m_nWidth * 4), os.path.getsize(sIndexFile) // g_objIndexType.itemsize)
+                self.m_objAmplitudeFile = open(sAmplitudeFile, "ab")
+                self.m_objIndexFile = open(sIndexFile, "ab")
+                #sweeps must start at a multiple of the row size, whatever was written after the last complete sweep
+                self.m_objAmplitudeFile.truncate((self.m_nCount - nFirst) * self.m_nWidth * 4)
+                self.m_objIndexFile.truncate(self.m_nCount * g_objIndexType.itemsize)
+                self.m_arrIndexRecord = np.zeros(1, dtype=g_objIndexType)
+                self.m_arrRow = None
+                if (self.m_nWidth > 0):
+                    self.SaveHeader()
+            except Exception as obEx:
+                g_objSweepLog.error("Error in RFESweepArchive - Open(): %s", obEx)
+                self.Close()
+                return False
+        return True
+
+    def Close(self):
+        """Close the archive files, arrays returned before keep their data
+        """
+        with self.m_hLock:
+            for objFile in (self.m_objAmplitudeFile, self.m_objIndexFile):
+                if (objFile):
+                    try:
+                        objFile.close()
+                    except Exception as obEx:
+                        g_objSweepLog.error("Error in RFESweepArchive - Close(): %s", obEx)
+            self.m_objAmplitudeFile = None
+            self.m_objIndexFile = None
+            self.m_arrAmplitudeMaps = []
+            self.m_arrIndexMap = None
+            self.m_nMappedRows = 0
+            self.m_sFolder = ""
+
+    def SaveHeader(self):
+        """Write the JSON header with segments and configurations. A temporary file is replaced, so it is never left 
+        half written
+        """
+        sFileName = self.GetFileName(RFE_Common.CONST_ARCHIVE_HEADER_FILE)
+        with open(sFileName + ".tmp", "w") as objFile:
+            json.dump({"Format": RFE_Common.CONST_ARCHIVE_FORMAT, "Segments": self.m_arrSegments, "Configs": self.m_arrConfigs}, objFile, indent=1)
+        os.replace(sFileName + ".tmp", sFileName)
+
+    def StartSegment(self, nWidth):
+        """Continue the archive in a new amplitude file with nWidth data points per sweep, the sweeps already archived 
+        keep theirs. The current segment is widened instead if it has no sweeps yet
+        """
+        nSegment = len(self.m_arrSegments) - 1
+        if (self.m_nCount > self.m_arrSegments[nSegment][0]):
+            #previous sweeps must be in the files before the header refers to the new segment
+            self.Flush()
+            self.m_objAmplitudeFile.close()
+            self.m_objAmplitudeFile = None
+            nSegment += 1
+            self.m_arrSegments.append([self.m_nCount, nWidth])
+            self.m_arrAmplitudeMaps.append(None)
+            self.m_objAmplitudeFile = open(self.GetAmplitudeFileName(nSegment), "wb")
+        self.m_arrSegments[nSegment][1] = nWidth
+        self.m_nWidth = nWidth
+        self.m_arrRow = None
+        self.SaveHeader()
+
+    def GetConfigID(self, objSweep):
+        """Index of the configuration of a sweep, added to the header if it is a new one
+        """
+        tConfig = (objSweep.StartFrequencyMHZ, objSweep.StepFrequencyMHZ, objSweep.TotalDataPoints)
+        nConfigID = self.m_dictConfigIDs.get(tConfig)
+        if (nConfigID is None):
+            nConfigID = len(self.m_arrConfigs)
+            self.m_arrConfigs.append(tConfig)
+            self.m_dictConfigIDs[tConfig] = nConfigID
+            self.SaveHeader()
+        return nConfigID
+
+    def GetConfiguration(self, nConfigID):
+        """Configuration of the sweeps with a ConfigID in the index
+
+        Returns:
+            Tuple (start MHz, step MHz, data points)
+        """
+        return self.m_arrConfigs[nConfigID]
+
+    def Append(self, objSweep):
+        """Add a sweep at the end of the archive
+
+        Parameters:
+            objSweep -- RFESweepData to add, a new segment is started if it has more than Width data points
+        Returns:
+		    Boolean True if the sweep was added, otherwise False
+        """
+        with self.m_hLock:
+            if (not self.IsOpen):
+                return False
+            try:
+                nTotalDataPoints = objSweep.TotalDataPoints
+                if (nTotalDataPoints > self.m_nWidth):
+                    self.StartSegment(nTotalDataPoints)
+                if (self.m_arrRow is None):
+                    self.m_arrRow = np.full(self.m_nWidth, RFE_Common.CONST_MIN_AMPLITUDE_DBM, dtype="<f4")
+                self.m_arrRow[:nTotalDataPoints] = objSweep.m_arrAmplitude
+                if (nTotalDataPoints < self.m_nWidth):
+                    self.m_arrRow[nTotalDataPoints:] = RFE_Common.CONST_MIN_AMPLITUDE_DBM
+                objRecord = self.m_arrIndexRecord[0]
+                if (objSweep.m_Time is not None):
+                    objRecord["TimeNS"] = int(objSweep.m_Time.timestamp() * 1e9)
+                else:
+                    objRecord["TimeNS"] = MonotonicToTimeNS(objSweep.FirstByteNS)
+                objRecord["FirstByteNS"] = objSweep.FirstByteNS
+                objRecord["LastByteNS"] = objSweep.LastByteNS
+                objRecord["ConfigID"] = self.GetConfigID(objSweep)
+                self.m_objAmplitudeFile.write(self.m_arrRow.tobytes())
+                self.m_objIndexFile.write(self.m_arrIndexRecord.tobytes())
+                self.m_nCount += 1
+            except Exception as obEx:
+                g_objSweepLog.error("Error in RFESweepArchive - Append(): %s", obEx)
+                return False
+        return True
+
+    def Flush(self, bSync=False):
+        """Write buffered sweeps to the files
+
+        Parameters:
+            bSync -- True to wait until the operating system writes them to disk
+        """
+        with self.m_hLock:
+            for objFile in (self.m_objAmplitudeFile, self.m_objIndexFile):
+                if (objFile):
+                    objFile.flush()
+                    if (bSync):
+                        os.fsync(objFile.fileno())
+
+    def UpdateMaps(self, nRows):
+        """Map the files again if less than nRows sweeps are mapped, that is only when sweeps appended after the last
+        map are requested. Arrays returned before keep using the previous maps
+        """
+        if (nRows <= self.m_nMappedRows):
+            return
+        self.Flush()
+        nMappedRows = self.m_nCount
+        for nSegment, (nFirst, nWidth) in enumerate(self.m_arrSegments):
+            #only the last segment grows, the others are mapped once
+            nSegmentRows = self.GetSegmentEnd(nSegment) - nFirst
+            arrMap = self.m_arrAmplitudeMaps[nSegment]
+            if ((nSegmentRows > 0) and ((arrMap is None) or (arrMap.shape[0] != nSegmentRows))):
+                self.m_arrAmplitudeMaps[nSegment] = np.memmap(self.GetAmplitudeFileName(nSegment), dtype="<f4", mode="r", shape=(nSegmentRows, nWidth))
+        self.m_arrIndexMap = np.memmap(self.GetFileName(RFE_Common.CONST_ARCHIVE_INDEX_FILE), dtype=g_objIndexType, mode="r", shape=(nMappedRows,))
+        self.m_nMappedRows = nMappedRows
+
+    def GetAmplitudeArray(self, nStart=0, nEnd=None):
+        """Amplitudes of consecutive sweeps as a read only NumPy float32 array of sweeps x data points of their segment, 
+        a slice of the memory mapped file without any copy. Sweeps from several segments are copied to an array as 
+        wide as the widest of them. Data points beyond the sweep configuration are CONST_MIN_AMPLITUDE_DBM
+
+        Parameters:
+            nStart -- Index of the first sweep
+            nEnd   -- Index of the last sweep, None for the last sweep in the archive
+        Returns:
+            NumPy array with a row per sweep, None if the indexes are not valid
+        """
+        with self.m_hLock:
+            if (nEnd is None):
+                nEnd = self.m_nCount - 1
+            if ((nStart < 0) or (nEnd >= self.m_nCount) or (nStart > nEnd)):
+                return None
+            self.UpdateMaps(nEnd + 1)
+            nSegment, nFirst, nSegmentEnd = self.GetSegment(nStart)
+            if (nEnd < nSegmentEnd):
+                return self.m_arrAmplitudeMaps[nSegment][(nStart - nFirst):(nEnd + 1 - nFirst)]
+            nLastSegment = self.GetSegment(nEnd)[0]
+            nWidth = max(nSegmentWidth for _, nSegmentWidth in self.m_arrSegments[nSegment:(nLastSegment + 1)])
+            arrAmplitude = np.full((nEnd + 1 - nStart, nWidth), RFE_Common.CONST_MIN_AMPLITUDE_DBM, dtype="<f4")
+            nRow = nStart
+            while (nRow <= nEnd):
+                nSegment, nFirst, nSegmentEnd = self.GetSegment(nRow)
+                nRows = min(nEnd + 1, nSegmentEnd) - nRow
+                arrMap = self.m_arrAmplitudeMaps[nSegment]
+                arrAmplitude[(nRow - nStart):(nRow - nStart + nRows), :arrMap.shape[1]] = arrMap[(nRow - nFirst):(nRow - nFirst + nRows)]
+                nRow += nRows
+            return arrAmplitude
+
+    def GetIndex(self, nStart=0, nEnd=None):
+        """Index records of consecutive sweeps, a slice of the memory mapped file without any copy, with fields TimeNS 
+        (wall clock time, as time.time_ns()), FirstByteNS, LastByteNS and ConfigID, see GetConfiguration
+
+        Parameters:
+            nStart -- Index of the first sweep
+            nEnd   -- Index of the last sweep, None for the last sweep in the archive
+        Returns:
+            NumPy structured array with a record per sweep, None if the indexes are not valid
+        """
+        with self.m_hLock:
+            if (nEnd is None):
+                nEnd = self.m_nCount - 1
+            if ((nStart < 0) or (nEnd >= self.m_nCount) or (nStart > nEnd)):
+                return None
+            self.UpdateMaps(nEnd + 1)
+            return self.m_arrIndexMap[nStart:(nEnd + 1)]
+
+    def GetData(self, nIndex):
+        """Sweep of the archive, its data container is a view of the memory mapped file so it is read only
+
+        Parameters:
+            nIndex -- Index of the sweep, 0 for the oldest
+        Returns:
+            RFESweepData None if no sweep is available with this index
+        """
+        with self.m_hLock:
+            arrIndex = self.GetIndex(nIndex, nIndex)
+            if (arrIndex is None):
+                return None
+            objRecord = arrIndex[0]
+            fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints = self.m_arrConfigs[int(objRecord["ConfigID"])]
+            nSegment, nFirst, _ = self.GetSegment(nIndex)
+            arrAmplitude = self.m_arrAmplitudeMaps[nSegment][nIndex - nFirst, :nTotalDataPoints]
+        objSweep = RFESweepData(fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints, arrAmplitude)
+        objSweep.SetArrivalTime(int(objRecord["FirstByteNS"]), int(objRecord["LastByteNS"]))
+        objSweep.CaptureTime = TimeNSToDateTime(int(objRecord["TimeNS"]))
+        return objSweep
+
+    def FindTime(self, dtTime):
+        """Index of the first sweep captured at or after a time, sweeps are expected to be appended in time order
+
+        Parameters:
+            dtTime -- datetime to find
+        Returns:
+            Integer Index of the sweep, Count if all sweeps were captured before dtTime
+        """
+        arrIndex = self.GetIndex()
+        if (arrIndex is None):
+            return 0
+        return int(np.searchsorted(arrIndex["TimeNS"], int(dtTime.timestamp() * 1e9), side="left"))
@@ -23,20 +23,99 @@
 #=============================================================================
 
 import math
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None   #NumPy is optional, sweeps are decoded in pure Python without it
 
 from RFExplorer import RFE_Common 
 from RFExplorer import RFExplorer 
+from RFExplorer.RFELogging import TRACE, g_objSweepLog
+
+g_dictAmplitudeLUT = {}     #cached 256 entries lookup tables to convert received bytes into dBm, indexed by offset in dB
+g_nClockOffsetNS = 0        #time.time_ns() - time.monotonic_ns(), see MonotonicToDateTime
+g_nClockSyncNS = None       #time.monotonic_ns() when g_nClockOffsetNS was measured
+
+def MonotonicToTimeNS(nMonotonicNS):
+    """Convert a time.monotonic_ns() value into wall clock time, as time.time_ns(). The offset between both clocks is
+    measured again every CONST_CLOCK_SYNC_SEC, so wall clock adjustments are followed while close timestamps keep their
+    exact interval
+
+    Parameters:
+        nMonotonicNS -- Value returned by time.monotonic_ns()
+    Returns:
+        Integer Nanoseconds since the epoch matching nMonotonicNS
+    """
+    global g_nClockOffsetNS, g_nClockSyncNS     #pylint: disable=global-statement
+    nNowNS = time.monotonic_ns()
+    if ((g_nClockSyncNS is None) or ((nNowNS - g_nClockSyncNS) > RFE_Common.CONST_CLOCK_SYNC_SEC * 1e9)):
+        g_nClockOffsetNS = time.time_ns() - time.monotonic_ns()
+        g_nClockSyncNS = nNowNS
+    return nMonotonicNS + g_nClockOffsetNS
+
+def TimeNSToDateTime(nTimeNS):
+    """Convert a time.time_ns() value into local time
+
+    Parameters:
+        nTimeNS -- Nanoseconds since the epoch
+    Returns:
+        datetime Local time matching nTimeNS, with microsecond resolution
+    """
+    nSeconds, nNanoseconds = divmod(nTimeNS, 1000000000)
+    return datetime.fromtimestamp(nSeconds) + timedelta(microseconds=nNanoseconds // 1000)
+
+def MonotonicToDateTime(nMonotonicNS):
+    """Convert a time.monotonic_ns() value into local wall clock time, see MonotonicToTimeNS
+
+    Parameters:
+        nMonotonicNS -- Value returned by time.monotonic_ns()
+    Returns:
+        datetime Local time matching nMonotonicNS, with microsecond resolution
+    """
+    return TimeNSToDateTime(MonotonicToTimeNS(nMonotonicNS))
+
+def GetAmplitudeLUT(fOffsetDB):
+    """Returns the lookup table used to decode received sweep bytes into dBm with NumPy
+
+    Parameters:
+        fOffsetDB -- Offset in dB to be included in all table values
+    Returns:
+        NumPy float32 array of 256 values, the dBm value for every possible received byte
+    """
+    arrLUT = g_dictAmplitudeLUT.get(fOffsetDB)
+    if (arrLUT is None):
+        if (len(g_dictAmplitudeLUT) > 64):
+            g_dictAmplitudeLUT.clear()  #offset changes are rare, this only protects against an ever growing cache
+        arrLUT = (np.arange(256, dtype=np.float64) / -2.0 + fOffsetDB).astype(np.float32)
+        g_dictAmplitudeLUT[fOffsetDB] = arrLUT
+    return arrLUT
 
 class RFESweepData:
     """Class support a full sweep of data from RF Explorer, and it is used in the RFESweepDataCollection container
 	"""
-    def __init__(self, fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints):
-        self.m_Time = datetime.now()
+    def __init__(self, fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints, arrAmplitude=None):
+        """Create a sweep with all data points at CONST_MIN_AMPLITUDE_DBM
+
+        Parameters:
+            fStartFreqMHZ    -- Frequency of the first data point in MHz
+            fStepFreqMHZ     -- Frequency step between data points in MHz
+            nTotalDataPoints -- Number of data points
+            arrAmplitude     -- Optional list or NumPy array of nTotalDataPoints dBm values used as data container without
+                                any copy, so changes in the sweep are changes in arrAmplitude and the other way around
+		"""
+        self.m_nFirstByteNS = time.monotonic_ns()
+        self.m_nLastByteNS = self.m_nFirstByteNS
+        self.m_Time = None      #calculated from m_nFirstByteNS when requested, see CaptureTime
+        self.m_nQueuedNS = 0    #time.monotonic_ns() the sweep was added to the receive queue, 0 if not measured
         self.m_nTotalDataPoints = nTotalDataPoints
         self.m_fStartFrequencyMHZ = fStartFreqMHZ
         self.m_fStepFrequencyMHZ = fStepFreqMHZ
-        self.m_arrAmplitude = [RFE_Common.CONST_MIN_AMPLITUDE_DBM] * self.m_nTotalDataPoints     # The actual data container, a consecutive set of dBm amplitude values
+        if (arrAmplitude is None):
+            arrAmplitude = [RFE_Common.CONST_MIN_AMPLITUDE_DBM] * self.m_nTotalDataPoints
+        self.m_arrAmplitude = arrAmplitude     # The actual data container, a consecutive set of dBm amplitude values
         self.m_arrBLOB = []
         self.m_sBLOBString = ""   #variable used to internall store byte array in string format received if is used externally
         
@@ -73,15 +152,68 @@ class RFESweepData:
 		"""
         return self.m_nTotalDataPoints
 
+    @property
+    def AmplitudeArray(self):
+        """Amplitude values in dBm of all data points as a NumPy float32 array. When the sweep was decoded with NumPy
+        this is the internal data container itself, returned without any copy. None if NumPy is not available
+		"""
+        if (np is None):
+            return None
+        if (not isinstance(self.m_arrAmplitude, np.ndarray)):
+            self.m_arrAmplitude = np.asarray(self.m_arrAmplitude, dtype=np.float32)
+        return self.m_arrAmplitude
+
+    @classmethod
+    def IsNumPyAvailable(cls):
+        """True if NumPy is installed and sweeps can be decoded and processed with vectorized operations
+
+        Returns:
+            Boolean True if NumPy can be used, False otherwise
+		"""
+        return (np is not None)
+
     @property
     def CaptureTime(self):
         """The time when this data sweep was created, it should match as much as
-        possible the real data capture
+        possible the real data capture. For sweeps received from a device it is the 
+        wall clock time of FirstByteNS
 		"""
+        if (self.m_Time is None):
+            self.m_Time = MonotonicToDateTime(self.m_nFirstByteNS)
         return self.m_Time
     @CaptureTime.setter 
     def CaptureTime(self, value):       
         self.m_Time = value
+
+    @property
+    def FirstByteNS(self):
+        """time.monotonic_ns() when the first byte of this sweep was read from the port, or when the object was 
+        created if it was not received from a device
+		"""
+        return self.m_nFirstByteNS
+
+    @property
+    def LastByteNS(self):
+        """time.monotonic_ns() when the last byte of this sweep was read from the port
+		"""
+        return self.m_nLastByteNS
+
+    @property
+    def TransferTimeSec(self):
+        """Seconds between the first and the last byte of this sweep read from the port
+		"""
+        return (self.m_nLastByteNS - self.m_nFirstByteNS) / 1e9
+
+    def SetArrivalTime(self, nFirstByteNS, nLastByteNS):
+        """Stamp the sweep with the time its bytes were read from the port, CaptureTime is derived from it
+
+        Parameters:
+            nFirstByteNS -- time.monotonic_ns() when the first byte was read
+            nLastByteNS  -- time.monotonic_ns() when the last byte was read
+		"""
+        self.m_nFirstByteNS = nFirstByteNS
+        self.m_nLastByteNS = nLastByteNS
+        self.m_Time = None
     
     def ProcessReceivedString(self, sLine, fOffsetDB, bBLOB=False, bString=False):
         """This function will process a received, full consistent string received from remote device
@@ -106,7 +238,8 @@ class RFESweepData:
                 #print("sLine length: " + str(len(sLine)) +" - "+ "TotalDataPoints: " + str(self.m_nTotalDataPoints))
                 if (bString):
                     self.m_sBLOBString = sLine[2:(self.m_nTotalDataPoints + 2)]
-                    print("sLine: " + sLine[2:(self.m_nTotalDataPoints + 2)])
+                    if (g_objSweepLog.isEnabledFor(TRACE)):
+                        g_objSweepLog.log(TRACE, "sLine: %s", self.m_sBLOBString)
 
                 for nInd in range(self.m_nTotalDataPoints):
                     #print("sLine byte[" + str(nInd) + "]:"+ str(sLine[2 + nInd].encode('utf-8')))
@@ -118,11 +251,47 @@ class RFESweepData:
             else:
                 bOk = False
         except Exception as obEx:
-            print("Error in RFESweepData - ProcessReceivedString(): " + str(obEx))
+            g_objSweepLog.error("Error in RFESweepData - ProcessReceivedString(): %s", obEx)
             bOk = False
 
         return bOk
-    
+
+    def ProcessReceivedBytes(self, objData, fOffsetDB, bBLOB=False, bString=False, bNumPy=True):
+        """This function will process the raw amplitude bytes of a full, consistent sweep received from remote device
+        and fill it in all data. This is the byte oriented version of ProcessReceivedString, used by the receive thread
+        to decode sweeps straight from the received buffer
+
+        Parameters:
+            objData   -- Bytes-like object (bytes, bytearray or memoryview) with one byte per data point, without the $S header
+            fOffsetDB -- Currently specified offset in DB
+            bBLOB     -- If true the internal BLOB object will be filled in for later use in GetBLOB
+            bString   -- If true the internal string object will be filled in for later use in GetBLOBString
+            bNumPy    -- If true and NumPy is available, all data points are decoded in a single vectorized operation 
+                         into a float32 array, available with AmplitudeArray
+        Returns:
+            Boolean True if parsing was ok, False otherwise
+        """
+        bOk = True
+
+        try:
+            if (len(objData) == self.m_nTotalDataPoints):
+                if (bBLOB):
+                    self.m_arrBLOB = list(objData)
+                if (bString):
+                    self.m_sBLOBString = bytes(objData).decode("latin_1")
+                if (bNumPy and (np is not None)):
+                    #the lookup table already includes the offset, so decoding is a single gather operation
+                    self.m_arrAmplitude = GetAmplitudeLUT(fOffsetDB)[np.frombuffer(objData, dtype=np.uint8)]
+                else:
+                    self.m_arrAmplitude = [nVal / -2.0 + fOffsetDB for nVal in objData]
+            else:
+                bOk = False
+        except Exception as obEx:
+            g_objSweepLog.error("Error in RFESweepData - ProcessReceivedBytes(): %s", obEx)
+            bOk = False
+
+        return bOk
+
     def GetAmplitude_DBM(self, nDataPoint):
         """Returns amplitude data in dBm.  This is the value as it was read from
         the device or from a file so it is not adjusted by offset or additionally compensated in any way.
@@ -150,9 +319,9 @@ class RFESweepData:
 		"""
         if (nDataPoint < self.m_nTotalDataPoints):
             if ((AmplitudeCorrection) and bUseCorrection):
-                return self.m_arrAmplitude[nDataPoint] + AmplitudeCorrection.GetAmplitudeCalibration(int(self.GetFrequencyMHZ(nDataPoint))) 
+                return float(self.m_arrAmplitude[nDataPoint]) + AmplitudeCorrection.GetAmplitudeCalibration(int(self.GetFrequencyMHZ(nDataPoint))) 
             else:
-                return self.m_arrAmplitude[nDataPoint]
+                return float(self.m_arrAmplitude[nDataPoint])
         else:
             return RFE_Common.CONST_MIN_AMPLITUDE_DBM
 
@@ -195,6 +364,11 @@ class RFESweepData:
 		"""
         nMinDataPoint = 0
         fMin = RFE_Common.CONST_MAX_AMPLITUDE_DBM
+        if ((np is not None) and isinstance(self.m_arrAmplitude, np.ndarray)):
+            nMinDataPoint = int(np.argmin(self.m_arrAmplitude))
+            if (self.m_arrAmplitude[nMinDataPoint] >= fMin):
+                nMinDataPoint = 0
+            return nMinDataPoint
         for nInd in range(self.m_nTotalDataPoints):
             if (fMin > self.m_arrAmplitude[nInd]):
                 fMin = self.m_arrAmplitude[nInd]
@@ -209,6 +383,11 @@ class RFESweepData:
 		"""
         nPeakDataPoint = 0
         fPeak = RFE_Common.CONST_MIN_AMPLITUDE_DBM
+        if ((np is not None) and isinstance(self.m_arrAmplitude, np.ndarray)):
+            nPeakDataPoint = int(np.argmax(self.m_arrAmplitude))
+            if (self.m_arrAmplitude[nPeakDataPoint] <= fPeak):
+                nPeakDataPoint = 0
+            return nPeakDataPoint
 
         for nInd in range(self.m_nTotalDataPoints):
             if (fPeak < self.m_arrAmplitude[nInd]):
@@ -235,6 +414,9 @@ class RFESweepData:
         objSweep = RFESweepData(self.StartFrequencyMHZ, self.StepFrequencyMHZ, self.m_nTotalDataPoints)
 
         objSweep.m_arrAmplitude = self.m_arrAmplitude.copy()
+        objSweep.m_nFirstByteNS = self.m_nFirstByteNS
+        objSweep.m_nLastByteNS = self.m_nLastByteNS
+        objSweep.m_Time = self.m_Time
 
         return objSweep
 
@@ -248,8 +430,11 @@ class RFESweepData:
         fChannelPower = RFE_Common.CONST_MIN_AMPLITUDE_DBM
         fPowerTemp = 0.0
 
-        for nInd in range(self.m_nTotalDataPoints):
-            fPowerTemp += RFExplorer.Convert_dBm_2_mW(self.m_arrAmplitude[nInd])
+        if ((np is not None) and isinstance(self.m_arrAmplitude, np.ndarray)):
+            fPowerTemp = float(np.sum(np.power(10.0, self.m_arrAmplitude / np.float64(10.0))))
+        else:
+            for nInd in range(self.m_nTotalDataPoints):
+                fPowerTemp += RFExplorer.Convert_dBm_2_mW(self.m_arrAmplitude[nInd])
 
         if (fPowerTemp > 0.0):
             #add here actual RBW calculation in the future - currently we are
@@ -275,8 +460,7 @@ class RFESweepData:
                     sResult += "\n"
                 sResult += str('{:04.1f}'.format(self.GetAmplitudeDBM(nDataPoint, None, False)))
         except Exception as obEx:
-            if self.m_nVerboseLevel>0: 
-                print("m_arrReceivedStrings processing: " + str(obEx))
+            g_objSweepLog.warning("Dump: %s", obEx)
 
         return sResult
 
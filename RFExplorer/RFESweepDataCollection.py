@@ -22,26 +22,66 @@
 #Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
 #=============================================================================
 
+import math
+import operator
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None   #NumPy is optional, the collection keeps the RFESweepData objects added without it
+
 from RFExplorer import RFE_Common 
 from RFExplorer.RFESweepData import RFESweepData
+from RFExplorer.RFETraceEngine import RFETraceEngine
+from RFExplorer.RFELogging import g_objSweepLog
 
 class RFESweepDataCollection:    
-    """ Allocates up to nCollectionSize elements to start with the container.
+    """Container of sweeps in arrival order, used as a ring buffer. With NumPy the amplitudes of all sweeps are kept in 
+    a single preallocated float32 array of sweeps x data points, plus arrays with the arrival time and configuration of
+    every sweep, so Add only copies one row and GetData returns a view of it. Without NumPy the ring holds the 
+    RFESweepData objects added. An autogrow collection keeps every sweep until it holds MaxSweeps and then it is full, 
+    otherwise the oldest sweep is replaced by every new one once it holds MaxSweeps
 	"""
-    def __init__(self, nCollectionSize, bAutogrow):
-        self.m_arrData = []            #Collection of available spectrum data items
-        self.m_MaxHoldData = None    #Single data set, defined for the whole collection and updated with Add, to
-                                     #keep the Max Hold values
-        self.m_nUpperBound = -1              #Max value for index with available data
-        self.m_nInitialCollectionSize = 0
-                         
-        if (nCollectionSize > RFE_Common.CONST_MAX_ELEMENTS):
-            nCollectionSize = RFE_Common.CONST_MAX_ELEMENTS
+    def __init__(self, nCollectionSize, bAutogrow, nMaxBytes=0):
+        """Create an empty collection, memory is allocated when the first sweep is added
 
-        self.m_bAutogrow = bAutogrow        #true if the array bounds may grow up to _MAX_ELEMENTS, otherwise will
-                                            #be limited to initial collection size
-
-        self.m_nInitialCollectionSize = nCollectionSize
+        Parameters:
+            nCollectionSize -- If bAutogrow, number of sweeps allocated to start with, otherwise max number of sweeps
+            bAutogrow       -- True to grow up to CONST_MAX_ELEMENTS sweeps and then be full, see Capacity
+            nMaxBytes       -- Max bytes used by the collection, 0 for no limit other than the number of sweeps
+		"""
+        self.m_objTraces = RFETraceEngine()     #max hold, min hold and average traces of the collection, updated with Add
+        self.m_bAutogrow = bAutogrow        #true if the array bounds may grow up to Capacity, otherwise the oldest
+                                            #sweep is replaced once Capacity is reached
+        self.m_nInitialCollectionSize = max(1, nCollectionSize)
+        self.m_nCapacity = RFE_Common.CONST_MAX_ELEMENTS if bAutogrow else self.m_nInitialCollectionSize
+        self.m_nMaxBytes = nMaxBytes
+        self.m_bNumPy = (np is not None)
+        self.m_arrAmplitude = None      #NumPy float32 array of m_nRows x m_nWidth dBm values, a row per sweep
+        self.m_arrFirstByteNS = None    #NumPy int64 array with FirstByteNS of every row
+        self.m_arrLastByteNS = None     #NumPy int64 array with LastByteNS of every row
+        self.m_arrConfigID = None       #NumPy int32 array with the index in m_arrConfigs of every row
+        self.m_arrSweeps = []           #RFESweepData objects of every row, if NumPy is not available
+        self.m_bCumulativeSums = False
+        self.m_arrSumDB = None          #NumPy float64 array of m_nRows x m_nWidth, dBm sum of all sweeps up to every row
+        self.m_arrSumMW = None          #NumPy float64 array of m_nRows x m_nWidth, mW sum of all sweeps up to every row
+        self.m_arrBaseDB = None         #dBm sum of all sweeps before the oldest one in the collection
+        self.m_arrBaseMW = None         #mW sum of all sweeps before the oldest one in the collection
+        self.m_arrRunDB = None          #dBm sum of all sweeps up to the newest one
+        self.m_arrRunMW = None          #mW sum of all sweeps up to the newest one
+        self.m_nSumsAdded = 0           #sweeps added since the sums were calculated from scratch
+        self.m_arrConfigs = []          #(start MHz, step MHz, data points) of the sweeps added
+        self.m_dictConfigIDs = {}       #index in m_arrConfigs of every configuration
+        self.m_nRows = 0                #rows allocated
+        self.m_nWidth = 0               #data points of every row
+        self.m_nHead = 0                #row of the oldest sweep
+        self.m_nCount = 0               #sweeps in RAM
+        self.m_objArchive = None        #RFESweepArchive where sweeps are also written, see Archive
+        self.m_nArchiveFirst = 0        #index in the archive of the sweep with index 0 in the collection
+        self.m_nPagedOut = 0            #sweeps in the collection which are only in the archive, the oldest ones
+        self.m_bArchiveRemoved = False  #the capture was larger than RAM, so the oldest sweeps are discarded instead of being full
+        self.m_hLock = threading.RLock()    #Add and Archive may be used by different threads
 
         self.CleanAll()
     
@@ -49,19 +89,125 @@ class RFESweepDataCollection:
     def MaxHoldData(self):
         """Single data set, defined for the whole collection and updated with Add, to keep the Max Hold values 
 		"""
-        return self.m_MaxHoldData
+        return self.m_objTraces.MaxHold
+
+    @property
+    def Traces(self):
+        """RFETraceEngine with max hold, min hold, average and exponential moving average of the sweeps added since 
+        the collection was cleaned
+		"""
+        return self.m_objTraces
 
     @property
     def Count(self):
         """ Returns the total of elements with actual data allocated.
 		"""
-        return int(self.m_nUpperBound + 1)
+        return self.m_nPagedOut + self.m_nCount
 
     @property
     def UpperBound(self):
         """ Returns the highest valid index of elements with actual data allocated.
 		"""
-        return self.m_nUpperBound 
+        return self.m_nPagedOut + self.m_nCount - 1
+
+    @property
+    def Archive(self):
+        """Get/Set RFESweepArchive where every sweep added is also written, None for none. With an archive the 
+        collection is never full: once it holds MaxSweeps in RAM, the oldest sweep leaves RAM and it is read from the
+        archive instead, so indexes keep covering every sweep added since the collection was cleaned. Sweeps in the
+        collection when the archive is set are written to it, sweeps only in the archive leave the collection when it 
+        is removed, or when writing to it fails. From then on, and until the collection is cleaned, the oldest sweeps 
+        are discarded so the capture goes on with the last MaxSweeps
+		"""
+        return self.m_objArchive
+    @Archive.setter
+    def Archive(self, value):
+        with self.m_hLock:
+            if (self.m_objArchive):
+                self.m_bArchiveRemoved = True
+            self.m_objArchive = None
+            self.m_nPagedOut = 0
+            if (value is None):
+                return
+            nArchiveFirst = value.Count
+            for nInd in range(self.m_nCount):
+                if (not value.Append(self.GetRAMData(nInd))):
+                    g_objSweepLog.error("Error in RFESweepDataCollection - Archive: sweeps can not be written to %s", value.Folder)
+                    return
+            self.m_objArchive = value
+            self.m_nArchiveFirst = nArchiveFirst
+
+    @property
+    def PagedOut(self):
+        """Number of the oldest sweeps in the collection which are only in the Archive, not in RAM
+		"""
+        return self.m_nPagedOut
+
+    @property
+    def Capacity(self):
+        """Get/Set max number of sweeps in RAM, the oldest sweeps are discarded, or paged out to the Archive, if it is 
+        reduced below the number of sweeps in RAM
+		"""
+        return self.m_nCapacity
+    @Capacity.setter
+    def Capacity(self, value):
+        self.m_nCapacity = max(1, value)
+        self.ApplyLimits()
+
+    @property
+    def MaxBytes(self):
+        """Get/Set max bytes used by the collection, 0 for no limit. The number of sweeps it allows depends on the data
+        points of the sweeps added, see MaxSweeps
+		"""
+        return self.m_nMaxBytes
+    @MaxBytes.setter
+    def MaxBytes(self, value):
+        self.m_nMaxBytes = value
+        self.ApplyLimits()
+
+    @property
+    def MaxSweeps(self):
+        """Max number of sweeps in the collection, the lowest of Capacity and the sweeps fitting in MaxBytes
+		"""
+        nMaxSweeps = self.m_nCapacity
+        if ((self.m_nMaxBytes > 0) and (self.m_nWidth > 0)):
+            nMaxSweeps = min(nMaxSweeps, max(1, self.m_nMaxBytes // self.RowBytes))
+        return nMaxSweeps
+
+    @property
+    def RowBytes(self):
+        """Bytes used by every sweep in the collection: float32 amplitudes, arrival times, configuration and float64 
+        cumulative sums if CumulativeSums is enabled
+		"""
+        nRowBytes = self.m_nWidth * 4 + 20
+        if (self.CumulativeSums):
+            nRowBytes += self.m_nWidth * 16
+        return nRowBytes
+
+    @property
+    def CumulativeSums(self):
+        """Get/Set True to keep the cumulative sum of all sweeps, in dBm and in mW, up to every sweep in the collection.
+        GetAverage, GetPowerAverage and their GetLast* versions then take the same time whatever the number of sweeps 
+        averaged, at the cost of 16 more bytes per data point of every sweep. It requires NumPy
+		"""
+        return self.m_bCumulativeSums
+    @CumulativeSums.setter
+    def CumulativeSums(self, value):
+        value = bool(value and self.m_bNumPy)
+        if (value == self.m_bCumulativeSums):
+            return
+        self.m_bCumulativeSums = value
+        if (not value):
+            self.m_arrSumDB = self.m_arrSumMW = None
+            self.m_arrBaseDB = self.m_arrBaseMW = self.m_arrRunDB = self.m_arrRunMW = None
+        elif (self.m_nRows > 0):
+            self.Reallocate(min(self.m_nRows, self.MaxSweeps))  #allocate and calculate the sums of the current sweeps
+
+    @property
+    def NumPyBackend(self):
+        """True if sweeps are kept in NumPy arrays, False if the RFESweepData objects added are kept
+		"""
+        return self.m_bNumPy
 
     @classmethod
     def FileHeaderVersioned_001(cls):
@@ -82,25 +228,122 @@ class RFESweepDataCollection:
         return "RFExplorer PC Client - Format v" + "{:03d}".format(RFE_Common.CONST_FILE_VERSION)
 
     def GetData(self, nIndex):
-        """ Return the data pointed by the zero-starting index
+        """ Return the data pointed by the zero-starting index. With NumPy the sweep returned uses a view of the 
+        collection array as data container, without any copy, so it changes if the collection replaces that sweep with
+        a new one or it is cleaned; use RFESweepData.Duplicate to keep it
         
         Parameters:
-            nIndex -- Index to find specific data inside the data array
+            nIndex -- Index to find specific data inside the data array, 0 for the oldest sweep
         Returns:
 		    RFESweepData None if no data is available with this index
 		"""
-        if (nIndex <= self.m_nUpperBound):
-            return self.m_arrData[nIndex]
-        else:
+        if ((nIndex < 0) or (nIndex > self.UpperBound)):
             return None
+        if (nIndex < self.m_nPagedOut):
+            return self.m_objArchive.GetData(self.m_nArchiveFirst + nIndex)
+        return self.GetRAMData(nIndex - self.m_nPagedOut)
+
+    def GetRAMData(self, nIndex):
+        """Sweep in RAM, see GetData
+
+        Parameters:
+            nIndex -- Index of the sweep in RAM, 0 for the oldest one in RAM
+        Returns:
+		    RFESweepData
+		"""
+        nRow = self.GetRow(nIndex)
+        if (not self.m_bNumPy):
+            return self.m_arrSweeps[nRow]
+        fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints = self.m_arrConfigs[self.m_arrConfigID[nRow]]
+        objSweep = RFESweepData(fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints, self.m_arrAmplitude[nRow, :nTotalDataPoints])
+        objSweep.SetArrivalTime(int(self.m_arrFirstByteNS[nRow]), int(self.m_arrLastByteNS[nRow]))
+        return objSweep
+
+    def GetAmplitudeArray(self, nStart=0, nEnd=None):
+        """Amplitudes of consecutive sweeps as a NumPy float32 array of sweeps x data points, for vectorized 
+        calculations. It is a view of the collection array when those sweeps are contiguous in the ring buffer, a copy
+        otherwise, or a read only view of the archive file if any of them was paged out, a copy if they are in several
+        segments of the archive. All sweeps are expected to have the configuration of the last one
+
+        Parameters:
+            nStart -- Index of the first sweep
+            nEnd   -- Index of the last sweep, None for the last sweep in the collection
+        Returns:
+            NumPy array with a row per sweep, None if NumPy is not available or the indexes are not valid
+		"""
+        if (nEnd is None):
+            nEnd = self.UpperBound
+        if ((not self.m_bNumPy) or (nStart < 0) or (nEnd > self.UpperBound) or (nStart > nEnd)):
+            return None
+        arrSource, objRows, nTotalDataPoints, _ = self.GetWindow(nStart, nEnd)
+        return arrSource[objRows, :nTotalDataPoints]
+
+    def GetWindow(self, nStart, nEnd):
+        """Amplitudes of consecutive sweeps, in RAM or in the archive if any of them was paged out, it requires NumPy
+
+        Parameters:
+            nStart -- Index of the first sweep, it must be valid
+            nEnd   -- Index of the last sweep, it must be valid
+        Returns:
+            NumPy 2-D array with the amplitudes of the sweeps in some of its rows
+            Slice or NumPy array selecting the rows of the sweeps in order
+            Integer Data points of the last sweep
+            Boolean True if all sweeps have the same configuration
+		"""
+        nSweeps = nEnd - nStart + 1
+        if (nStart >= self.m_nPagedOut):
+            arrRows = self.GetRows(nStart - self.m_nPagedOut, nSweeps)
+            arrConfigIDs = self.m_arrConfigID[arrRows]
+            nTotalDataPoints = self.m_arrConfigs[arrConfigIDs[-1]][2]
+            arrSource = self.m_arrAmplitude
+            objRows = arrRows
+            if (arrRows[0] + nSweeps <= self.m_nRows):
+                objRows = slice(arrRows[0], arrRows[0] + nSweeps)   #contiguous rows, read without an index array
+        else:
+            nFirst = self.m_nArchiveFirst + nStart
+            arrConfigIDs = self.m_objArchive.GetIndex(nFirst, nFirst + nSweeps - 1)["ConfigID"]
+            nTotalDataPoints = self.m_objArchive.GetConfiguration(int(arrConfigIDs[-1]))[2]
+            arrSource = self.m_objArchive.GetAmplitudeArray(nFirst, nFirst + nSweeps - 1)
+            objRows = slice(None)
+        return arrSource, objRows, nTotalDataPoints, not np.any(arrConfigIDs != arrConfigIDs[-1])
+
+    def GetRow(self, nIndex):
+        """Row of the ring buffer holding a sweep
+
+        Parameters:
+            nIndex -- Index of the sweep, 0 for the oldest
+        Returns:
+            Integer Row in the collection arrays
+		"""
+        nRow = self.m_nHead + nIndex
+        if (nRow >= self.m_nRows):
+            nRow -= self.m_nRows
+        return nRow
+
+    def GetRows(self, nStart, nCount):
+        """NumPy array with the rows of nCount consecutive sweeps, see GetRow
+		"""
+        return (self.m_nHead + np.arange(nStart, nStart + nCount)) % self.m_nRows
+
+    def GetConfigID(self, SweepData):
+        """Index in m_arrConfigs of the configuration of a sweep, added if it is a new one
+		"""
+        tConfig = (SweepData.StartFrequencyMHZ, SweepData.StepFrequencyMHZ, SweepData.TotalDataPoints)
+        nConfigID = self.m_dictConfigIDs.get(tConfig)
+        if (nConfigID is None):
+            nConfigID = len(self.m_arrConfigs)
+            self.m_arrConfigs.append(tConfig)
+            self.m_dictConfigIDs[tConfig] = nConfigID
+        return nConfigID
 
     def IsFull(self):
-        """ True when the absolute maximum of allowed elements in the container is allocated
+        """ True when the absolute maximum of allowed elements in the container is allocated, only an autogrow 
+        collection can be full, and not while it has an Archive or after one was removed
                 
         Returns:
 		    Boolean True when the absolute maximum of allowed elements in the container is allocated, False otherwise
 		"""
-        return (self.m_nUpperBound >= RFE_Common.CONST_MAX_ELEMENTS)
+        return (self.m_bAutogrow and (self.m_objArchive is None) and (not self.m_bArchiveRemoved) and (self.m_nCount >= self.MaxSweeps))
 
     def Add(self, SweepData):
         """This function add a single sweep data in the collection 
@@ -110,42 +353,178 @@ class RFESweepDataCollection:
         Returns:
             Boolean True it sweep data is added, False otherwise
 		"""
+        with self.m_hLock:
+            return self.AddSweep(SweepData)
+
+    def AddSweep(self, SweepData):
+        """Add, must be called with the lock held
+		"""
         try:
             if (self.IsFull()):
                 return False
 
-            if (not self.m_MaxHoldData):
-                self.m_MaxHoldData = RFESweepData(SweepData.StartFrequencyMHZ, SweepData.StepFrequencyMHZ, SweepData.TotalDataPoints)
-            if (self.m_nUpperBound >= (len(self.m_arrData) - 1)):
+            if (self.m_objArchive and not self.m_objArchive.Append(SweepData)):
+                #capture must go on, with the sweeps in RAM only
+                g_objSweepLog.error("Error in RFESweepDataCollection - Add(): the archive in %s is not used anymore", self.m_objArchive.Folder)
+                self.Archive = None
+
+            nTotalDataPoints = SweepData.TotalDataPoints
+            if ((self.m_nRows == 0) or (nTotalDataPoints > self.m_nWidth)):
+                #first sweep or wider than the rows allocated, the number of sweeps allowed by MaxBytes depends on it
+                nOldRows = self.m_nRows
+                self.m_nWidth = max(self.m_nWidth, nTotalDataPoints)
+                nRows = self.MaxSweeps
                 if (self.m_bAutogrow):
-                    self.ResizeCollection(10 * 1000) #add 10K samples more
-                else:
-                    #move all items one position down, lose the older one at position 0
-                    self.m_nUpperBound = len(self.m_arrData) - 2
-                    self.m_arrData[0] = None
-                    for nInd in self.m_nUpperBound:
-                        self.m_arrData[nInd] = self.m_arrData[nInd + 1]
-
-            self.m_nUpperBound += 1
-            self.m_arrData[self.m_nUpperBound] = SweepData
-            
-            nInd = 0
-            while nInd < SweepData.TotalDataPoints:
-                if (SweepData.GetAmplitudeDBM(nInd, None, False) > self.m_MaxHoldData.GetAmplitudeDBM(nInd, None, False)):
-                    self.m_MaxHoldData.SetAmplitudeDBM(nInd, SweepData.GetAmplitudeDBM(nInd, None, False))
-                nInd += 1
+                    nRows = min(max(nOldRows, self.m_nInitialCollectionSize), nRows)
+                self.Reallocate(nRows)
+
+            nMaxSweeps = self.MaxSweeps
+            bReplaced = False
+            if (self.m_nCount < self.m_nRows):
+                nRow = self.GetRow(self.m_nCount)
+                self.m_nCount += 1
+            elif (self.m_nCount < nMaxSweeps):
+                self.ResizeCollection(min(self.m_nRows, nMaxSweeps - self.m_nRows))     #double it, amortized O(1)
+                nRow = self.GetRow(self.m_nCount)
+                self.m_nCount += 1
+            else:
+                #replace the oldest sweep
+                nRow = self.m_nHead
+                self.m_nHead = self.GetRow(1)
+                bReplaced = True
+                if (self.m_objArchive):
+                    self.m_nPagedOut += 1
+
+            if (self.m_bNumPy):
+                arrRow = self.m_arrAmplitude[nRow]
+                arrRow[:nTotalDataPoints] = SweepData.m_arrAmplitude
+                if (nTotalDataPoints < self.m_nWidth):
+                    arrRow[nTotalDataPoints:] = RFE_Common.CONST_MIN_AMPLITUDE_DBM
+                self.m_arrFirstByteNS[nRow] = SweepData.FirstByteNS
+                self.m_arrLastByteNS[nRow] = SweepData.LastByteNS
+                self.m_arrConfigID[nRow] = self.GetConfigID(SweepData)
+                self.m_objTraces.AddAmplitudes(arrRow[:nTotalDataPoints], SweepData.StartFrequencyMHZ, SweepData.StepFrequencyMHZ)
+                if (self.m_bCumulativeSums):
+                    self.AddSums(nRow, bReplaced)
+            else:
+                self.m_arrSweeps[nRow] = SweepData
+                self.m_objTraces.Add(SweepData)
         except Exception as obEx:
             print("Error in RFESweepDataCollection - Add(): " + str(obEx))
             return False
 
         return True
 
+    def Reallocate(self, nRows):
+        """Allocate the collection arrays with nRows rows of m_nWidth data points, keeping the newest sweeps which fit
+        in them, in order from row 0
+
+        Parameters:
+            nRows -- Number of rows to allocate
+		"""
+        nKept = min(self.m_nCount, nRows)
+        nFirst = self.m_nCount - nKept
+        if (self.m_bNumPy):
+            arrAmplitude = np.full((nRows, self.m_nWidth), RFE_Common.CONST_MIN_AMPLITUDE_DBM, dtype=np.float32)
+            arrFirstByteNS = np.zeros(nRows, dtype=np.int64)
+            arrLastByteNS = np.zeros(nRows, dtype=np.int64)
+            arrConfigID = np.zeros(nRows, dtype=np.int32)
+            if (nKept > 0):
+                arrRows = self.GetRows(nFirst, nKept)
+                nWidth = min(self.m_nWidth, self.m_arrAmplitude.shape[1])
+                arrAmplitude[:nKept, :nWidth] = self.m_arrAmplitude[arrRows, :nWidth]
+                arrFirstByteNS[:nKept] = self.m_arrFirstByteNS[arrRows]
+                arrLastByteNS[:nKept] = self.m_arrLastByteNS[arrRows]
+                arrConfigID[:nKept] = self.m_arrConfigID[arrRows]
+            self.m_arrAmplitude = arrAmplitude
+            self.m_arrFirstByteNS = arrFirstByteNS
+            self.m_arrLastByteNS = arrLastByteNS
+            self.m_arrConfigID = arrConfigID
+        else:
+            arrSweeps = [None] * nRows
+            for nInd in range(nKept):
+                arrSweeps[nInd] = self.m_arrSweeps[self.GetRow(nFirst + nInd)]
+            self.m_arrSweeps = arrSweeps
+        self.m_nRows = nRows
+        self.m_nHead = 0
+        if (self.m_objArchive):
+            self.m_nPagedOut += self.m_nCount - nKept
+        self.m_nCount = nKept
+        if (self.m_bCumulativeSums):
+            self.m_arrSumDB = np.empty((nRows, self.m_nWidth), dtype=np.float64)
+            self.m_arrSumMW = np.empty((nRows, self.m_nWidth), dtype=np.float64)
+            self.RebuildSums()
+
+    def AddSums(self, nRow, bReplaced):
+        """Update the cumulative sums with the sweep just stored in a row
+
+        Parameters:
+            nRow      -- Row of the new sweep
+            bReplaced -- True if the row held the oldest sweep, which is not in the collection anymore
+		"""
+        if (bReplaced):
+            #the sum up to the sweep replaced is now the sum before the oldest one
+            self.m_arrBaseDB[:] = self.m_arrSumDB[nRow]
+            self.m_arrBaseMW[:] = self.m_arrSumMW[nRow]
+        arrRow = self.m_arrAmplitude[nRow]
+        self.m_arrRunDB += arrRow
+        self.m_arrRunMW += np.power(10.0, arrRow * 0.1, dtype=np.float64)
+        self.m_arrSumDB[nRow] = self.m_arrRunDB
+        self.m_arrSumMW[nRow] = self.m_arrRunMW
+        self.m_nSumsAdded += 1
+        if (self.m_nSumsAdded > 2 * self.m_nRows):
+            #sums keep growing, calculate them again from the sweeps in the collection to limit the rounding error of 
+            #subtracting them; this is done once every 2 * m_nRows sweeps, so it is still O(data points) per sweep
+            self.RebuildSums()
+
+    def RebuildSums(self):
+        """Calculate the cumulative sums from scratch with the sweeps in the collection
+		"""
+        self.m_arrBaseDB = np.zeros(self.m_nWidth, dtype=np.float64)
+        self.m_arrBaseMW = np.zeros(self.m_nWidth, dtype=np.float64)
+        self.m_arrRunDB = np.zeros(self.m_nWidth, dtype=np.float64)
+        self.m_arrRunMW = np.zeros(self.m_nWidth, dtype=np.float64)
+        self.m_nSumsAdded = 0
+        if (self.m_nCount > 0):
+            arrRows = self.GetRows(0, self.m_nCount)
+            arrValues = self.m_arrAmplitude[arrRows].astype(np.float64)
+            self.m_arrSumDB[arrRows] = np.cumsum(arrValues, axis=0)
+            self.m_arrSumMW[arrRows] = np.cumsum(np.power(10.0, arrValues * 0.1), axis=0)
+            self.m_arrRunDB[:] = self.m_arrSumDB[arrRows[-1]]
+            self.m_arrRunMW[:] = self.m_arrSumMW[arrRows[-1]]
+
+    def ApplyLimits(self):
+        """Discard the oldest sweeps and release rows beyond MaxSweeps, after Capacity or MaxBytes changed
+		"""
+        with self.m_hLock:
+            if (self.m_nRows > self.MaxSweeps):
+                self.Reallocate(self.MaxSweeps)
+
     def CleanAll(self):
-        """Initialize internal data
+        """Initialize internal data. Allocated rows are kept to be used again, so cleaning has no cost
 		"""
-        self.m_arrData = [RFESweepData] * self.m_nInitialCollectionSize   
-        self.m_MaxHoldData = None
-        self.m_nUpperBound = -1
+        with self.m_hLock:
+            self.CleanSweeps()
+
+    def CleanSweeps(self):
+        """CleanAll, must be called with the lock held
+		"""
+        if (not self.m_bNumPy):
+            for nInd in range(self.m_nCount):
+                self.m_arrSweeps[self.GetRow(nInd)] = None      #release the sweeps
+        self.m_nPagedOut = 0
+        self.m_bArchiveRemoved = False
+        if (self.m_objArchive):
+            self.m_nArchiveFirst = self.m_objArchive.Count      #sweeps already archived are not in the collection anymore
+        self.m_objTraces.Reset()
+        if (self.m_arrRunDB is not None):
+            for arrSum in (self.m_arrBaseDB, self.m_arrBaseMW, self.m_arrRunDB, self.m_arrRunMW):
+                arrSum.fill(0.0)
+            self.m_nSumsAdded = 0
+        self.m_arrConfigs = []
+        self.m_dictConfigIDs = {}
+        self.m_nHead = 0
+        self.m_nCount = 0
 
     def Dump(self):
         """Dump a CSV string line with sweep data collection
@@ -155,7 +534,7 @@ class RFESweepDataCollection:
 		"""
         sDump = ""
         for nIndex in range(self.Count):
-            objSweep = self.m_arrData[nIndex]
+            objSweep = self.GetData(nIndex)
             if (sDump != ""):
                 sDump += '\n'
             if (objSweep):
@@ -168,84 +547,170 @@ class RFESweepDataCollection:
         """Return a SweepData object with median average data 
 
         Parameters:
-            nStart -- Start frequency for the median average calculation  
-            nEnd   -- End frequency for the median average calculation
+            nStart -- Index of the first sweep for the median average calculation  
+            nEnd   -- Index of the last sweep for the median average calculation
         Returns:
             RFESweepData object with median average data, None otherwise
 		"""
-        #string sDebugText = ""
-        if (nStart > self.m_nUpperBound or nEnd > self.m_nUpperBound or nStart > nEnd):
+        return self.GetPercentile(nStart, nEnd, 50.0)
+
+    def GetLastPercentile(self, nSweeps, fPercentile):
+        """Return a SweepData object with the percentile of the last nSweeps sweeps, or all of them if there are less.
+        For a percentile updated with every new sweep use RFESlidingPercentile, whose cost does not depend on nSweeps
+
+        Parameters:
+            nSweeps     -- Number of sweeps
+            fPercentile -- Percentile from 0.0 to 100.0, 50.0 for the median
+        Returns:
+            RFESweepData object with percentile data, None otherwise
+		"""
+        return self.GetPercentile(max(0, self.Count - nSweeps), self.UpperBound, fPercentile)
+
+    def GetPercentile(self, nStart, nEnd, fPercentile):
+        """Return a SweepData object with the percentile of every data point over consecutive sweeps, which must have 
+        the same configuration. The value of every data point is the one at position int(fPercentile * sweeps / 100)
+        of the sorted values, found with partition-based selection instead of sorting them, for a chunk of data points
+        of up to CONST_PERCENTILE_CHUNK_BYTES at a time
+
+        Parameters:
+            nStart      -- Index of the first sweep
+            nEnd        -- Index of the last sweep
+            fPercentile -- Percentile from 0.0 to 100.0, 50.0 for the median
+        Returns:
+            RFESweepData object with percentile data, None otherwise
+		"""
+        if ((nStart < 0) or (nEnd > self.UpperBound) or (nStart > nEnd)):
             return None
 
-        nTotalIterations = nEnd - nStart + 1
+        nSweeps = nEnd - nStart + 1
+        nRank = min(nSweeps - 1, max(0, int(fPercentile * nSweeps / 100.0)))
+        objReturn = None
         try:
-            objReturn = RFESweepData(self.m_arrData[nEnd].StartFrequencyMHZ, self.m_arrData[nEnd].StepFrequencyMHZ, self.m_arrData[nEnd].TotalDataPoints)
-
-            for nSweepInd in objReturn.TotalDataPoints:
-                #sDebugText += "[" + nSweepInd + "]:"
-                fSweepValue = 0.0
-                arrSweepValues = [0.0] * nTotalIterations
-                
-                nIterationInd = nStart
-                while(nIterationInd <= nEnd) :
-                    if (nSweepInd == 0):
-                        #check all the sweeps use the same configuration, but
-                        #only in first loop to reduce overhead
-                        if (not self.m_arrData[nIterationInd].IsSameConfiguration(objReturn)):
-                            return None
-                    arrSweepValues[nIterationInd - nStart] = self.m_arrData[nIterationInd].GetAmplitudeDBM(nSweepInd, None, False)
-                    #sDebugText += str(self.m_arrData[nIterationInd].GetAmplitudeDBM(nSweepInd)) + ","
-                    nIterationInd += 1
-                                
-                arrSweepValues.sort()
-                fSweepValue = arrSweepValues[nTotalIterations / 2]
-                #sDebugText += "(" + str(fSweepValue) + ")"
-                objReturn.SetAmplitudeDBM(nSweepInd, fSweepValue)
+            objLast = self.GetData(nEnd)
+            nTotalDataPoints = objLast.TotalDataPoints
+            if (self.m_bNumPy):
+                arrSource, objRows, _, bSameConfiguration = self.GetWindow(nStart, nEnd)
+                if (not bSameConfiguration):
+                    return None
+                arrPercentile = np.empty(nTotalDataPoints, dtype=np.float32)
+                nChunk = max(1, RFE_Common.CONST_PERCENTILE_CHUNK_BYTES // (nSweeps * 4))
+                for nFirstPoint in range(0, nTotalDataPoints, nChunk):
+                    nLastPoint = min(nTotalDataPoints, nFirstPoint + nChunk)
+                    arrValues = arrSource[objRows, nFirstPoint:nLastPoint]
+                    arrPercentile[nFirstPoint:nLastPoint] = np.partition(arrValues, nRank, axis=0)[nRank]
+            else:
+                arrSweeps = [self.GetData(nInd) for nInd in range(nStart, nEnd + 1)]
+                for objSweep in arrSweeps:
+                    if (not objSweep.IsSameConfiguration(objLast)):
+                        return None
+                arrPercentile = [sorted(arrValues)[nRank] for arrValues in zip(*[objSweep.m_arrAmplitude for objSweep in arrSweeps])]
+            objReturn = RFESweepData(objLast.StartFrequencyMHZ, objLast.StepFrequencyMHZ, nTotalDataPoints, arrPercentile)
         except Exception as obEx:
-            print("Error in RFESweedDataCollection - GetMedianAverage(): " + str(obEx))
+            print("Error in RFESweedDataCollection - GetPercentile(): " + str(obEx))
             objReturn = None
 
         return objReturn
 
     def GetAverage(self, nStart, nEnd):
-        """Return a SweepData object with average data 
+        """Return a SweepData object with average data, the average of the dBm values
+
+        Parameters:
+            nStart -- Index of the first sweep for the average calculation  
+            nEnd   -- Index of the last sweep for the average calculation
+        Returns:
+            RFESweepData object with average data, None otherwise
+		"""
+        return self.GetWindowAverage(nStart, nEnd, False)
+
+    def GetPowerAverage(self, nStart, nEnd):
+        """Return a SweepData object with the average power of every data point, calculated in mW and converted to dBm
 
         Parameters:
-            nStart -- Start frequency for the average calculation  
-            nEnd   -- End frequency for the average calculation
+            nStart -- Index of the first sweep for the average calculation  
+            nEnd   -- Index of the last sweep for the average calculation
         Returns:
             RFESweepData object with average data, None otherwise
 		"""
-        #string sDebugText = ""
+        return self.GetWindowAverage(nStart, nEnd, True)
+
+    def GetLastAverage(self, nSweeps):
+        """Return a SweepData object with the average of the dBm values of the last nSweeps sweeps, or all of them if
+        there are less. With CumulativeSums it can be called on every new sweep at a cost independent of nSweeps
 
-        if (nStart > self.m_nUpperBound or nEnd > self.m_nUpperBound or nStart > nEnd):
+        Parameters:
+            nSweeps -- Number of sweeps to average
+        Returns:
+            RFESweepData object with average data, None otherwise
+		"""
+        return self.GetWindowAverage(max(0, self.Count - nSweeps), self.UpperBound, False)
+
+    def GetLastPowerAverage(self, nSweeps):
+        """Return a SweepData object with the average power of the last nSweeps sweeps, as GetLastAverage
+
+        Parameters:
+            nSweeps -- Number of sweeps to average
+        Returns:
+            RFESweepData object with average data, None otherwise
+		"""
+        return self.GetWindowAverage(max(0, self.Count - nSweeps), self.UpperBound, True)
+
+    def GetWindowAverage(self, nStart, nEnd, bPower):
+        """Return the average of consecutive sweeps, all of them must have the same configuration
+
+        Parameters:
+            nStart -- Index of the first sweep for the average calculation
+            nEnd   -- Index of the last sweep for the average calculation
+            bPower -- True to average the power in mW, False to average the dBm values
+        Returns:
+            RFESweepData object with average data, None otherwise
+		"""
+        if ((nStart < 0) or (nEnd > self.UpperBound) or (nStart > nEnd)):
             return None
 
+        nSweeps = nEnd - nStart + 1
+        objReturn = None
         try:
-            objReturn = RFESweepData(self.m_arrData[nEnd].StartFrequencyMHZ, self.m_arrData[nEnd].StepFrequencyMHZ, self.m_arrData[nEnd].TotalSteps)
-
-            for nSweepInd in objReturn.TotalSteps:
-                #sDebugText += "[" + nSweepInd + "]:"
-                fSweepValue = 0.0
-
-                nIterationInd = nStart 
-                while (nIterationInd <= nEnd):
-                    if (nSweepInd == 0):
-                        #check all the sweeps use the same configuration, but
-                        #only in first loop to reduce overhead
-                        if (not self.m_arrData[nIterationInd].IsSameConfiguration(objReturn)):
-                            return None
-
-                    fSweepValue += self.m_arrData[nIterationInd].GetAmplitudeDBM(nSweepInd, None, False)
-                    #sDebugText +=
-                    #str(self.m_arrData[nIterationInd].GetAmplitudeDBM(nSweepInd))
-                    #+ ","
-                    nIterationInd += 1
-                
-                fSweepValue = fSweepValue / (nEnd - nStart + 1)
-                #sDebugText += "(" + str(fSweepValue) + ")"
-                objReturn.SetAmplitudeDBM(nSweepInd, fSweepValue)
-        
+            objLast = self.GetData(nEnd)
+            nTotalDataPoints = objLast.TotalDataPoints
+            if (self.m_bNumPy):
+                arrSource, objRows, _, bSameConfiguration = self.GetWindow(nStart, nEnd)
+                if (not bSameConfiguration):
+                    return None
+                nRAMStart = nStart - self.m_nPagedOut
+                if (self.m_bCumulativeSums and (nRAMStart >= 0)):
+                    #sums only cover the sweeps in RAM
+                    arrSums, arrBase = (self.m_arrSumMW, self.m_arrBaseMW) if bPower else (self.m_arrSumDB, self.m_arrBaseDB)
+                    arrBefore = arrSums[self.GetRow(nRAMStart - 1)] if (nRAMStart > 0) else arrBase
+                    arrSum = arrSums[self.GetRow(nEnd - self.m_nPagedOut), :nTotalDataPoints] - arrBefore[:nTotalDataPoints]
+                else:
+                    #a block of sweeps at a time, so a window paged out to the archive is not loaded in RAM at once
+                    arrWindow = arrSource[objRows, :nTotalDataPoints]
+                    arrSum = np.zeros(nTotalDataPoints, dtype=np.float64)
+                    nChunk = max(1, RFE_Common.CONST_AVERAGE_CHUNK_BYTES // (nTotalDataPoints * 8))
+                    for nFirst in range(0, nSweeps, nChunk):
+                        arrValues = arrWindow[nFirst:(nFirst + nChunk)].astype(np.float64)
+                        if (bPower):
+                            arrValues = np.power(10.0, arrValues * 0.1)
+                        arrSum += arrValues.sum(axis=0)
+                arrAverage = arrSum / nSweeps
+                if (bPower):
+                    arrAverage = np.log10(arrAverage) * 10.0
+                arrAverage = arrAverage.astype(np.float32)
+            else:
+                arrSum = [0.0] * nTotalDataPoints
+                for nInd in range(nStart, nEnd + 1):
+                    objSweep = self.GetData(nInd)
+                    if (not objSweep.IsSameConfiguration(objLast)):
+                        return None
+                    arrValues = objSweep.m_arrAmplitude
+                    if (bPower):
+                        arrValues = [10.0 ** (fDBM * 0.1) for fDBM in arrValues]
+                    arrSum = list(map(operator.add, arrSum, arrValues))
+                if (bPower):
+                    arrAverage = [10.0 * math.log10(fSum / nSweeps) for fSum in arrSum]
+                else:
+                    arrAverage = [fSum / nSweeps for fSum in arrSum]
+            objReturn = RFESweepData(objLast.StartFrequencyMHZ, objLast.StepFrequencyMHZ, nTotalDataPoints, arrAverage)
         except Exception as obEx:
             objReturn = None
             print("Error in RFESweedDataCollection - GetAverage(): " + str(obEx))
@@ -260,16 +725,16 @@ class RFESweepDataCollection:
             cCSVDelimiter       -- Comma delimiter to use
             AmplitudeCorrection -- Optional parameter, can be None. If different than None, use the amplitude correction table
 		"""
-        if (self.m_nUpperBound <= 0):
+        if (self.UpperBound <= 0):
             return
 
-        objFirst = self.m_arrData[0]
+        objFirst = self.GetData(0)
         try:
             with open(sFilename, 'w') as objWriter:
                 objWriter.write("RF Explorer CSV data file: " + self.FileHeaderVersioned() + '\n' + \
                     "Start Frequency: " + str(objFirst.StartFrequencyMHZ) + "MHZ" + '\n' + \
                     "Step Frequency: " + str(objFirst.StepFrequencyMHZ * 1000) + "KHZ" + '\n' + \
-                    "Total data entries: " + str(self.m_nUpperBound) + '\n' + \
+                    "Total data entries: " + str(self.UpperBound) + '\n' + \
                     "Steps per entry: " + str(objFirst.TotalSteps)+ '\n')
 
                 sHeader = "Sweep" + cCSVDelimiter + "Date" + cCSVDelimiter + "Time" + cCSVDelimiter + "Milliseconds"
@@ -280,18 +745,19 @@ class RFESweepDataCollection:
 
                 objWriter.write(sHeader + '\n')
 
-                for nSweepInd in range(self.m_nUpperBound):
+                for nSweepInd in range(self.UpperBound):
+                    objSweep = self.GetData(nSweepInd)
                     objWriter.write(str(nSweepInd) + cCSVDelimiter)
 
-                    objWriter.write(str(self.m_arrData[nSweepInd].CaptureTime.date()) + cCSVDelimiter + \
-                        str(self.m_arrData[nSweepInd].CaptureTime.time())[:-7] + cCSVDelimiter + \
-                        '.' +'{:03}'.format(int(str(getattr(self.m_arrData[nSweepInd].CaptureTime.time(), 'microsecond'))[:-3])) + cCSVDelimiter)
+                    objWriter.write(str(objSweep.CaptureTime.date()) + cCSVDelimiter + \
+                        str(objSweep.CaptureTime.time())[:-7] + cCSVDelimiter + \
+                        '.' +'{:03}'.format(int(str(getattr(objSweep.CaptureTime.time(), 'microsecond'))[:-3])) + cCSVDelimiter)
 
-                    if (not self.m_arrData[nSweepInd].IsSameConfiguration(objFirst)):
+                    if (not objSweep.IsSameConfiguration(objFirst)):
                         break
 
                     for nStep in range(objFirst.TotalSteps):
-                        objWriter.write(str(self.m_arrData[nSweepInd].GetAmplitudeDBM(nStep, AmplitudeCorrection, (AmplitudeCorrection != None))))
+                        objWriter.write(str(objSweep.GetAmplitudeDBM(nStep, AmplitudeCorrection, (AmplitudeCorrection != None))))
                         if (nStep != (objFirst.TotalSteps - 1)):
                             objWriter.write(cCSVDelimiter)
                     
@@ -314,12 +780,13 @@ class RFESweepDataCollection:
         dTopRangeDBM = RFE_Common.CONST_MIN_AMPLITUDE_DBM
         dBottomRangeDBM = RFE_Common.CONST_MAX_AMPLITUDE_DBM
 
-        if (self.m_nUpperBound <= 0):
+        if (self.UpperBound <= 0):
             return
 
-        for nIndSample in self.m_nUpperBound:
-            for nIndStep in self.m_arrData[0].TotalSteps:
-                dValueDBM = self.m_arrData[nIndSample].GetAmplitudeDBM(nIndStep, AmplitudeCorrection, (AmplitudeCorrection != None))
+        for nIndSample in range(self.Count):
+            objSweep = self.GetData(nIndSample)
+            for nIndStep in range(objSweep.TotalDataPoints):
+                dValueDBM = objSweep.GetAmplitudeDBM(nIndStep, AmplitudeCorrection, (AmplitudeCorrection != None))
                 if (dTopRangeDBM < dValueDBM):
                     dTopRangeDBM = dValueDBM
                 if (dBottomRangeDBM > dValueDBM):
@@ -333,4 +800,5 @@ class RFESweepDataCollection:
         Parameters:
             nSizeToAdd -- Number of sample to add to the sweep data collection
 		"""
-        self.m_arrData += [RFESweepData] * nSizeToAdd
+        if (self.m_nWidth > 0):
+            self.Reallocate(self.m_nRows + nSizeToAdd)
@@ -0,0 +1,102 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+from collections import deque
+
+from RFExplorer import RFE_Common
+
+class RFESweepRateEstimator:
+    """Rolling estimation of the sweep rate and the time a device takes to send a sweep, calculated from the 
+    monotonic timestamps of the last CONST_SWEEP_RATE_WINDOW sweeps received
+    """
+    def __init__(self, nWindow=RFE_Common.CONST_SWEEP_RATE_WINDOW):
+        self.m_arrFirstByteNS = deque(maxlen=nWindow + 1)      #first byte time of consecutive real time sweeps
+        self.m_arrTransferNS = deque(maxlen=nWindow)            #time between first and last byte of the last sweeps
+        self.m_nTransferSumNS = 0
+
+    def AddSweep(self, nFirstByteNS, nLastByteNS):
+        """Add a new sweep to the estimation, an interval longer than CONST_SWEEP_RATE_MAX_GAP_SEC since the previous
+        one restarts the sweep rate estimation
+
+        Parameters:
+            nFirstByteNS -- time.monotonic_ns() when the first byte of the sweep was read
+            nLastByteNS  -- time.monotonic_ns() when the last byte of the sweep was read
+        """
+        if (self.m_arrFirstByteNS and ((nFirstByteNS - self.m_arrFirstByteNS[-1]) > RFE_Common.CONST_SWEEP_RATE_MAX_GAP_SEC * 1e9)):
+            self.m_arrFirstByteNS.clear()
+        self.m_arrFirstByteNS.append(nFirstByteNS)
+        if (len(self.m_arrTransferNS) == self.m_arrTransferNS.maxlen):
+            self.m_nTransferSumNS -= self.m_arrTransferNS[0]
+        self.m_arrTransferNS.append(nLastByteNS - nFirstByteNS)
+        self.m_nTransferSumNS += nLastByteNS - nFirstByteNS
+
+    def Restart(self):
+        """Do not measure the interval to the next sweep, used when sweeps were discarded meanwhile, such as in hold mode
+        """
+        self.m_arrFirstByteNS.clear()
+
+    def Reset(self):
+        """Discard all the estimation
+        """
+        self.m_arrFirstByteNS.clear()
+        self.m_arrTransferNS.clear()
+        self.m_nTransferSumNS = 0
+
+    @property
+    def Intervals(self):
+        """Number of intervals between sweeps used in the current estimation
+        """
+        return max(0, len(self.m_arrFirstByteNS) - 1)
+
+    @property
+    def SweepTimeSec(self):
+        """Average seconds between consecutive sweeps, 0.0 if not known yet
+        """
+        nIntervals = self.Intervals
+        if (nIntervals == 0):
+            return 0.0
+        return (self.m_arrFirstByteNS[-1] - self.m_arrFirstByteNS[0]) / (nIntervals * 1e9)
+
+    @property
+    def SweepsPerSecond(self):
+        """Average sweeps received per second, 0.0 if not known yet
+        """
+        fSweepTime = self.SweepTimeSec
+        return (1.0 / fSweepTime) if (fSweepTime > 0.0) else 0.0
+
+    @property
+    def LastSweepTimeSec(self):
+        """Seconds between the last two sweeps, 0.0 if not known yet
+        """
+        if (len(self.m_arrFirstByteNS) < 2):
+            return 0.0
+        return (self.m_arrFirstByteNS[-1] - self.m_arrFirstByteNS[-2]) / 1e9
+
+    @property
+    def TransferTimeSec(self):
+        """Average seconds between the first and the last byte of a sweep, 0.0 if not known yet
+        """
+        if (not self.m_arrTransferNS):
+            return 0.0
+        return self.m_nTransferSumNS / (len(self.m_arrTransferNS) * 1e9)
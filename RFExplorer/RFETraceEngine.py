@@ -0,0 +1,181 @@
+#pylint: disable=trailing-whitespace, line-too-long, bad-whitespace, invalid-name, R0204, C0200
+#pylint: disable=superfluous-parens, missing-docstring, broad-except
+#pylint: disable=too-many-lines, too-many-instance-attributes, too-many-statements, too-many-nested-blocks
+#pylint: disable=too-many-branches, too-many-public-methods, too-many-locals, too-many-arguments
+
+#============================================================================
+#RF Explorer Python Libraries - A Spectrum Analyzer for everyone!
+#Copyright © 2010-21 RF Explorer Technologies SL, www.rf-explorer.com
+#
+#This application is free software; you can redistribute it and/or
+#modify it under the terms of the GNU Lesser General Public
+#License as published by the Free Software Foundation; either
+#version 3.0 of the License, or (at your option) any later version.
+#
+#This software is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#General Public License for more details.
+#
+#You should have received a copy of the GNU General Public
+#License along with this library; if not, write to the Free Software
+#Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+#=============================================================================
+
+
+import math
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None   #NumPy is optional, traces are calculated in pure Python without it
+
+from RFExplorer import RFE_Common
+from RFExplorer.RFESweepData import RFESweepData
+
+class RFETraceEngine:
+    """Traces calculated from every sweep added since the last reset, as the device does with its own buffers: max 
+    hold, min hold, average of the linear power (mW) and exponential moving average of the dBm values. With NumPy each
+    trace is updated with a single vectorized operation per sweep in preallocated arrays. The traces restart when a
+    sweep with a different configuration is added
+    """
+    def __init__(self, fEMAFactor=RFE_Common.CONST_EMA_TRACE_FACTOR):
+        self.m_fEMAFactor = fEMAFactor
+        self.m_bResetPending = False
+        self.m_tConfig = None           #(start MHz, step MHz, data points) of the sweeps in the traces
+        self.m_nCount = 0
+        self.m_arrMaxHold = None
+        self.m_arrMinHold = None
+        self.m_arrSumMW = None          #sum of the power in mW of every data point, float64
+        self.m_arrEMA = None
+        self.m_arrWork = None           #float64 buffer for intermediate results
+        self.m_arrWork32 = None         #float32 buffer for intermediate results
+
+    @property
+    def EMAFactor(self):
+        """Get/Set weight of every new sweep in the exponential moving average, from 0.0 to 1.0
+        """
+        return self.m_fEMAFactor
+    @EMAFactor.setter
+    def EMAFactor(self, value):
+        self.m_fEMAFactor = min(1.0, max(0.0, value))
+
+    @property
+    def Count(self):
+        """Number of sweeps included in the traces
+        """
+        return 0 if self.m_bResetPending else self.m_nCount
+
+    @property
+    def MaxHold(self):
+        """RFESweepData with the max amplitude of every data point, None if no sweep was added
+        """
+        return self.GetTrace(self.m_arrMaxHold)
+
+    @property
+    def MinHold(self):
+        """RFESweepData with the min amplitude of every data point, None if no sweep was added
+        """
+        return self.GetTrace(self.m_arrMinHold)
+
+    @property
+    def Average(self):
+        """RFESweepData with the average power of every data point, calculated in mW and converted to dBm. None if no
+        sweep was added
+        """
+        if (self.Count == 0):
+            return None
+        fCount = float(self.m_nCount)
+        if (np is not None):
+            arrAverage = (np.log10(self.m_arrSumMW / fCount) * 10.0).astype(np.float32)
+        else:
+            arrAverage = [10.0 * math.log10(fSumMW / fCount) for fSumMW in self.m_arrSumMW]
+        return self.CreateSweep(arrAverage)
+
+    @property
+    def EMA(self):
+        """RFESweepData with the exponential moving average of the dBm amplitude of every data point, see EMAFactor.
+        None if no sweep was added
+        """
+        return self.GetTrace(self.m_arrEMA)
+
+    def GetTrace(self, arrTrace):
+        if (self.Count == 0):
+            return None
+        return self.CreateSweep(arrTrace.copy() if (np is not None) else list(arrTrace))
+
+    def CreateSweep(self, arrAmplitude):
+        fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints = self.m_tConfig
+        return RFESweepData(fStartFreqMHZ, fStepFreqMHZ, nTotalDataPoints, arrAmplitude)
+
+    def Reset(self):
+        """Restart all traces, as RFECommunicator.ResetInternalBuffers does in the device. It is applied by the next Add,
+        so it can be called from any thread; until then traces are None and Count is 0
+        """
+        self.m_bResetPending = True
+
+    def Add(self, objSweep):
+        """Include a sweep in all traces
+
+        Parameters:
+            objSweep -- RFESweepData to add
+        """
+        self.AddAmplitudes(objSweep.m_arrAmplitude, objSweep.StartFrequencyMHZ, objSweep.StepFrequencyMHZ)
+
+    def AddAmplitudes(self, arrAmplitude, fStartFreqMHZ, fStepFreqMHZ):
+        """Include a sweep in all traces from its amplitude values
+
+        Parameters:
+            arrAmplitude  -- List or NumPy array with the dBm value of every data point
+            fStartFreqMHZ -- Start frequency of the sweep in MHz
+            fStepFreqMHZ  -- Step frequency of the sweep in MHz
+        """
+        tConfig = (fStartFreqMHZ, fStepFreqMHZ, len(arrAmplitude))
+        if (self.m_bResetPending or (tConfig != self.m_tConfig)):
+            self.m_bResetPending = False
+            self.m_tConfig = tConfig
+            self.m_nCount = 0
+        if (np is not None):
+            self.AddNumPy(np.asarray(arrAmplitude, dtype=np.float32))
+        else:
+            self.AddPython(arrAmplitude)
+        self.m_nCount += 1
+
+    def AddNumPy(self, arrAmplitude):
+        if (self.m_nCount == 0):
+            if ((self.m_arrMaxHold is None) or (len(self.m_arrMaxHold) != len(arrAmplitude))):
+                nPoints = len(arrAmplitude)
+                self.m_arrMaxHold = np.empty(nPoints, dtype=np.float32)
+                self.m_arrMinHold = np.empty(nPoints, dtype=np.float32)
+                self.m_arrEMA = np.empty(nPoints, dtype=np.float32)
+                self.m_arrSumMW = np.empty(nPoints, dtype=np.float64)
+                self.m_arrWork = np.empty(nPoints, dtype=np.float64)
+                self.m_arrWork32 = np.empty(nPoints, dtype=np.float32)
+            self.m_arrMaxHold[:] = arrAmplitude
+            self.m_arrMinHold[:] = arrAmplitude
+            self.m_arrEMA[:] = arrAmplitude
+            self.m_arrSumMW.fill(0.0)
+        else:
+            np.maximum(self.m_arrMaxHold, arrAmplitude, out=self.m_arrMaxHold)
+            np.minimum(self.m_arrMinHold, arrAmplitude, out=self.m_arrMinHold)
+            np.subtract(arrAmplitude, self.m_arrEMA, out=self.m_arrWork32)
+            self.m_arrWork32 *= self.m_fEMAFactor
+            self.m_arrEMA += self.m_arrWork32
+        np.multiply(arrAmplitude, 0.1, out=self.m_arrWork)
+        np.power(10.0, self.m_arrWork, out=self.m_arrWork)
+        self.m_arrSumMW += self.m_arrWork
+
+    def AddPython(self, arrAmplitude):
+        arrMW = [10.0 ** (fDBM * 0.1) for fDBM in arrAmplitude]
+        if (self.m_nCount == 0):
+            self.m_arrMaxHold = list(arrAmplitude)
+            self.m_arrMinHold = self.m_arrMaxHold
+            self.m_arrEMA = self.m_arrMaxHold
+            self.m_arrSumMW = arrMW
+        else:
+            fFactor = self.m_fEMAFactor
+            self.m_arrMaxHold = list(map(max, self.m_arrMaxHold, arrAmplitude))
+            self.m_arrMinHold = list(map(min, self.m_arrMinHold, arrAmplitude))
+            self.m_arrEMA = [fEMA + (fDBM - fEMA) * fFactor for fEMA, fDBM in zip(self.m_arrEMA, arrAmplitude)]
+            self.m_arrSumMW = list(map(operator.add, self.m_arrSumMW, arrMW))
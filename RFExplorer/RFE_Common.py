@@ -35,7 +35,7 @@ CONST_FCY_CLOCK = 16 * 1000 * 1000   #RFECommunicator - public const UInt32 FCY_
 CONST_MIN_AMPLITUDE_DBM = -120.0   #RFECommunicator - public const float MIN_AMPLITUDE_DBM = -120.0f
 CONST_MAX_SPECTRUM_STEPS = 65535   #RFECommunicator - public const UInt16 MAX_SPECTRUM_STEPS = 65535
 CONST_MAX_AMPLITUDE_DBM = 50.0  #RFECommunicator - public const float MAX_AMPLITUDE_DBM = 50.0f
-CONST_MAX_ELEMENTS = (1000)     #This is the absolute max size that can be allocated
+CONST_MAX_ELEMENTS = (1000)     #Default max number of sweeps of an autogrow RFESweepDataCollection, see Capacity
 CONST_FILE_VERSION = 2         #File format constant indicates the latest known and supported file format
 CONST_ACKNOWLEDGE = "#ACK"
 
@@ -49,7 +49,40 @@ CONST_RFE_MIN_SWEEP_STEPS = CONST_RFE_MIN_SWEEP_POINTS - 1;
 
 CONST_RESETSTRING = "(C) Ariel Rocholl "
 
+CONST_READ_TIMEOUT_SEC = 0.1        #max time the receive thread blocks on the port waiting for new bytes, so it can react to close requests
+CONST_READ_COALESCE_SEC = 0.005     #time the receive thread waits after being woken up to batch more bytes in a single read (eReadPolicy.LOW_CPU)
+CONST_DISPATCHER_TIMEOUT_SEC = 0.5  #max time the dispatcher thread blocks on the queue, so it can react to StopDispatcher
+CONST_WAIT_TIMEOUT_SEC = 5.0        #default max time RFECommunicator.WaitFor* methods wait for the device
+CONST_CONFIG_TIMEOUT_SEC = 2.0      #max time UpdateDeviceConfig waits for the device to confirm the new configuration
+CONST_COALESCED_COMMANDS = ("C2-F:", "CJ", "Cj")   #commands superseded by a newer one of the same type if not written yet
+CONST_RFE_USB_IDS = ((0x10C4, 0xEA60),)  #USB (VID, PID) of the Silicon Labs CP210x bridge used by RF Explorer devices
+CONST_RFE_USB_DESCRIPTORS = ("CP210", "SLAB_USB", "SILICON LABS")  #port descriptor text of the CP210x bridge, used when VID/PID is not reported
+CONST_PORT_PROBE_TIMEOUT_SEC = 1.0  #max time GetConnectedPorts waits for a port to open
+CONST_PORT_PROBE_THREADS = 8        #ports opened concurrently by GetConnectedPorts
+CONST_MANAGER_POLL_SEC = 0.01       #interval RFEDeviceManager reads ports which can not be waited with a selector, such as Windows serial ports
+CONST_ASYNC_SWEEP_QUEUE = 64        #default max sweeps waiting in a RFEAsyncCommunicator.Sweeps iterator before the port reading is paused
+CONST_RECEIVE_QUEUE_SWEEPS = 1024   #default max sweeps waiting in the RFECommunicator receive queue, see eOverflowPolicy
+CONST_SWEEP_RATE_WINDOW = 32       #sweep intervals averaged by RFESweepRateEstimator
+CONST_SWEEP_RATE_MAX_GAP_SEC = 60.0 #longer intervals between sweeps are not real time data (hold, reconfiguration) and restart the estimation
+CONST_CLOCK_SYNC_SEC = 60.0         #interval the offset between monotonic and wall clock is measured again to convert sweep timestamps
+CONST_SWEEP_DATA_INITIAL_SWEEPS = 64  #sweeps allocated to start with by RFECommunicator.SweepData, doubled when needed up to its Capacity
+CONST_EMA_TRACE_FACTOR = 0.1         #default weight of every new sweep in the RFETraceEngine exponential moving average
+CONST_PERCENTILE_CHUNK_BYTES = 16 * 1024 * 1024  #max bytes of sweep data copied at once by RFESweepDataCollection.GetPercentile
+CONST_AVERAGE_CHUNK_BYTES = 16 * 1024 * 1024     #max bytes of sweep data converted at once by RFESweepDataCollection.GetAverage
+CONST_PERCENTILE_RESOLUTION_DB = 0.5  #default amplitude resolution of RFESlidingPercentile, the resolution of the device data
+CONST_ARCHIVE_FORMAT = "RFExplorer sweep archive v001"  #format of the files written by RFESweepArchive
+CONST_ARCHIVE_HEADER_FILE = "archive.json"      #RFESweepArchive file with width and sweep configurations
+CONST_ARCHIVE_AMPLITUDE_FILE = "amplitude.f32"  #RFESweepArchive file with the float32 amplitude matrix
+CONST_ARCHIVE_INDEX_FILE = "index.bin"          #RFESweepArchive file with time and configuration of every sweep
+CONST_TRACE_RECORDS = 1000         #default max log records kept by RFELogging.StartTrace
+CONST_TRACE_RATE = 200.0            #default max log records per second kept by RFELogging.StartTrace, the rest are dropped
+CONST_MAX_RETRIES_CALIBRATION = 3   #times internal calibration data is requested with "Cq" after a configuration is received
+CONST_DEVICE_CACHE_FILE = ".rfexplorer_devices.json"  #default RFEDeviceCache file name, in the user home folder
+CONST_MAX_PENDING_BYTES = 66 * 1024  #max received bytes kept without finding a valid frame, larger than the biggest $z sweep
+CONST_STREAM_RECORD_MAGIC = b"RFEREC01"  #header of the files written by RFEStreamRecorder
+
 CONST_EEOT = "\xFF\xFE\xFF\xFE\x00"      #this indicates Early End Of Transmission, sent by devices with firmware > 1.27 and 3.10
+CONST_EEOT_BYTES = CONST_EEOT.encode("latin_1")   #same EEOT marker, used to search the raw received byte buffer
 
 CONST_POS_INTERNAL_CALIBRATED_6G = 134  #start position for 6G model
 CONST_POS_INTERNAL_CALIBRATED_MWSUB3G = 0  #start position for MWSUB3G model
@@ -138,6 +171,50 @@ class eInputStage(Enum):
     Attenuator_60dB = 3
     LNA_12dB = 4
 
+class eReadPolicy(Enum):
+    """How the receive thread waits for new data coming from the device
+    """
+    POLLING = 0         #check the port and sleep 10ms between checks, as in previous library versions
+    LOW_LATENCY = 1     #block on the port and process bytes as soon as they arrive
+    LOW_CPU = 2         #block on the port, then wait CONST_READ_COALESCE_SEC to process more bytes per wake up
+
+class eFrameType(Enum):
+    """Type of the frames found by RFEProtocolFramer in the received byte stream
+    """
+    TEXT_LINE = 0           #any line ended by \r\n, including '#' configuration and status lines
+    SWEEP = 1               #complete $S, $s or $z spectrum analyzer data
+    CALIBRATION_DUMP = 2    #$q or $Q internal calibration data dump
+    CALIBRATION_DATA = 3    #$Cc, $Cd or $Cb calibration data
+    SCREEN_DUMP = 4         #$D screen dump data
+    EEOT = 5                #sweep interrupted by an Early End Of Transmission marker, partial data discarded
+    CORRUPTED = 6           #sweep with the expected length but not ended by \r\n, discarded up to next line end
+    OVERFLOW = 7            #pending data discarded because no valid frame was found in CONST_MAX_PENDING_BYTES
+
+class eEvent(Enum):
+    """Events notified by RFECommunicator to the callbacks registered with Subscribe
+    """
+    SWEEP = 0           #new sweep stored in SweepData, callback receives the RFESweepData
+    CONFIG = 1          #new configuration processed, callback receives the RFEConfiguration
+    CALIBRATION = 2     #internal calibration data received, callback receives the $q/$Q line
+    ACK = 3             #acknowledge (#ACK) received from the device, callback receives the line
+    RESET = 4           #device reset detected, callback receives the reset line
+    MODEL = 5           #device model received, callback receives the #C2-M or #C3-M line
+
+class eOverflowPolicy(Enum):
+    """What the receive queue does with a new sweep when it already holds its capacity of sweeps. Other objects, such
+    as configurations and #ACK, are always queued
+    """
+    DROP_OLDEST = 0     #discard the oldest sweep queued
+    DROP_NEWEST = 1     #discard the new sweep
+    LATEST = 2          #discard all sweeps queued, so only the new sweep is kept
+    BLOCK = 3           #the receive thread waits until the consumer takes a sweep
+
+class eStreamDirection(Enum):
+    """Direction of the bytes stored by RFEStreamRecorder
+    """
+    RX = 0      #bytes received from the device
+    TX = 1      #bytes sent to the device
+
       
 
 #---------------------------------------------------------
@@ -31,7 +31,6 @@ import queue
 import threading
 import time
 import math
-from datetime import datetime, timedelta
 import serial.tools.list_ports
 import serial
 import platform
@@ -39,12 +38,22 @@ import platform
 #---------------------------------------------------------
 
 from RFExplorer import RFE_Common 
+from RFExplorer import RFELogging
+from RFExplorer.RFELogging import g_objCommunicatorLog
 from RFExplorer.ReceiveSerialThread import ReceiveSerialThread
+from RFExplorer.RFECommandWriter import RFECommandWriter
 from RFExplorer.RFESweepData import RFESweepData
 from RFExplorer.RFESweepDataCollection import RFESweepDataCollection
 from RFExplorer.RFEConfiguration import RFEConfiguration
 from RFExplorer.RFEAmplitudeTableData import RFEAmplitudeTableData
 from RFExplorer.RFE6GEN_CalibrationData import RFE6GEN_CalibrationData
+from RFExplorer.RFEStreamRecorder import RFEStreamRecorder, RFEStreamReplayPort
+from RFExplorer.RFEDeviceCache import RFEDeviceCache
+from RFExplorer.RFEReceiveQueue import RFEReceiveQueue
+from RFExplorer.RFESweepRateEstimator import RFESweepRateEstimator
+from RFExplorer.RFEPipelineStats import RFEPipelineStats
+from RFExplorer.RFELatestSweep import RFELatestSweep
+from RFExplorer.RFESweepArchive import RFESweepArchive
 
 #---------------------------------------------------------
 
@@ -165,17 +174,25 @@ def GetModelEnumFromText(sText):
 class RFECommunicator(object):    
     """Main API class to support all basic low level operations with RF Explorer
 	"""
-    def __init__(self):
+    def __init__(self, objDeviceManager=None):
+        """Create the communicator and its receive thread
+
+        Parameters:
+            objDeviceManager -- RFEDeviceManager reading the port of this device, use RFEDeviceManager.CreateDevice 
+                                instead of this parameter. None to read it with a dedicated receive thread and write 
+                                commands with a dedicated RFECommandWriter thread
+		"""
         self.m_bAutoCleanConfig = True
         self.m_bUseByteBLOB = False
         self.m_bUseStringBLOB = False
+        self.m_bUseNumPy = RFESweepData.IsNumPyAvailable()
         self.m_bAutoConfigure = True 
         self.m_arrConnectedPorts = []
         self.m_arrValidCP2102Ports = []
+        self.m_dicPortRank = {}
         self.m_nVerboseLevel = 1
         self.m_bIsResetEvent = False
         self.m_objSerialPort = serial.Serial()
-        self.m_hQueueLock = threading.Lock()
         self.m_hSerialPortLock = threading.Lock()
         self.m_ReceivedBytesMutex = threading.Lock()
         self.m_bDisposed = False 
@@ -216,16 +233,14 @@ class RFECommunicator(object):
         self.m_fAmplitudeBottomDBM = RFE_Common.CONST_MIN_AMPLITUDE_DBM   #dBm for bottom graph limit
         self.m_eMode = RFE_Common.eMode.MODE_SPECTRUM_ANALYZER
         self.m_bStoreSweep = True
-        self.m_LastCaptureTime = datetime(2000, 1, 1, 0, 0, 0, 000)
-        self.m_spanAverageSpeedAcumulator = timedelta()
-        self.m_fAverageSweepTime = 0.0
-        self.m_nAverageSweepSpeedIterator = 0
+        self.m_objSweepRate = RFESweepRateEstimator()
+        self.m_objStats = RFEPipelineStats()
+        self.m_bStatsEnabled = False        #timing every read, frame and sweep costs about 20% of the pipeline
         self.m_bAcknowledge = False 
         self.m_bIntendedAnalyzer = True     
         self.m_eDSP = RFE_Common.eDSP.DSP_AUTO
         self.m_sSerialNumber = ""
         self.m_sExpansionSerialNumber = ""
-        self.m_sSweepInfoText = ""     
         self.m_eMainBoardModel = RFE_Common.eModel.MODEL_NONE
         self.m_eExpansionBoardModel = RFE_Common.eModel.MODEL_NONE 
         self.m_eCalculator = RFE_Common.eCalculator.NORMAL
@@ -233,6 +248,22 @@ class RFECommunicator(object):
         self.m_bExpansionBoardActive = False
         self.m_nBaudrate = 0
         self.m_bRunReceiveThread = True
+        self.m_eReadPolicy = RFE_Common.eReadPolicy.LOW_LATENCY
+        self.m_hPortConnectedEvent = threading.Event()     #set while the port is connected, wakes up the receive thread
+        self.m_objStreamRecorder = None       #RFEStreamRecorder storing all bytes exchanged with the device, if any
+        self.m_objDeviceCache = None          #RFEDeviceCache with devices known from previous connections, if any
+        self.m_dicCachedDevice = None         #values of the connected device restored from m_objDeviceCache
+        self.m_dictSubscribers = {eEvent: [] for eEvent in RFE_Common.eEvent}   #callbacks registered with Subscribe
+        self.m_hSubscribersLock = threading.Lock()
+        self.m_bRunDispatcher = False
+        self.m_objDispatcherThread = None
+        self.m_hStateChanged = threading.Condition()    #notified on every event, used by WaitFor* methods
+        self.m_nSweepsProcessed = 0
+        self.m_objLastSweep = None
+        self.m_objLatestSweep = RFELatestSweep()
+        self.m_bLatestSweepOnly = False
+        self.m_nConfigsProcessed = 0
+        self.m_fConfigSettleSec = 0.0
         self.m_bHoldMode = False
         self.m_sDebugAllReceivedBytes = ""        #Debug string for all received bytes record.
         self.m_sRFExplorerFirmware = ""       #Detected firmware
@@ -242,10 +273,18 @@ class RFECommunicator(object):
         self.m_arrInputStageOffsetDB = [ 0.0, 30.0, -25.0, 60.0 ]   #Values used to compensate input stage data sent by device. 2.4G+ must never use this array as it internally adjust for LNA/Direct offset
         self.m_RFGenCal = RFE6GEN_CalibrationData()
         self.m_FileAmplitudeCalibration = RFEAmplitudeTableData()   #This variable contains the latest correction file loaded
-        self.m_SweepDataContainer = RFESweepDataCollection(100 * 1024, True)
-        self.m_objQueue = queue.Queue()
-        self.m_objThread = ReceiveSerialThread(self, self.m_objQueue, self.m_objSerialPort, self.m_hQueueLock, self.m_hSerialPortLock)
-        self.m_objThread.start()
+        self.m_SweepDataContainer = RFESweepDataCollection(RFE_Common.CONST_SWEEP_DATA_INITIAL_SWEEPS, True)
+        self.m_objQueue = RFEReceiveQueue()
+        self.m_objDeviceManager = objDeviceManager
+        self.m_objThread = ReceiveSerialThread(self, self.m_objQueue, self.m_objSerialPort, self.m_hSerialPortLock)
+        if (self.m_objDeviceManager):
+            #the manager thread reads the port and uses this thread object only to frame and queue the received bytes
+            self.m_bRunReceiveThread = False
+        else:
+            self.m_objThread.start()
+        self.m_objCommandWriter = RFECommandWriter(self)
+        if (not self.m_objDeviceManager):
+            self.m_objCommandWriter.start()     #otherwise the manager starts it or writes the commands, see RFECommandWriter.Loop
 
     def __del__(self):
         #print("destructor called")
@@ -271,12 +310,69 @@ class RFECommunicator(object):
     def RunReceiveThread(self, value):
         self.m_bRunReceiveThread = value
 
+    @property
+    def ReadPolicy(self):
+        """Get/Set how the receive thread waits for data coming from the device, as a RFE_Common.eReadPolicy value.
+        LOW_LATENCY (default) processes bytes as soon as they arrive, LOW_CPU batches bytes for a few milliseconds 
+        to reduce wake ups and POLLING checks the port every 10ms as previous library versions did
+	    """
+        return self.m_eReadPolicy
+    @ReadPolicy.setter
+    def ReadPolicy(self, value):
+        self.m_eReadPolicy = value
+
     @property
     def SweepData(self):
         """The main and only data collection with all the Sweep accumulated data
 	    """
         return self.m_SweepDataContainer
 
+    @property
+    def Traces(self):
+        """RFETraceEngine with max hold, min hold, average and exponential moving average of the sweeps in SweepData, 
+        see ResetTraces. It is not updated in LatestSweepOnly mode
+	    """
+        return self.m_SweepDataContainer.Traces
+
+    @property
+    def SweepsProcessed(self):
+        """Total number of sweeps processed since the communicator was created, it is not reset when SweepData is 
+        cleaned. The index of the last sweep processed is SweepsProcessed - 1
+	    """
+        return self.m_nSweepsProcessed
+
+    @property
+    def SweepRate(self):
+        """RFESweepRateEstimator with the rolling sweep rate and transfer time of the sweeps processed, calculated from
+        the time their bytes were read from the port
+	    """
+        return self.m_objSweepRate
+
+    @property
+    def AverageSweepTime(self):
+        """Average seconds between the last sweeps processed, 0.0 if not known yet
+	    """
+        return self.m_objSweepRate.SweepTimeSec
+
+    @property
+    def LastSweep(self):
+        """Last RFESweepData processed, None if no sweep was processed yet
+	    """
+        return self.m_objLastSweep
+
+    @property
+    def LatestSweep(self):
+        """RFELatestSweep holding the last sweep processed, its Get can be called from any thread without locks
+	    """
+        return self.m_objLatestSweep
+
+    @property
+    def ConfigSettleSec(self):
+        """Seconds the last UpdateDeviceConfig took until the device confirmed the new configuration, or until the 
+        timeout expired if it was not confirmed
+	    """
+        return self.m_fConfigSettleSec
+
     @property
     def IsResetEvent(self):
         """Reset string is detected. When is check in the get property, is set automatically to false. 
@@ -290,12 +386,15 @@ class RFECommunicator(object):
 
     @property
     def VerboseLevel(self):
-        """Debug trace level for print console messages 1-10 being 10 the most verbose
+        """Debug trace level for print console messages 1-10 being 10 the most verbose. Diagnostics of the receive 
+        pipeline are sent to the "RFExplorer" loggers, levels above 4 print them in the console for all communicators,
+        see RFELogging.SetVerboseLevel
 	    """
         return self.m_nVerboseLevel
     @VerboseLevel.setter
     def VerboseLevel(self, value):
         self.m_nVerboseLevel = value
+        RFELogging.SetVerboseLevel(value)
 
     @property
     def Calculator(self):
@@ -321,6 +420,19 @@ class RFECommunicator(object):
     def UseStringBLO(self, value):
         self.m_bUseStringBLOB = value
 
+    @property
+    def UseNumPy(self):
+        """Get/Set if received sweeps are decoded with NumPy into float32 arrays, available with RFESweepData.AmplitudeArray.
+        It is enabled by default when NumPy is installed and cannot be enabled otherwise
+	    """
+        return self.m_bUseNumPy
+    @UseNumPy.setter
+    def UseNumPy(self, value):
+        if (value and not RFESweepData.IsNumPyAvailable()):
+            g_objCommunicatorLog.warning("NumPy is not available, sweeps will be decoded without it")
+            value = False
+        self.m_bUseNumPy = value
+
     @property
     def PortConnected(self):
         """Will be True while COM port is connected, as Serial.IsOpen() is not reliable
@@ -330,6 +442,72 @@ class RFECommunicator(object):
     def PortConnected(self, value):       
         self.m_bPortConnected = value
 
+    @property
+    def StreamRecorder(self):
+        """RFEStreamRecorder object storing the raw byte stream exchanged with the device, None if not recording.
+        Use StartRecording and StopRecording to control it
+		"""
+        return self.m_objStreamRecorder
+
+    @property
+    def StatsEnabled(self):
+        """Get/Set True to measure every stage of the receive pipeline, see Stats. False by default, as it adds several 
+        clock reads and histogram updates to every read, frame and sweep
+		"""
+        return self.m_bStatsEnabled
+    @StatsEnabled.setter
+    def StatsEnabled(self, value):
+        self.m_bStatsEnabled = value
+
+    @property
+    def PipelineStats(self):
+        """RFEPipelineStats object updated by the receive thread and the consumer, None if StatsEnabled is False
+		"""
+        return self.m_objStats if self.m_bStatsEnabled else None
+
+    @property
+    def ReceiveQueue(self):
+        """RFEReceiveQueue with the objects received and not processed yet. Use its Capacity and OverflowPolicy to limit
+        the sweeps kept when they are not processed fast enough, and SweepsDropped and Overflows to know how many were lost
+		"""
+        return self.m_objQueue
+
+    @property
+    def DeviceManager(self):
+        """RFEDeviceManager reading the port of this device, None if it uses a dedicated receive thread
+		"""
+        return self.m_objDeviceManager
+
+    @property
+    def DeviceCache(self):
+        """Get/Set the RFEDeviceCache used to reconnect faster to known devices, None to not use a cache. With a cache, 
+        ConnectPort accepts known ports without GetConnectedPorts, requests the serial number and restores the 
+        internal calibration data stored for the device instead of requesting it again
+        """
+        return self.m_objDeviceCache
+    @DeviceCache.setter
+    def DeviceCache(self, value):
+        self.m_objDeviceCache = value
+
+    @property
+    def IsDispatcherRunning(self):
+        """True while the dispatcher thread started with StartDispatcher is processing received data
+		"""
+        return self.m_objDispatcherThread is not None
+
+    @property
+    def CommandWriter(self):
+        """RFECommandWriter thread writing all commands sent with SendCommand, with counters of commands written, 
+        batched and coalesced
+		"""
+        return self.m_objCommandWriter
+
+    @property
+    def IsReplay(self):
+        """True if connected to a recorded stream with ConnectReplayFile instead of a device
+		"""
+        return isinstance(self.m_objSerialPort, RFEStreamReplayPort)
+
     @property
     def DebugAllReceivedBytes(self):
         """Debug string collection for all bytes received from device
@@ -358,7 +536,16 @@ class RFECommunicator(object):
     def SweepInfoText(self):
         """Human readable text with time of last capture as well as average sweep time and sweeps / second
 		"""
-        return self.m_sSweepInfoText
+        objSweep = self.m_objLastSweep
+        if (objSweep is None):
+            return ""
+        sSweepInfoText = "Captured:" + str(objSweep.CaptureTime) + " - Data points:" + str(objSweep.TotalSteps)
+        fSweepTime = self.m_objSweepRate.SweepTimeSec
+        if (fSweepTime > 0.0):
+            sSweepInfoText += "\nSweep time: " + "{0:.6f}".format(fSweepTime) + " seconds"
+            if (fSweepTime < 1.0):
+                sSweepInfoText += " - Avg Sweeps/second: " + "{0:.3f}".format(1.0 / fSweepTime) #add this only for fast, short duration scans
+        return sSweepInfoText
 
     #Initializer for 433MHz model, will change later based on settings  
     @property
@@ -747,6 +934,16 @@ class RFECommunicator(object):
     @StoreSweep.setter
     def StoreSweep(self, value):      
         self.m_bStoreSweep = value
+
+    @property
+    def LatestSweepOnly(self):
+        """Get/Set True to only keep the last sweep processed, in LastSweep and LatestSweep, without adding sweeps to 
+        the SweepData collection. It has no per sweep cost for applications which only show the newest trace
+		"""
+        return self.m_bLatestSweepOnly
+    @LatestSweepOnly.setter
+    def LatestSweepOnly(self, value):
+        self.m_bLatestSweepOnly = value
     
     @property
     def ThresholdDBM(self):
@@ -857,382 +1054,648 @@ class RFECommunicator(object):
 
         if(self.m_bPortConnected):
             try:     
-                nCount = 1   
-                while(bProcessAllEvents and nCount > 0):
-                    bWrongFormat = False
-                    objNew = None
-                    try:
-                        self.m_hQueueLock.acquire() 
-                        nCount = self.m_objQueue.qsize()
-                        if (nCount == 0): 
-                            break
-                        objNew = self.m_objQueue.get_nowait()                       
-                    except Exception as obEx:
-                        if self.m_nVerboseLevel>0: 
-                            print("m_arrReceivedStrings processing: " + str(obEx))
-                    finally:
-                        self.m_hQueueLock.release()
-
-                    if (isinstance(objNew, RFEConfiguration)):
-                        objConfiguration = objNew
-                        if self.m_nVerboseLevel>4: 
-                            print("Received configuration: " + objConfiguration.LineString)
-
-                        if (self.IsGenerator()):
-                            #it is a signal generator
-                            if (self.m_RFGenCal.GetCalSize() < 0):
-                                #request internal calibration data, if available
-                                if (self.m_nRetriesCalibration < 3):
-                                    self.SendCommand("Cq")
-                                    self.m_nRetriesCalibration += 1
-                            #signal generator
-                            self.m_eMode = objConfiguration.Mode
-                            self.m_bRFGenPowerON = objConfiguration.bRFEGenPowerON
-                            if (self.m_eMode == RFE_Common.eMode.MODE_GEN_CW):
-                                self.RFGenCWFrequencyMHZ = objConfiguration.fRFEGenCWFreqMHZ
-                                self.RFGenStepFrequencyMHZ = objConfiguration.fStepMHZ
-                                if (self.m_bExpansionBoardActive):
-                                    #Fix to 0.25 multiple, as the code coming from RFGEN is not including last char and miss 0.25 or 0.75 and would display as 0.20 or 0.70
-                                    fDecimal = math.fabs(objConfiguration.fRFEGenExpansionPowerDBM - math.trunc(objConfiguration.fRFEGenExpansionPowerDBM))
-                                    if (fDecimal > 0.01):
-                                        if ((fDecimal - 0.2) < 0.01):
-                                            fDecimal = 0.25
-                                        elif ((fDecimal - 0.5) < 0.01):
-                                            pass #nothing to adjust
-                                        elif ((fDecimal - 0.7) < 0.01):
-                                            fDecimal = 0.75
-                                    if (objConfiguration.fRFEGenExpansionPowerDBM < 0):
-                                        self.RFGenExpansionPowerDBM = math.trunc(objConfiguration.fRFEGenExpansionPowerDBM) - fDecimal
-                                    else:
-                                        self.RFGenExpansionPowerDBM = math.trunc(objConfiguration.fRFEGenExpansionPowerDBM) + fDecimal
-                                else:
-                                    self.RFGenPowerLevel = objConfiguration.nRFEGenPowerLevel
-                                    self.RFGenHighPowerSwitch = objConfiguration.bRFEGenHighPowerSwitch
-
-                            elif(self.m_eMode == RFE_Common.eMode.MODE_GEN_SWEEP_FREQ):
-                                self.RFGenStartFrequencyMHZ = objConfiguration.fStartMHZ
-                                self.RFGenStepFrequencyMHZ = objConfiguration.fStepMHZ
-                                self.RFGenSweepSteps = objConfiguration.FreqSpectrumSteps
-                                self.RFGenStopFrequencyMHZ = self.RFGenStartFrequencyMHZ + self.RFGenSweepSteps * self.RFGenStepFrequencyMHZ
-                                if (self.m_bExpansionBoardActive):
-                                    self.RFGenExpansionPowerDBM = objConfiguration.fRFEGenExpansionPowerDBM
-                                else:
-                                    self.RFGenPowerLevel = objConfiguration.nRFEGenPowerLevel
-                                    self.RFGenHighPowerSwitch = objConfiguration.bRFEGenHighPowerSwitch
-                                self.RFGenStepWaitMS = objConfiguration.nRFEGenSweepWaitMS
-                            elif(self.m_eMode == RFE_Common.eMode.MODE_GEN_SWEEP_AMP):
-                                self.RFGenCWFrequencyMHZ = objConfiguration.fRFEGenCWFreqMHZ
-                                self.RFGenStepWaitMS = objConfiguration.nRFEGenSweepWaitMS
-                                if (self.m_bExpansionBoardActive):
-                                    self.RFGenExpansionPowerStepDB = objConfiguration.fRFEGenExpansionPowerStepDBM
-                                    self.RFGenExpansionPowerStartDBM = objConfiguration.fRFEGenExpansionPowerStartDBM
-                                    self.RFGenExpansionPowerStopDBM = objConfiguration.fRFEGenExpansionPowerStopDBM
-                                else:
-                                    self.RFGenStartHighPowerSwitch = objConfiguration.bRFEGenStartHighPowerSwitch
-                                    self.RFGenStartPowerLevel = objConfiguration.nRFEGenStartPowerLevel
-                                    self.RFGenStopHighPowerSwitch = objConfiguration.bRFEGenStopHighPowerSwitch
-                                    self.RFGenStopPowerLevel = objConfiguration.nRFEGenStopPowerLevel
-                            elif(self.m_eMode == RFE_Common.eMode.MODE_NONE):
-                                if (objConfiguration.fStartMHZ > 0):
-                                    #if RFE_Common.eMode.MODE_NONE and fStartMHZ has some meaningful value, it means
-                                    #we are receiving a C3-* full status update
-                                    self.RFGenCWFrequencyMHZ = objConfiguration.fRFEGenCWFreqMHZ
-                                    self.RFGenHighPowerSwitch = objConfiguration.bRFEGenHighPowerSwitch
-                                    self.RFGenStartFrequencyMHZ = objConfiguration.fStartMHZ
-                                    self.RFGenStepFrequencyMHZ = objConfiguration.fStepMHZ
-                                    self.RFGenSweepSteps = objConfiguration.FreqSpectrumSteps
-                                    self.RFGenStopFrequencyMHZ = self.RFGenStartFrequencyMHZ + self.RFGenSweepSteps * self.RFGenStepFrequencyMHZ
-                                    self.RFGenStepWaitMS = objConfiguration.nRFEGenSweepWaitMS
-                                    if (self.m_bExpansionBoardActive):
-                                        self.RFGenExpansionPowerDBM = objConfiguration.fRFEGenExpansionPowerDBM
-                                        self.RFGenExpansionPowerStepDB = objConfiguration.fRFEGenExpansionPowerStepDBM
-                                        self.RFGenExpansionPowerStartDBM = objConfiguration.fRFEGenExpansionPowerStartDBM
-                                        self.RFGenExpansionPowerStopDBM = objConfiguration.fRFEGenExpansionPowerStopDBM
-                                    else:
-                                        self.RFGenPowerLevel = objConfiguration.nRFEGenPowerLevel
-                                        self.RFGenStartHighPowerSwitch = objConfiguration.bRFEGenStartHighPowerSwitch
-                                        self.RFGenStartPowerLevel = objConfiguration.nRFEGenStartPowerLevel
-                                        self.RFGenStopHighPowerSwitch = objConfiguration.bRFEGenStopHighPowerSwitch
-                                        self.RFGenStopPowerLevel = objConfiguration.nRFEGenStopPowerLevel
-                                else:
-                                    print("Unknown Signal Generator configuration received")
-
-                            else:
-                                pass
-
-                            self.MaxFreqMHZ = RFE_Common.CONST_RFGEN_MAX_FREQ_MHZ
-                            if (self.m_bExpansionBoardActive):
-                                self.m_eActiveModel = self.m_eExpansionBoardModel
-                                self.MinFreqMHZ = RFE_Common.CONST_RFGENEXP_MIN_FREQ_MHZ
-                            else:
-                                self.m_eActiveModel = self.m_eMainBoardModel
-                                self.MinFreqMHZ = RFE_Common.CONST_RFGEN_MIN_FREQ_MHZ
+                while(True):
+                    #the queue is thread safe, take everything waiting at once instead of locking once per object
+                    arrObjects = self.m_objQueue.get_many(0 if bProcessAllEvents else 1, block=False)
+                    if (not arrObjects):
+                        break
+                    for objNew in arrObjects:
+                        bNewDraw, sNewString = self.ProcessReceivedObject(objNew)
+                        bDraw = bDraw or bNewDraw
+                        if (sNewString):
+                            sReceivedString = sNewString
+                    if (not bProcessAllEvents):
+                        break
+            except Exception as obEx:
+                #print("ProcessReceivedString: " + sReceivedString + '\n' + str(obEx))
+                g_objCommunicatorLog.error("ProcessReceivedString: %s", obEx)
+
+        return bDraw, sReceivedString
+
+    def ProcessReceivedObject(self, objNew):
+        """Processes one object received and queued by the ReceiveThreadFunc, updating the communicator state and 
+        notifying the subscribers of the matching RFE_Common.eEvent
+
+        Parameters:
+            objNew -- Object taken from the queue, a string, RFEConfiguration or RFESweepData
+        Returns:
+            Boolean Returns true if the object requires redraw
+            String the processed string, empty if objNew is not a string
+		"""
+        bDraw = False
+        sReceivedString = ""
+        bWrongFormat = False
+        objStats = self.PipelineStats
+        if (objStats):
+            nStartNS = time.perf_counter_ns()
+            if (isinstance(objNew, RFESweepData) and objNew.m_nQueuedNS):
+                objStats.AddQueueWait(time.monotonic_ns() - objNew.m_nQueuedNS)
+
+        if (isinstance(objNew, RFEConfiguration)):
+            objConfiguration = objNew
+            g_objCommunicatorLog.info("Received configuration: %s", objConfiguration.LineString)
+
+            if (self.IsGenerator()):
+                #it is a signal generator
+                if (self.m_RFGenCal.GetCalSize() < 0):
+                    #request internal calibration data, if available
+                    if (self.m_nRetriesCalibration < RFE_Common.CONST_MAX_RETRIES_CALIBRATION):
+                        self.SendCommand("Cq")
+                        self.m_nRetriesCalibration += 1
+                #signal generator
+                self.m_eMode = objConfiguration.Mode
+                self.m_bRFGenPowerON = objConfiguration.bRFEGenPowerON
+                if (self.m_eMode == RFE_Common.eMode.MODE_GEN_CW):
+                    self.RFGenCWFrequencyMHZ = objConfiguration.fRFEGenCWFreqMHZ
+                    self.RFGenStepFrequencyMHZ = objConfiguration.fStepMHZ
+                    if (self.m_bExpansionBoardActive):
+                        #Fix to 0.25 multiple, as the code coming from RFGEN is not including last char and miss 0.25 or 0.75 and would display as 0.20 or 0.70
+                        fDecimal = math.fabs(objConfiguration.fRFEGenExpansionPowerDBM - math.trunc(objConfiguration.fRFEGenExpansionPowerDBM))
+                        if (fDecimal > 0.01):
+                            if ((fDecimal - 0.2) < 0.01):
+                                fDecimal = 0.25
+                            elif ((fDecimal - 0.5) < 0.01):
+                                pass #nothing to adjust
+                            elif ((fDecimal - 0.7) < 0.01):
+                                fDecimal = 0.75
+                        if (objConfiguration.fRFEGenExpansionPowerDBM < 0):
+                            self.RFGenExpansionPowerDBM = math.trunc(objConfiguration.fRFEGenExpansionPowerDBM) - fDecimal
                         else:
-                            #it is an spectrum analyzer
-                            if (self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB):
-                                #request internal calibration data, if available
-                                if (self.m_nRetriesCalibration < 3):
-                                    self.SendCommand("Cq")
-                                    if (self.m_objSerialPort.baudrate < 115200):
-                                        time.sleep(0.2)
-                                    self.m_nRetriesCalibration += 1
-
-                            self.m_eMode = objConfiguration.Mode
-
-                            if (self.m_eMode != RFE_Common.eMode.MODE_SNIFFER):
-                                if ((math.fabs(self.StartFrequencyMHZ - objConfiguration.fStartMHZ) >= 0.001) or 
-                                        (math.fabs(self.StepFrequencyMHZ - objConfiguration.fStepMHZ) >= 0.001)):
-                                    self.StartFrequencyMHZ = objConfiguration.fStartMHZ
-                                    self.StepFrequencyMHZ = objConfiguration.fStepMHZ
-                                    if (self.m_nVerboseLevel>4): 
-                                        print("New Freq range - buffer cleared.")
-                                self.AmplitudeTopDBM = objConfiguration.fAmplitudeTopDBM
-                                self.AmplitudeBottomDBM = objConfiguration.fAmplitudeBottomDBM
-                                self.FreqSpectrumSteps = objConfiguration.FreqSpectrumSteps
-                            self.m_bExpansionBoardActive = objConfiguration.bExpansionBoardActive
-                            if (self.m_bExpansionBoardActive):
-                                self.m_eActiveModel = self.m_eExpansionBoardModel
-                            else:
-                                self.m_eActiveModel = self.m_eMainBoardModel
-
-                            if ((self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB3G) or self.IsMainboardAnalyzerPlus):
-                                #If it is a MODEL_WSUB3G, make sure we use the MAX HOLD mode to account for proper DSP
-                                self.m_eCalculator = objConfiguration.eCalculator
-                                time.sleep(0.5) 
-                                if (self.m_bUseMaxHold):
-                                    if (self.m_eCalculator != RFE_Common.eCalculator.MAX_HOLD):
-                                        print("Updated remote mode to Max Hold for reliable DSP calculations with fast signals")
-                                        self.SendCommand_SetMaxHold()
-                                else:
-                                    if (self.m_eCalculator == RFE_Common.eCalculator.MAX_HOLD):
-                                        print("Remote mode is not Max Hold, some fast signals may not be detected")
-                                        self.SendCommand_Realtime()
-
-                            if (objConfiguration.Mode == RFE_Common.eMode.MODE_SNIFFER):
-                                self.m_nBaudrate = objConfiguration.nBaudrate
-                                self.m_fThresholdDBM = objConfiguration.fThresholdDBM
-                                self.m_fRefFrequencyMHZ = objConfiguration.fStartMHZ
-                            else:
-                                #spectrum analyzer
-                                if ((math.fabs(self.StartFrequencyMHZ - objConfiguration.fStartMHZ) >= 0.001) or
-                                        (math.fabs(self.StepFrequencyMHZ - objConfiguration.fStepMHZ) >= 0.001)):
-                                    self.StartFrequencyMHZ = objConfiguration.fStartMHZ
-                                    self.StepFrequencyMHZ = objConfiguration.fStepMHZ
-                                    print("New Freq range - buffer cleared.")
-                                self.AmplitudeTopDBM = objConfiguration.fAmplitudeTopDBM
-                                self.AmplitudeBottomDBM = objConfiguration.fAmplitudeBottomDBM
-                                self.FreqSpectrumSteps = objConfiguration.FreqSpectrumSteps
-                                if (self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB3G):
-                                    #If it is a MODEL_WSUB3G, make sure we use the MAX HOLD mode to account for proper DSP
-                                    self.m_eCalculator = objConfiguration.eCalculator
-                                    time.sleep(0.5)
-                                    if (self.m_bUseMaxHold):
-                                        if (self.m_eCalculator != RFE_Common.eCalculator.MAX_HOLD):
-                                            print("Updated remote mode to Max Hold for reliable DSP calculations with fast signals")
-                                            self.SendCommand_SetMaxHold()
-                                    else:
-                                        if (self.m_eCalculator == RFE_Common.eCalculator.MAX_HOLD):
-                                            print("Remote mode is not Max Hold, some fast signals may not be detected")
-                                            self.SendCommand_Realtime()
-
-                                self.MinFreqMHZ = objConfiguration.fMinFreqMHZ
-                                self.MaxFreqMHZ = objConfiguration.fMaxFreqMHZ
-                                self.MaxSpanMHZ = objConfiguration.fMaxSpanMHZ
-
-                                self.m_fOffset_dB = objConfiguration.fOffset_dB
-                                self.m_fRBWKHZ = objConfiguration.fRBWKHZ
-                                self.FreqSpectrumSteps = objConfiguration.FreqSpectrumSteps
-
-                                if ((self.m_eActiveModel == RFE_Common.eModel.MODEL_2400)
-                                        or (self.m_eActiveModel == RFE_Common.eModel.MODEL_6G)):
-                                    self.MinSpanMHZ = 2.0
-                                else:
-                                    if (self.FreqSpectrumSteps <= RFE_Common.CONST_RFE_MIN_SWEEP_POINTS):
-                                        self.MinSpanMHZ = RFE_Common.CONST_RFE_MIN_SWEEP_POINTS
-                                    else:
-                                        self.MinSpanMHZ = 0.001 * self.FreqSpectrumSteps
-                            if(self.AutoCleanConfig):
-                                #print("count before clean:(ProcessReceivedString): " + str(self.m_SweepDataContainer.Count))
-                                self.m_SweepDataContainer.CleanAll()
-                                #print("count after clean:(ProcessReceivedString): " + str(self.m_SweepDataContainer.Count))
-                    #Check if Sweep data case
-                    elif (isinstance(objNew, RFESweepData)):
-                        if (self.m_eMode != RFE_Common.eMode.MODE_TRACKING):
-                            if (not self.m_bHoldMode):
-                                objSweep = objNew
-                                if (not self.m_bStoreSweep):
-                                    self.m_SweepDataContainer.CleanAll()
-                                self.m_SweepDataContainer.Add(objSweep)
-                                #print("Added sweep " + str(self.m_SweepDataContainer.Count))
-
-                                bDraw = True
-                                if (self.m_SweepDataContainer.IsFull()):
-                                    self.m_bHoldMode = True
-                                    print("RAM Buffer is full.")
-                                self.m_sSweepInfoText = "Captured:" + str(objSweep.CaptureTime) + " - Data points:" + str(objSweep.TotalSteps)
-                                objSpan = objSweep.CaptureTime - self.m_LastCaptureTime  
-                                if (objSpan.seconds < 60):
-                                    #if time between captures is less than 60
-                                    #seconds, we can assume we are getting
-                                    #realtime data
-                                    #and therefore can provide average
-                                    #sweep/seconds information, otherwise we
-                                    #were in hold or something
-                                    #and data could not be used for these
-                                    #calculations.
-                                    self.m_nAverageSweepSpeedIterator += 1
-                                    self.m_spanAverageSpeedAcumulator += (objSweep.CaptureTime - self.m_LastCaptureTime)
-                                    if (self.m_fAverageSweepTime > 0.0):
-                                        self.m_sSweepInfoText += "\nSweep time: " + str(self.m_fAverageSweepTime) + " seconds"
-                                        if (self.m_fAverageSweepTime < 1.0):
-                                            self.m_sSweepInfoText += " - Avg Sweeps/second: " + str((1.0 / self.m_fAverageSweepTime)) #add this only for fast, short duration scans
-                                    if (self.m_nAverageSweepSpeedIterator >= 10):
-                                        self.m_fAverageSweepTime = self.m_spanAverageSpeedAcumulator.seconds / self.m_nAverageSweepSpeedIterator
-                                        self.m_nAverageSweepSpeedIterator = 0
-                                        self.m_spanAverageSpeedAcumulator = self.m_LastCaptureTime - self.m_LastCaptureTime #set it to zero and start average all over again
-                                self.m_LastCaptureTime = objSweep.CaptureTime
-                            else:
-                                #if in hold mode, we just record last time came
-                                #here to make sure we start from most reliable
-                                #point in time
-                                self.m_LastCaptureTime = datetime.now()  
-                    #Nothing specific, so just consider individual cases
+                            self.RFGenExpansionPowerDBM = math.trunc(objConfiguration.fRFEGenExpansionPowerDBM) + fDecimal
+                    else:
+                        self.RFGenPowerLevel = objConfiguration.nRFEGenPowerLevel
+                        self.RFGenHighPowerSwitch = objConfiguration.bRFEGenHighPowerSwitch
+
+                elif(self.m_eMode == RFE_Common.eMode.MODE_GEN_SWEEP_FREQ):
+                    self.RFGenStartFrequencyMHZ = objConfiguration.fStartMHZ
+                    self.RFGenStepFrequencyMHZ = objConfiguration.fStepMHZ
+                    self.RFGenSweepSteps = objConfiguration.FreqSpectrumSteps
+                    self.RFGenStopFrequencyMHZ = self.RFGenStartFrequencyMHZ + self.RFGenSweepSteps * self.RFGenStepFrequencyMHZ
+                    if (self.m_bExpansionBoardActive):
+                        self.RFGenExpansionPowerDBM = objConfiguration.fRFEGenExpansionPowerDBM
                     else:
-                        sLine = str(objNew)
-                        sReceivedString = sLine
-                        if ((len(sLine) > 3) and (sLine[:4] == RFE_Common.CONST_ACKNOWLEDGE)):
-                            self.m_bAcknowledge = True
-                        elif ((len(sLine) > 4) and (sLine[:4] == "DSP:")):
-                            self.m_eDSP = RFE_Common.eDSP(int(sLine[4:5]))
-                            print("DSP mode: " + str(self.m_eDSP))
-                        elif ((len(sLine) > 16) and (sLine[:3] == "#Sn")):
-                            self.m_sSerialNumber = sLine[3:19]
-                            print("Device serial number: " + self.m_sSerialNumber)
-                        elif ((len(sLine) > 16) and (sLine[:3] == "#Se")):
-                            self.m_sExpansionSerialNumber = sLine[3:19]
-                            print("Expansion serial number: " + self.m_sExpansionSerialNumber)
-                        elif ((len(sLine) > 2) and ((sLine[:2] == "$q") or (sLine[:2] == "$Q"))):
-                            #calibration data
-                            nSourceStringSize = ord(sLine[2])
-                            if (sLine[1] == 'Q'):
-                                nSourceStringSize += int(ord(0x100 * sLine[3]))
-
-                            if (self.IsGenerator()):
-		                        #signal generator uses a different approach for storing absolute amplitude value offset over an ideal -30dBm response
-                                if ((self.m_RFGenCal.GetCalSize() < 0) or (self.m_RFGenCal.GetCalSize() != nSourceStringSize)):
-                                    sData = self.m_RFGenCal.InitializeCal(nSourceStringSize, sLine)
-                                    print("Embedded calibration Signal Generator data received: " + sData, True)
-                            elif (self.m_eActiveModel == RFE_Common.eModel.MODEL_6G or self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G or self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G_PLUS or self.IsMWSUB3G):
-                                sData = "Embedded calibration Spectrum Analyzer data received:"
-                                bAllZero = True
-                                nStartPositionCalData = 0
-                                nStopPositionCalData = nSourceStringSize
-                                if(self.m_eActiveModel == RFE_Common.eModel.MODEL_6G):
-                                    nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_6G
-                                elif(self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G):
-                                    nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_WSUB1G
-                                    nStopPositionCalData = RFE_Common.CONST_POS_END_INTERNAL_CALIBRATED_WSUB1G
-                                elif(self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G_PLUS):
-                                    nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_WSUB1G_PLUS
-                                    nStopPositionCalData = RFE_Common.CONST_POS_END_INTERNAL_CALIBRATED_WSUB1G_PLUS
-                                elif(self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB3G):
-                                    nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_MWSUB3G
-
-                                if ((self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB) or (len(self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB) != (nStopPositionCalData - nStartPositionCalData))):
-                                    self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB = [0] * (nStopPositionCalData - nStartPositionCalData)
-                                    
-                                nAdjustSize = 3
-                                if (sLine[1] == 'Q'):
-                                    nAdjustSize = 4 #this accounts for extra byte sent in $Q for size
-                                nInd2 = 0
-                                for nInd in range(nStartPositionCalData, nStopPositionCalData):
-                                    if (((nInd2 % 16) == 0) and not(sData.endswith('\n'))):
-                                        sData += '\n'
-                                        nInd2 = 0
-                                    elif (self.IsMWSUB3G and ((nInd % 81) == 0) and not(sData.endswith('\n'))):
-                                        sData += '\n'
-                                        nInd2 = 0
-
-                                    nVal = ord(sLine[nInd + nAdjustSize])
-                                    if (nVal > 127):
-                                        nVal = -(256 - nVal)  #get the right sign
-                                    if (nVal != 0):
-                                        bAllZero = False
-                                    self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB[nInd - nStartPositionCalData] = nVal / 2.0 #split by two to get dB
-                                    sData += '{:04.1f}'.format(self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB[nInd - nStartPositionCalData])
-                                    if (nInd < nStopPositionCalData - 1):
-                                        sData += ","
-                                    nInd2 += 1
-                                sData += '\n'
-                                print(sData)
-                                if (bAllZero):
-                                    print("ERROR: the device internal calibration data is missing! contact support at www.rf-explorer.com/contact")
-                        elif ((len(sLine) > 5) and sLine[:6] == "#C2-M:"):
-                            print("Received RF Explorer device model info:" + sLine)
-                            self.m_eMainBoardModel = RFE_Common.eModel(int(sLine[6:9]))
-                            if (self.m_eMainBoardModel == RFE_Common.eModel.MODEL_AUDIOPRO):
-                                self.m_bAudioPro = True
-                                self.m_eMainBoardModel = RFE_Common.eModel.MODEL_WSUB3G
-                                if (self.m_nVerboseLevel > 1): 
-                                    print("Audio Pro model found, converted to MWSUB3G")
-                            self.m_eExpansionBoardModel = RFE_Common.eModel(int(sLine[10:13]))
-                            self.m_sRFExplorerFirmware = sLine[14:19]
-                        elif ((len(sLine) > 5) and sLine[:6] == "#C3-M:"):
-                            print("Received RF Explorer Generator device info:" + sLine)
-                            self.m_eMainBoardModel = RFE_Common.eModel(int(sLine[6:9]))
-                            self.m_eExpansionBoardModel = RFE_Common.eModel(int(sLine[10:13]))
-                            self.m_bExpansionBoardActive = (self.m_eExpansionBoardModel == RFE_Common.eModel.MODEL_RFGEN_EXPANSION)
-                            self.m_sRFExplorerFirmware = sLine[14:19]
-                        elif ((len(sLine) > 6) and sLine[:5] == "#CAL:"):
-                            self.m_bMainboardInternalCalibrationAvailable = (sLine[5] == '1')
-                            self.m_bExpansionBoardInternalCalibrationAvailable = (sLine[6] == '1')
-                        elif ((len(sLine) > 18) and (sLine[:18] == RFE_Common.CONST_RESETSTRING)):
-                            #RF Explorer device was reset for some reason, reconfigure client based on new configuration
-                            self.m_bIsResetEvent = True
-                        elif ((len(sLine) > 2) and sLine.startswith("#a")):
-                            ePreviousInputSatge = self.m_eInputStage
-                            nNewStage = RFE_Common.eInputStage(int(sLine[2]))
-                            if (nNewStage.value < RFE_Common.eInputStage.Attenuator_60dB.value):
-                                self.m_eInputStage = nNewStage
-                                if ((self.m_eInputStage is RFE_Common.eInputStage.LNA_25dB) and (self.m_eActiveModel is RFE_Common.eModel.MODEL_2400_PLUS)):
-                                    self.m_eInputStage = RFE_Common.eInputStage.LNA_12dB; #2.4G+ has 12dB LNA, not 25dB
-                                if(self.m_eInputStage != ePreviousInputSatge):
-                                    print("Input stage changed to " + str(self.m_eInputStage.name))
-                            else:
-                                print("ERROR: Received invalid input stage " + str(nNewStage))
-
-                        elif ((len(sLine) > 3) and sLine.startswith("#C+")):
-                                #Get device replay when calculator mode is set by software and update it
-                                self.UpdateCalculatorMode(RFE_Common.eCalculator(int(sLine[3])), False)
-                                print("Calculator mode changed to " + str(self.m_eCalculator.name))
-                        elif ((len(sLine) >= 5) and (sLine.startswith("$Cc") or (sLine.startswith("$Cd")))):
-                            pass 
-                        elif ((len(sLine) > 2) and (sLine[:2] == "$S") and (self.StartFrequencyMHZ > 0.1)):
-                            bWrongFormat = True
-                        elif ((len(sLine) > 5) and (sLine.startswith("#C4-F:"))):
-                            bWrongFormat = True     #parsed on the thread
-                        elif ((len(sLine) > 5) and (sLine[:6] == "#C2-F:")):
-                            bWrongFormat = True     #parsed on the thread
-                        elif ((len(sLine) > 5) and (sLine[:6] == "#C1-F:")):
-                            bWrongFormat = True     #obsolete firmware
+                        self.RFGenPowerLevel = objConfiguration.nRFEGenPowerLevel
+                        self.RFGenHighPowerSwitch = objConfiguration.bRFEGenHighPowerSwitch
+                    self.RFGenStepWaitMS = objConfiguration.nRFEGenSweepWaitMS
+                elif(self.m_eMode == RFE_Common.eMode.MODE_GEN_SWEEP_AMP):
+                    self.RFGenCWFrequencyMHZ = objConfiguration.fRFEGenCWFreqMHZ
+                    self.RFGenStepWaitMS = objConfiguration.nRFEGenSweepWaitMS
+                    if (self.m_bExpansionBoardActive):
+                        self.RFGenExpansionPowerStepDB = objConfiguration.fRFEGenExpansionPowerStepDBM
+                        self.RFGenExpansionPowerStartDBM = objConfiguration.fRFEGenExpansionPowerStartDBM
+                        self.RFGenExpansionPowerStopDBM = objConfiguration.fRFEGenExpansionPowerStopDBM
+                    else:
+                        self.RFGenStartHighPowerSwitch = objConfiguration.bRFEGenStartHighPowerSwitch
+                        self.RFGenStartPowerLevel = objConfiguration.nRFEGenStartPowerLevel
+                        self.RFGenStopHighPowerSwitch = objConfiguration.bRFEGenStopHighPowerSwitch
+                        self.RFGenStopPowerLevel = objConfiguration.nRFEGenStopPowerLevel
+                elif(self.m_eMode == RFE_Common.eMode.MODE_NONE):
+                    if (objConfiguration.fStartMHZ > 0):
+                        #if RFE_Common.eMode.MODE_NONE and fStartMHZ has some meaningful value, it means
+                        #we are receiving a C3-* full status update
+                        self.RFGenCWFrequencyMHZ = objConfiguration.fRFEGenCWFreqMHZ
+                        self.RFGenHighPowerSwitch = objConfiguration.bRFEGenHighPowerSwitch
+                        self.RFGenStartFrequencyMHZ = objConfiguration.fStartMHZ
+                        self.RFGenStepFrequencyMHZ = objConfiguration.fStepMHZ
+                        self.RFGenSweepSteps = objConfiguration.FreqSpectrumSteps
+                        self.RFGenStopFrequencyMHZ = self.RFGenStartFrequencyMHZ + self.RFGenSweepSteps * self.RFGenStepFrequencyMHZ
+                        self.RFGenStepWaitMS = objConfiguration.nRFEGenSweepWaitMS
+                        if (self.m_bExpansionBoardActive):
+                            self.RFGenExpansionPowerDBM = objConfiguration.fRFEGenExpansionPowerDBM
+                            self.RFGenExpansionPowerStepDB = objConfiguration.fRFEGenExpansionPowerStepDBM
+                            self.RFGenExpansionPowerStartDBM = objConfiguration.fRFEGenExpansionPowerStartDBM
+                            self.RFGenExpansionPowerStopDBM = objConfiguration.fRFEGenExpansionPowerStopDBM
                         else:
-                            try:
-                                print(sLine)  #report any line we don't understand - it is likely a human readable message
-                            except Exception as obEx:
-                                pass
-                        if (bWrongFormat):
-                            print("Received unexpected data from RFExplorer device:" + sLine)
-                            print("Please update your RF Explorer to a recent firmware version and")
-                            print("make sure you are using the latest version of RF Explorer for Windows.")
-                            print("Visit http://www.rf-explorer/download for latest firmware updates.")
+                            self.RFGenPowerLevel = objConfiguration.nRFEGenPowerLevel
+                            self.RFGenStartHighPowerSwitch = objConfiguration.bRFEGenStartHighPowerSwitch
+                            self.RFGenStartPowerLevel = objConfiguration.nRFEGenStartPowerLevel
+                            self.RFGenStopHighPowerSwitch = objConfiguration.bRFEGenStopHighPowerSwitch
+                            self.RFGenStopPowerLevel = objConfiguration.nRFEGenStopPowerLevel
+                    else:
+                        g_objCommunicatorLog.warning("Unknown Signal Generator configuration received")
 
+                else:
+                    pass
 
-            except Exception as obEx:
-                #print("ProcessReceivedString: " + sReceivedString + '\n' + str(obEx))
-                print("ProcessReceivedString: " + str(obEx))
+                self.MaxFreqMHZ = RFE_Common.CONST_RFGEN_MAX_FREQ_MHZ
+                if (self.m_bExpansionBoardActive):
+                    self.m_eActiveModel = self.m_eExpansionBoardModel
+                    self.MinFreqMHZ = RFE_Common.CONST_RFGENEXP_MIN_FREQ_MHZ
+                else:
+                    self.m_eActiveModel = self.m_eMainBoardModel
+                    self.MinFreqMHZ = RFE_Common.CONST_RFGEN_MIN_FREQ_MHZ
+            else:
+                #it is an spectrum analyzer
+                if (self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB):
+                    #request internal calibration data, if available
+                    if (self.m_nRetriesCalibration < RFE_Common.CONST_MAX_RETRIES_CALIBRATION):
+                        self.SendCommand("Cq")
+                        if (self.m_objSerialPort.baudrate < 115200):
+                            time.sleep(0.2)
+                        self.m_nRetriesCalibration += 1
+
+                self.m_eMode = objConfiguration.Mode
+
+                if (self.m_eMode != RFE_Common.eMode.MODE_SNIFFER):
+                    if ((math.fabs(self.StartFrequencyMHZ - objConfiguration.fStartMHZ) >= 0.001) or 
+                            (math.fabs(self.StepFrequencyMHZ - objConfiguration.fStepMHZ) >= 0.001)):
+                        self.StartFrequencyMHZ = objConfiguration.fStartMHZ
+                        self.StepFrequencyMHZ = objConfiguration.fStepMHZ
+                        g_objCommunicatorLog.info("New Freq range - buffer cleared.")
+                    self.AmplitudeTopDBM = objConfiguration.fAmplitudeTopDBM
+                    self.AmplitudeBottomDBM = objConfiguration.fAmplitudeBottomDBM
+                    self.FreqSpectrumSteps = objConfiguration.FreqSpectrumSteps
+                self.m_bExpansionBoardActive = objConfiguration.bExpansionBoardActive
+                if (self.m_bExpansionBoardActive):
+                    self.m_eActiveModel = self.m_eExpansionBoardModel
+                else:
+                    self.m_eActiveModel = self.m_eMainBoardModel
+
+                if ((self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB3G) or self.IsMainboardAnalyzerPlus):
+                    #If it is a MODEL_WSUB3G, make sure we use the MAX HOLD mode to account for proper DSP
+                    self.m_eCalculator = objConfiguration.eCalculator
+                    if (self.m_bUseMaxHold):
+                        if (self.m_eCalculator != RFE_Common.eCalculator.MAX_HOLD):
+                            g_objCommunicatorLog.info("Updated remote mode to Max Hold for reliable DSP calculations with fast signals")
+                            self.SendCommand_SetMaxHold()
+                    else:
+                        if (self.m_eCalculator == RFE_Common.eCalculator.MAX_HOLD):
+                            g_objCommunicatorLog.info("Remote mode is not Max Hold, some fast signals may not be detected")
+                            self.SendCommand_Realtime()
+
+                if (objConfiguration.Mode == RFE_Common.eMode.MODE_SNIFFER):
+                    self.m_nBaudrate = objConfiguration.nBaudrate
+                    self.m_fThresholdDBM = objConfiguration.fThresholdDBM
+                    self.m_fRefFrequencyMHZ = objConfiguration.fStartMHZ
+                else:
+                    #spectrum analyzer
+                    if ((math.fabs(self.StartFrequencyMHZ - objConfiguration.fStartMHZ) >= 0.001) or
+                            (math.fabs(self.StepFrequencyMHZ - objConfiguration.fStepMHZ) >= 0.001)):
+                        self.StartFrequencyMHZ = objConfiguration.fStartMHZ
+                        self.StepFrequencyMHZ = objConfiguration.fStepMHZ
+                        g_objCommunicatorLog.info("New Freq range - buffer cleared.")
+                    self.AmplitudeTopDBM = objConfiguration.fAmplitudeTopDBM
+                    self.AmplitudeBottomDBM = objConfiguration.fAmplitudeBottomDBM
+                    self.FreqSpectrumSteps = objConfiguration.FreqSpectrumSteps
+                    if (self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB3G):
+                        #If it is a MODEL_WSUB3G, make sure we use the MAX HOLD mode to account for proper DSP
+                        self.m_eCalculator = objConfiguration.eCalculator
+                        if (self.m_bUseMaxHold):
+                            if (self.m_eCalculator != RFE_Common.eCalculator.MAX_HOLD):
+                                g_objCommunicatorLog.info("Updated remote mode to Max Hold for reliable DSP calculations with fast signals")
+                                self.SendCommand_SetMaxHold()
+                        else:
+                            if (self.m_eCalculator == RFE_Common.eCalculator.MAX_HOLD):
+                                g_objCommunicatorLog.info("Remote mode is not Max Hold, some fast signals may not be detected")
+                                self.SendCommand_Realtime()
+
+                    self.MinFreqMHZ = objConfiguration.fMinFreqMHZ
+                    self.MaxFreqMHZ = objConfiguration.fMaxFreqMHZ
+                    self.MaxSpanMHZ = objConfiguration.fMaxSpanMHZ
+
+                    self.m_fOffset_dB = objConfiguration.fOffset_dB
+                    self.m_fRBWKHZ = objConfiguration.fRBWKHZ
+                    self.FreqSpectrumSteps = objConfiguration.FreqSpectrumSteps
 
+                    if ((self.m_eActiveModel == RFE_Common.eModel.MODEL_2400)
+                            or (self.m_eActiveModel == RFE_Common.eModel.MODEL_6G)):
+                        self.MinSpanMHZ = 2.0
+                    else:
+                        if (self.FreqSpectrumSteps <= RFE_Common.CONST_RFE_MIN_SWEEP_POINTS):
+                            self.MinSpanMHZ = RFE_Common.CONST_RFE_MIN_SWEEP_POINTS
+                        else:
+                            self.MinSpanMHZ = 0.001 * self.FreqSpectrumSteps
+                if(self.AutoCleanConfig):
+                    #print("count before clean:(ProcessReceivedString): " + str(self.m_SweepDataContainer.Count))
+                    self.m_SweepDataContainer.CleanAll()
+                    #print("count after clean:(ProcessReceivedString): " + str(self.m_SweepDataContainer.Count))
+            self.m_nConfigsProcessed += 1
+            self.NotifySubscribers(RFE_Common.eEvent.CONFIG, objConfiguration)
+        #Check if Sweep data case
+        elif (isinstance(objNew, RFESweepData)):
+            if (self.m_eMode != RFE_Common.eMode.MODE_TRACKING):
+                if (not self.m_bHoldMode):
+                    objSweep = objNew
+                    if (not self.m_bLatestSweepOnly):
+                        if (not self.m_bStoreSweep):
+                            self.m_SweepDataContainer.CleanAll()
+                        self.m_SweepDataContainer.Add(objSweep)
+                        #print("Added sweep " + str(self.m_SweepDataContainer.Count))
+                        if (self.m_SweepDataContainer.IsFull()):
+                            self.m_bHoldMode = True
+                            g_objCommunicatorLog.warning("RAM Buffer is full.")
+
+                    bDraw = True
+                    #intervals longer than 60 seconds are not real time data, the estimator restarts then
+                    self.m_objSweepRate.AddSweep(objSweep.FirstByteNS, objSweep.LastByteNS)
+                    self.m_objLastSweep = objSweep
+                    self.m_objLatestSweep.Publish(objSweep)
+                    self.m_nSweepsProcessed += 1
+                    if (objStats):
+                        objStats.AddLatency(time.monotonic_ns() - objSweep.LastByteNS)
+                    self.NotifySubscribers(RFE_Common.eEvent.SWEEP, objSweep)
+                else:
+                    #if in hold mode, the interval to the next sweep
+                    #processed must not be measured
+                    self.m_objSweepRate.Restart()
+        #Nothing specific, so just consider individual cases
+        else:
+            sLine = str(objNew)
+            sReceivedString = sLine
+            if ((len(sLine) > 3) and (sLine[:4] == RFE_Common.CONST_ACKNOWLEDGE)):
+                self.m_bAcknowledge = True
+                self.NotifySubscribers(RFE_Common.eEvent.ACK, sLine)
+            elif ((len(sLine) > 4) and (sLine[:4] == "DSP:")):
+                self.m_eDSP = RFE_Common.eDSP(int(sLine[4:5]))
+                g_objCommunicatorLog.info("DSP mode: %s", self.m_eDSP)
+            elif ((len(sLine) > 16) and (sLine[:3] == "#Sn")):
+                self.m_sSerialNumber = sLine[3:19]
+                g_objCommunicatorLog.info("Device serial number: %s", self.m_sSerialNumber)
+                self.RestoreCachedDevice()
+            elif ((len(sLine) > 16) and (sLine[:3] == "#Se")):
+                self.m_sExpansionSerialNumber = sLine[3:19]
+                g_objCommunicatorLog.info("Expansion serial number: %s", self.m_sExpansionSerialNumber)
+            elif ((len(sLine) > 2) and ((sLine[:2] == "$q") or (sLine[:2] == "$Q"))):
+                #calibration data
+                nSourceStringSize = ord(sLine[2])
+                if (sLine[1] == 'Q'):
+                    nSourceStringSize += int(ord(0x100 * sLine[3]))
+
+                if (self.IsGenerator()):
+		            #signal generator uses a different approach for storing absolute amplitude value offset over an ideal -30dBm response
+                    if ((self.m_RFGenCal.GetCalSize() < 0) or (self.m_RFGenCal.GetCalSize() != nSourceStringSize)):
+                        sData = self.m_RFGenCal.InitializeCal(nSourceStringSize, sLine)
+                        g_objCommunicatorLog.info("Embedded calibration Signal Generator data received: %s", sData)
+                elif (self.m_eActiveModel == RFE_Common.eModel.MODEL_6G or self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G or self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G_PLUS or self.IsMWSUB3G):
+                    sData = "Embedded calibration Spectrum Analyzer data received:"
+                    bAllZero = True
+                    nStartPositionCalData = 0
+                    nStopPositionCalData = nSourceStringSize
+                    if(self.m_eActiveModel == RFE_Common.eModel.MODEL_6G):
+                        nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_6G
+                    elif(self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G):
+                        nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_WSUB1G
+                        nStopPositionCalData = RFE_Common.CONST_POS_END_INTERNAL_CALIBRATED_WSUB1G
+                    elif(self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB1G_PLUS):
+                        nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_WSUB1G_PLUS
+                        nStopPositionCalData = RFE_Common.CONST_POS_END_INTERNAL_CALIBRATED_WSUB1G_PLUS
+                    elif(self.m_eActiveModel == RFE_Common.eModel.MODEL_WSUB3G):
+                        nStartPositionCalData = RFE_Common.CONST_POS_INTERNAL_CALIBRATED_MWSUB3G
+
+                    if ((self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB) or (len(self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB) != (nStopPositionCalData - nStartPositionCalData))):
+                        self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB = [0] * (nStopPositionCalData - nStartPositionCalData)
+
+                    nAdjustSize = 3
+                    if (sLine[1] == 'Q'):
+                        nAdjustSize = 4 #this accounts for extra byte sent in $Q for size
+                    nInd2 = 0
+                    for nInd in range(nStartPositionCalData, nStopPositionCalData):
+                        if (((nInd2 % 16) == 0) and not(sData.endswith('\n'))):
+                            sData += '\n'
+                            nInd2 = 0
+                        elif (self.IsMWSUB3G and ((nInd % 81) == 0) and not(sData.endswith('\n'))):
+                            sData += '\n'
+                            nInd2 = 0
+
+                        nVal = ord(sLine[nInd + nAdjustSize])
+                        if (nVal > 127):
+                            nVal = -(256 - nVal)  #get the right sign
+                        if (nVal != 0):
+                            bAllZero = False
+                        self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB[nInd - nStartPositionCalData] = nVal / 2.0 #split by two to get dB
+                        sData += '{:04.1f}'.format(self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB[nInd - nStartPositionCalData])
+                        if (nInd < nStopPositionCalData - 1):
+                            sData += ","
+                        nInd2 += 1
+                    sData += '\n'
+                    g_objCommunicatorLog.info("%s", sData)
+                    if (bAllZero):
+                        g_objCommunicatorLog.error("ERROR: the device internal calibration data is missing! contact support at www.rf-explorer.com/contact")
+                self.StoreCachedDevice()
+                self.NotifySubscribers(RFE_Common.eEvent.CALIBRATION, sLine)
+            elif ((len(sLine) > 5) and sLine[:6] == "#C2-M:"):
+                g_objCommunicatorLog.info("Received RF Explorer device model info:%s", sLine)
+                self.m_eMainBoardModel = RFE_Common.eModel(int(sLine[6:9]))
+                if (self.m_eMainBoardModel == RFE_Common.eModel.MODEL_AUDIOPRO):
+                    self.m_bAudioPro = True
+                    self.m_eMainBoardModel = RFE_Common.eModel.MODEL_WSUB3G
+                    g_objCommunicatorLog.info("Audio Pro model found, converted to MWSUB3G")
+                self.m_eExpansionBoardModel = RFE_Common.eModel(int(sLine[10:13]))
+                self.m_sRFExplorerFirmware = sLine[14:19]
+                self.ValidateCachedDevice()
+                self.NotifySubscribers(RFE_Common.eEvent.MODEL, sLine)
+            elif ((len(sLine) > 5) and sLine[:6] == "#C3-M:"):
+                g_objCommunicatorLog.info("Received RF Explorer Generator device info:%s", sLine)
+                self.m_eMainBoardModel = RFE_Common.eModel(int(sLine[6:9]))
+                self.m_eExpansionBoardModel = RFE_Common.eModel(int(sLine[10:13]))
+                self.m_bExpansionBoardActive = (self.m_eExpansionBoardModel == RFE_Common.eModel.MODEL_RFGEN_EXPANSION)
+                self.m_sRFExplorerFirmware = sLine[14:19]
+                self.ValidateCachedDevice()
+                self.NotifySubscribers(RFE_Common.eEvent.MODEL, sLine)
+            elif ((len(sLine) > 6) and sLine[:5] == "#CAL:"):
+                self.m_bMainboardInternalCalibrationAvailable = (sLine[5] == '1')
+                self.m_bExpansionBoardInternalCalibrationAvailable = (sLine[6] == '1')
+            elif ((len(sLine) > 18) and (sLine[:18] == RFE_Common.CONST_RESETSTRING)):
+                #RF Explorer device was reset for some reason, reconfigure client based on new configuration
+                self.m_bIsResetEvent = True
+                self.NotifySubscribers(RFE_Common.eEvent.RESET, sLine)
+            elif ((len(sLine) > 2) and sLine.startswith("#a")):
+                ePreviousInputSatge = self.m_eInputStage
+                nNewStage = RFE_Common.eInputStage(int(sLine[2]))
+                if (nNewStage.value < RFE_Common.eInputStage.Attenuator_60dB.value):
+                    self.m_eInputStage = nNewStage
+                    if ((self.m_eInputStage is RFE_Common.eInputStage.LNA_25dB) and (self.m_eActiveModel is RFE_Common.eModel.MODEL_2400_PLUS)):
+                        self.m_eInputStage = RFE_Common.eInputStage.LNA_12dB; #2.4G+ has 12dB LNA, not 25dB
+                    if(self.m_eInputStage != ePreviousInputSatge):
+                        g_objCommunicatorLog.info("Input stage changed to %s", self.m_eInputStage.name)
+                else:
+                    g_objCommunicatorLog.error("ERROR: Received invalid input stage %s", nNewStage)
+
+            elif ((len(sLine) > 3) and sLine.startswith("#C+")):
+                    #Get device replay when calculator mode is set by software and update it
+                    self.UpdateCalculatorMode(RFE_Common.eCalculator(int(sLine[3])), False)
+                    g_objCommunicatorLog.info("Calculator mode changed to %s", self.m_eCalculator.name)
+            elif ((len(sLine) >= 5) and (sLine.startswith("$Cc") or (sLine.startswith("$Cd")))):
+                pass 
+            elif ((len(sLine) > 2) and (sLine[:2] == "$S") and (self.StartFrequencyMHZ > 0.1)):
+                bWrongFormat = True
+            elif ((len(sLine) > 5) and (sLine.startswith("#C4-F:"))):
+                bWrongFormat = True     #parsed on the thread
+            elif ((len(sLine) > 5) and (sLine[:6] == "#C2-F:")):
+                bWrongFormat = True     #parsed on the thread
+            elif ((len(sLine) > 5) and (sLine[:6] == "#C1-F:")):
+                bWrongFormat = True     #obsolete firmware
+            else:
+                g_objCommunicatorLog.info("%s", sLine)  #report any line we don't understand - it is likely a human readable message
+            if (bWrongFormat):
+                g_objCommunicatorLog.warning("Received unexpected data from RFExplorer device:%s\n"
+                                             "Please update your RF Explorer to a recent firmware version and\n"
+                                             "make sure you are using the latest version of RF Explorer for Windows.\n"
+                                             "Visit http://www.rf-explorer/download for latest firmware updates.", sLine)
+
+        if (objStats):
+            objStats.AddProcess(time.perf_counter_ns() - nStartNS)
         return bDraw, sReceivedString
 
+    def Subscribe(self, eEvent, fnCallback):
+        """Register a callback to be notified every time an event is processed, either by ProcessReceivedString or 
+        by the dispatcher thread started with StartDispatcher. Callbacks are called in the processing thread, so 
+        they should return quickly
+
+        Parameters:
+            eEvent     -- RFE_Common.eEvent to subscribe to
+            fnCallback -- Function called as fnCallback(objRFE, objData), see RFE_Common.eEvent for objData details
+        """
+        self.m_hSubscribersLock.acquire()
+        if (fnCallback not in self.m_dictSubscribers[eEvent]):
+            self.m_dictSubscribers[eEvent].append(fnCallback)
+        self.m_hSubscribersLock.release()
+
+    def Unsubscribe(self, eEvent, fnCallback):
+        """Remove a callback registered with Subscribe
+
+        Parameters:
+            eEvent     -- RFE_Common.eEvent the callback was subscribed to
+            fnCallback -- Function to remove
+        """
+        self.m_hSubscribersLock.acquire()
+        if (fnCallback in self.m_dictSubscribers[eEvent]):
+            self.m_dictSubscribers[eEvent].remove(fnCallback)
+        self.m_hSubscribersLock.release()
+
+    def NotifySubscribers(self, eEvent, objData):
+        """Wake up the threads blocked in WaitFor* methods and call all callbacks subscribed to an event, an exception 
+        in one callback does not prevent the others
+
+        Parameters:
+            eEvent  -- RFE_Common.eEvent being notified
+            objData -- Object sent to the callbacks
+        """
+        with self.m_hStateChanged:
+            self.m_hStateChanged.notify_all()
+        self.m_hSubscribersLock.acquire()
+        arrCallbacks = list(self.m_dictSubscribers[eEvent])
+        self.m_hSubscribersLock.release()
+        for fnCallback in arrCallbacks:
+            try:
+                fnCallback(self, objData)
+            except Exception as obEx:
+                g_objCommunicatorLog.error("Error in %s callback: %s", eEvent.name, obEx)
+
+    def Stats(self):
+        """Snapshot of the receive pipeline counters since the port was connected or ResetStats was called, to monitor 
+        performance without VerboseLevel prints. Times are in nanoseconds. The counters of every stage are only
+        updated while StatsEnabled is True, the ones added here are always available
+
+        Returns:
+            Dictionary as returned by RFEPipelineStats.Snapshot, plus SweepsProcessed, SweepsPerSecond, SweepsDropped,
+            QueueOverflows, QueueMaxSweeps and QueuedObjects
+        """
+        dicStats = self.m_objStats.Snapshot()
+        dicStats["SweepsProcessed"] = self.m_nSweepsProcessed
+        dicStats["SweepsPerSecond"] = self.m_objSweepRate.SweepsPerSecond
+        dicStats["SweepsDropped"] = self.m_objQueue.SweepsDropped
+        dicStats["QueueOverflows"] = self.m_objQueue.Overflows
+        dicStats["QueueMaxSweeps"] = self.m_objQueue.MaxSweeps
+        dicStats["QueuedObjects"] = self.m_objQueue.qsize()
+        return dicStats
+
+    def ResetStats(self):
+        """Clear the counters returned by Stats, except the ones of the receive queue and SweepsProcessed
+        """
+        self.m_objStats.Reset()
+
+    def WaitForCondition(self, fnCondition, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Block until fnCondition() returns True or the timeout expires, without using CPU meanwhile. If the dispatcher 
+        thread is running it waits to be notified by it, otherwise received data is processed here as it arrives. Called 
+        from a callback run by a RFEDeviceManager thread, that thread keeps reading and dispatching its devices and 
+        writing their commands meanwhile, so a callback can wait for a reply of its own or any other device
+
+        Parameters:
+            fnCondition -- Function without parameters returning True when the expected state is reached
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if the condition was reached, False if the timeout expired
+        """
+        from RFExplorer.RFEDeviceManager import RFEDeviceLoop      #not at module level, it imports this module
+        objCurrentThread = threading.current_thread()
+        fDeadline = time.monotonic() + fTimeoutSec
+        while (not fnCondition()):
+            fRemaining = fDeadline - time.monotonic()
+            if (fRemaining <= 0):
+                return False
+            if (isinstance(objCurrentThread, RFEDeviceLoop)):
+                #blocking here would stop reading every device of the loop, including this one
+                objCurrentThread.RunOnce(min(fRemaining, RFE_Common.CONST_MANAGER_POLL_SEC))
+                if (self.m_objDispatcherThread is None):
+                    for objNew in self.m_objQueue.get_many(block=False):
+                        try:
+                            self.ProcessReceivedObject(objNew)
+                        except Exception as obEx:
+                            g_objCommunicatorLog.error("WaitForCondition: %s", obEx)
+            elif (self.m_objDispatcherThread and (self.m_objDispatcherThread is not objCurrentThread)):
+                with self.m_hStateChanged:
+                    if (not fnCondition()):
+                        self.m_hStateChanged.wait(fRemaining)
+            elif (self.m_bPortConnected):
+                for objNew in self.m_objQueue.get_many(timeout=fRemaining):
+                    try:
+                        self.ProcessReceivedObject(objNew)
+                    except Exception as obEx:
+                        g_objCommunicatorLog.error("WaitForCondition: %s", obEx)
+            else:
+                time.sleep(min(fRemaining, RFE_Common.CONST_READ_TIMEOUT_SEC))    #nothing will be received until the port is connected
+        return True
+
+    def WaitForSweep(self, nAfterIndex=None, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait for a sweep newer than a given index to be processed
+
+        Parameters:
+            nAfterIndex -- Index of the last sweep known by the caller, as SweepsProcessed - 1. None to wait for a sweep 
+                           processed after this call
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            RFESweepData Last sweep processed, None if the timeout expired
+        """
+        if (nAfterIndex is None):
+            nAfterIndex = self.m_nSweepsProcessed - 1
+        if (self.WaitForCondition(lambda: (self.m_nSweepsProcessed - 1) > nAfterIndex, fTimeoutSec)):
+            return self.m_objLastSweep
+        return None
+
+    def SweepStream(self, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Generator returning every sweep processed from now on, in order. It finishes when no sweep is processed 
+        in fTimeoutSec
+
+        Parameters:
+            fTimeoutSec -- Max time to wait for every sweep, in seconds
+        Returns:
+            Generator of RFESweepData
+        """
+        if (not self.IsDispatcherRunning):
+            #sweeps are processed one by one in WaitForSweep, so none is skipped
+            nIndex = self.m_nSweepsProcessed - 1
+            while (True):
+                objSweep = self.WaitForSweep(nIndex, fTimeoutSec)
+                if (objSweep is None):
+                    return
+                nIndex = self.m_nSweepsProcessed - 1
+                yield objSweep
+
+        objSweeps = queue.Queue()
+        fnAddSweep = lambda objRFE, objSweep: objSweeps.put(objSweep)
+        self.Subscribe(RFE_Common.eEvent.SWEEP, fnAddSweep)
+        try:
+            while (True):
+                try:
+                    yield objSweeps.get(timeout=fTimeoutSec)
+                except queue.Empty:
+                    return
+        finally:
+            self.Unsubscribe(RFE_Common.eEvent.SWEEP, fnAddSweep)
+
+    def WaitForConfig(self, fStartMHZ, fStopMHZ, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait for the device configuration to match a frequency range, for instance after UpdateDeviceConfig. The stop
+        frequency is compared with one step tolerance, as the device adjusts it to the step size
+
+        Parameters:
+            fStartMHZ   -- Expected start frequency in MHZ
+            fStopMHZ    -- Expected stop frequency in MHZ
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if the configuration matches, False if the timeout expired
+        """
+        return self.WaitForCondition(lambda: self.IsFrequencyRange(fStartMHZ, fStopMHZ), fTimeoutSec)
+
+    def IsFrequencyRange(self, fStartMHZ, fStopMHZ):
+        """Check if the current configuration matches a frequency range, the stop frequency is compared with one step 
+        tolerance as the device adjusts it to the step size
+
+        Parameters:
+            fStartMHZ -- Start frequency in MHZ
+            fStopMHZ  -- Stop frequency in MHZ
+        Returns:
+            Boolean True if the current configuration matches the range
+        """
+        return ((math.fabs(self.StartFrequencyMHZ - fStartMHZ) < 0.001) and 
+                (math.fabs(self.StopFrequencyMHZ - fStopMHZ) <= max(0.001, self.StepFrequencyMHZ)))
+
+    def WaitForModel(self, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait for the connected device model and configuration to be known, usually after SendCommand_RequestConfigData
+
+        Parameters:
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if ActiveModel is known, False if the timeout expired
+        """
+        return self.WaitForCondition(lambda: self.m_eActiveModel != RFE_Common.eModel.MODEL_NONE, fTimeoutSec)
+
+    def WaitForGeneratorCalibration(self, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait for the signal generator internal calibration data to be loaded, usually requested with "Cq"
+
+        Parameters:
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if calibration data is available with GetRFE6GENCal, False if the timeout expired
+        """
+        return self.WaitForCondition(lambda: self.m_RFGenCal.GetCalSize() >= 0, fTimeoutSec)
+
+    def WaitForAcknowledge(self, fTimeoutSec=RFE_Common.CONST_WAIT_TIMEOUT_SEC):
+        """Wait for the device to send #ACK. As the Acknowledged property, the acknowledge is reset when it is returned
+
+        Parameters:
+            fTimeoutSec -- Max time to wait, in seconds
+        Returns:
+            Boolean True if #ACK was received, False if the timeout expired
+        """
+        bAcknowledge = self.WaitForCondition(lambda: self.m_bAcknowledge, fTimeoutSec)
+        self.m_bAcknowledge = False
+        return bAcknowledge
+
+    def StartDispatcher(self):
+        """Start a thread that processes received data as soon as it is queued and notifies the subscribed callbacks, 
+        so there is no need to call ProcessReceivedString in a loop. ProcessReceivedString should not be used while 
+        the dispatcher is running, as every object is processed only once. For a device of RFEDeviceManager the manager 
+        thread reading the port runs the callbacks instead, they can still wait for replies, see WaitForCondition
+
+        Returns:
+            Boolean True if the dispatcher was started, False if it was already running
+        """
+        if (self.m_objDispatcherThread):
+            return False
+        if (self.m_objDeviceManager):
+            #data is processed by the manager thread reading the port
+            self.m_objDispatcherThread = self.m_objDeviceManager.StartDispatch(self)
+            return self.m_objDispatcherThread is not None
+        self.m_bRunDispatcher = True
+        self.m_objDispatcherThread = threading.Thread(target=self.DispatcherThreadfunc, daemon=True)
+        self.m_objDispatcherThread.start()
+        return True
+
+    def StopDispatcher(self):
+        """Stop the thread started with StartDispatcher, data received afterwards is processed by ProcessReceivedString again
+        """
+        objThread = self.m_objDispatcherThread
+        self.m_bRunDispatcher = False
+        if (objThread and self.m_objDeviceManager):
+            self.m_objDeviceManager.StopDispatch(self)
+            self.m_objDispatcherThread = None
+        elif (objThread):
+            if (objThread is not threading.current_thread()):
+                objThread.join()
+            self.m_objDispatcherThread = None
+
+    def DispatcherThreadfunc(self):
+        """Wait for objects queued by the receive thread and process them until StopDispatcher is called
+        """
+        while (self.m_bRunDispatcher):
+            #blocks without polling and takes everything queued meanwhile with one lock acquisition
+            for objNew in self.m_objQueue.get_many(timeout=RFE_Common.CONST_DISPATCHER_TIMEOUT_SEC):
+                try:
+                    self.ProcessReceivedObject(objNew)
+                except Exception as obEx:
+                    g_objCommunicatorLog.error("DispatcherThreadfunc: %s", obEx)
+
     def IsAnalyzerEmbeddedCal(self):
         """ As a function of expansion or mainboard being currently selected, returns true if there is internal
         calibration data available, or false if not.
@@ -1301,8 +1764,59 @@ class RFECommunicator(object):
             return (self.MainBoardModel != RFE_Common.eModel.MODEL_NONE)
 
 #region COM port low level details
+    def RestoreCachedDevice(self):
+        """Restore the internal calibration data stored in DeviceCache for the connected port and serial number, 
+        so it is not requested again. Called when the serial number is received
+        """
+        if (not self.m_objDeviceCache or not self.m_sSerialNumber):
+            return
+        dicDevice = self.m_objDeviceCache.GetDevice(str(self.m_objSerialPort.port), self.m_sSerialNumber)
+        if (not dicDevice):
+            return
+        self.m_dicCachedDevice = dicDevice
+        if (dicDevice.get("GeneratorCalibration30DBM")):
+            self.m_RFGenCal.SetCalData(dicDevice["GeneratorCalibration30DBM"])
+        if (dicDevice.get("EmbeddedCalibrationOffsetDB")):
+            self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB = list(dicDevice["EmbeddedCalibrationOffsetDB"])
+        if (dicDevice.get("GeneratorCalibration30DBM") or dicDevice.get("EmbeddedCalibrationOffsetDB")):
+            self.m_nRetriesCalibration = RFE_Common.CONST_MAX_RETRIES_CALIBRATION     #do not request "Cq"
+        g_objCommunicatorLog.info("Cached device restored: %s on %s", DecorateSerialNumberRAWString(self.m_sSerialNumber), self.m_objSerialPort.port)
+
+    def ValidateCachedDevice(self):
+        """Compare the model and firmware received with those stored in DeviceCache, cached calibration data is discarded
+        if they do not match. Called when the model is received
+        """
+        if (self.m_dicCachedDevice):
+            if ((self.m_dicCachedDevice.get("MainBoardModel") != self.m_eMainBoardModel.value) or 
+                    (self.m_dicCachedDevice.get("ExpansionBoardModel") != self.m_eExpansionBoardModel.value) or
+                    (self.m_dicCachedDevice.get("Firmware") != self.m_sRFExplorerFirmware)):
+                g_objCommunicatorLog.warning("Cached device does not match the connected device, calibration data will be requested")
+                self.m_dicCachedDevice = None
+                self.m_RFGenCal.DeleteCal()
+                self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB = []
+                self.m_nRetriesCalibration = 0
+        self.StoreCachedDevice()
+
+    def StoreCachedDevice(self):
+        """Store model, firmware and internal calibration data of the connected device in DeviceCache, if the serial 
+        number is known
+        """
+        if (not self.m_objDeviceCache or not self.m_sSerialNumber or (self.m_eMainBoardModel == RFE_Common.eModel.MODEL_NONE)):
+            return
+        dicDevice = {"MainBoardModel": self.m_eMainBoardModel.value,
+                     "ExpansionBoardModel": self.m_eExpansionBoardModel.value,
+                     "Firmware": self.m_sRFExplorerFirmware,
+                     "EmbeddedCalibrationOffsetDB": self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB or None,
+                     "GeneratorCalibration30DBM": self.m_RFGenCal.GetCalData()}
+        if (self.m_dicCachedDevice == dict(dicDevice, Port=str(self.m_objSerialPort.port), SerialNumber=self.m_sSerialNumber)):
+            return  #nothing new to write
+        self.m_objDeviceCache.SetDevice(str(self.m_objSerialPort.port), self.m_sSerialNumber, dicDevice)
+        self.m_objDeviceCache.Save()
+        self.m_dicCachedDevice = self.m_objDeviceCache.GetDevice(str(self.m_objSerialPort.port), self.m_sSerialNumber)
+
     def GetConnectedPorts(self):
-        """ Found the valid available serial port
+        """ Found the valid available serial port. Ports are ranked by their USB metadata, when CP210x ports are found 
+        only those are opened, and ports are opened concurrently
 
         Returns:
             Boolean True if it found valid available serial port, False otherwise
@@ -1321,19 +1835,11 @@ class RFECommunicator(object):
 
                 sSystem = platform.system()
                 print("Detected OS: " + sSystem)
-                for objPort in self.m_arrConnectedPorts:
-                    if(self.IsConnectedPort(objPort.device)):
-                        if(sSystem == "Darwin"):
-                            #MAC OS. In macOS we limit valid ports to those using the SILABS driver
-                           if ("SLAB_USB" in objPort.device):
-                                self.m_arrValidCP2102Ports.append(objPort)
-                                print(objPort.device + " is a valid available port.")
-                                sValidPorts += objPort.device + " "
-                        else:
-                            #Windows, Linux, etc. Autodectect function is not working with virtual serial port.
-                            self.m_arrValidCP2102Ports.append(objPort)
-                            print(objPort.device + " is a valid available port.")
-                            sValidPorts += objPort.device + " "
+                #In macOS we limit valid ports to those using the SILABS driver. Windows, Linux, etc. Autodectect function is not working with virtual serial port.
+                self.m_arrValidCP2102Ports = self.ProbePorts(self.m_arrConnectedPorts, sSystem == "Darwin")
+                for objPort in self.m_arrValidCP2102Ports:
+                    print(objPort.device + " is a valid available port.")
+                    sValidPorts += objPort.device + " "
                 
                 if(len(self.m_arrValidCP2102Ports) > 0):
                     print("RF Explorer Valid Ports found: " + str(len(self.m_arrValidCP2102Ports)) + " - " + sValidPorts)
@@ -1349,41 +1855,146 @@ class RFECommunicator(object):
         
         return bOk
 
+    def RankPort(self, objPort):
+        """Rank a port by how likely it is an RF Explorer, using the metadata reported by serial.tools.list_ports
+
+        Parameters:
+            objPort -- Port information returned by serial.tools.list_ports.comports()
+        Returns:
+            Integer 3 if VID/PID are those of the CP210x bridge, 2 if its descriptors match the CP210x bridge, 
+            1 for other USB ports and 0 for ports without USB information
+		"""
+        if ((objPort.vid, objPort.pid) in RFE_Common.CONST_RFE_USB_IDS):
+            return 3
+        sDescriptors = " ".join(str(sText) for sText in (objPort.device, objPort.description, objPort.manufacturer, objPort.product, objPort.hwid) if sText).upper()
+        for sDescriptor in RFE_Common.CONST_RFE_USB_DESCRIPTORS:
+            if (sDescriptor in sDescriptors):
+                return 2
+        if (objPort.vid is not None):
+            return 1
+        return 0
+
+    def ProbePorts(self, arrPorts, bOnlyCP2102=False, fTimeoutSec=RFE_Common.CONST_PORT_PROBE_TIMEOUT_SEC):
+        """Find the ports that can be opened. Only CP210x ports are opened if there is any, otherwise all ports are
+        tried. Up to CONST_PORT_PROBE_THREADS ports are opened at the same time, plus one for every port which did
+        not open in time
+
+        Parameters:
+            arrPorts    -- Port information returned by serial.tools.list_ports.comports()
+            bOnlyCP2102 -- True to never try ports which are not CP210x
+            fTimeoutSec -- Max time to wait for every port to open from the time its probe starts, ports not opened in
+                           time are not valid
+        Returns:
+            List of the ports which can be opened, best ranked first
+		"""
+        self.m_dicPortRank = {}
+        for objPort in arrPorts:
+            self.m_dicPortRank[objPort.device] = self.RankPort(objPort)
+        arrCandidates = [objPort for objPort in arrPorts if (self.m_dicPortRank[objPort.device] >= 2)]
+        if (not arrCandidates and not bOnlyCP2102):
+            arrCandidates = list(arrPorts)
+        if (not arrCandidates):
+            return []
+
+        #every probe has fTimeoutSec from the time it starts to open its port. A probe not finished in time leaves its
+        #daemon thread behind, which can not block the process exit, and a new thread takes over the ports left
+        hCondition = threading.Condition()
+        arrPending = list(reversed(arrCandidates))
+        dicStarted = {}             #port name: time.monotonic() its probe started
+        dicOpened = {}              #port name: True if the port was opened, for finished probes
+        setTimedOut = set()         #port names whose probe did not finish in time
+
+        def ProbeThreadfunc():
+            while (True):
+                with hCondition:
+                    if (not arrPending):
+                        return
+                    sPortName = arrPending.pop().device
+                    dicStarted[sPortName] = time.monotonic()
+                    hCondition.notify_all()
+                bOpened = self.IsConnectedPort(sPortName)
+                with hCondition:
+                    dicOpened[sPortName] = bOpened
+                    hCondition.notify_all()
+                    if (sPortName in setTimedOut):
+                        return      #another thread took over meanwhile
+
+        def StartProbeThread():
+            threading.Thread(target=ProbeThreadfunc, daemon=True).start()
+
+        with hCondition:
+            for _ in range(min(len(arrCandidates), RFE_Common.CONST_PORT_PROBE_THREADS)):
+                StartProbeThread()
+            while (True):
+                fNow = time.monotonic()
+                fNextTimeout = None
+                for sPortName, fStarted in dicStarted.items():
+                    if ((sPortName in dicOpened) or (sPortName in setTimedOut)):
+                        continue
+                    if (fNow - fStarted >= fTimeoutSec):
+                        setTimedOut.add(sPortName)
+                        StartProbeThread()
+                    elif ((fNextTimeout is None) or (fStarted + fTimeoutSec < fNextTimeout)):
+                        fNextTimeout = fStarted + fTimeoutSec
+                if (not arrPending and (fNextTimeout is None)):
+                    break       #every port finished or timed out
+                hCondition.wait(fTimeoutSec if (fNextTimeout is None) else (fNextTimeout - fNow))
+
+        arrValidPorts = [objPort for objPort in arrCandidates if (dicOpened.get(objPort.device) and (objPort.device not in setTimedOut))]
+        arrValidPorts.sort(key=lambda objPort: self.m_dicPortRank[objPort.device], reverse=True)
+        if (self.m_nVerboseLevel > 1):
+            print("Ports opened: " + str(len(arrValidPorts)) + " of " + str(len(arrCandidates)) + " tried, " + str(len(arrPorts)) + " detected")
+        return arrValidPorts
+
+    def GetPortRank(self, sPortName):
+        """Rank found by the last GetConnectedPorts call for a port, see RankPort
+
+        Parameters:
+            sPortName -- Serial port name
+        Returns:
+            Integer rank of the port, -1 if the port was not detected
+		"""
+        return self.m_dicPortRank.get(sPortName, -1)
+
     def IsConnectedPort(self, sPortName):
-        """True if it is possible connect to specific port, otherwise False 
+        """True if it is possible connect to specific port, otherwise False. A temporary serial port object is used,
+        so several ports can be tried at the same time
             
         Parameters:
             sPortName -- Serial port name, can take any form accepted by OS
         Returns:
             Boolean True if it is possible connect to specific port, otherwise False
 		"""
-        self.m_objSerialPort.baudrate = 500000
-        self.m_objSerialPort.port = sPortName
+        objSerialPort = serial.Serial()
+        objSerialPort.baudrate = 500000
+        objSerialPort.port = sPortName
+        objSerialPort.write_timeout = RFE_Common.CONST_PORT_PROBE_TIMEOUT_SEC
         bOpen = False
         try:
-            self.m_hSerialPortLock.acquire()
-            self.m_objSerialPort.open()
+            objSerialPort.open()
         except Exception as obEx:
             print("Error in RFCommunicator - IsConnectedPort()" + str(obEx))
         finally:
-            if(self.m_objSerialPort.is_open):
+            if(objSerialPort.is_open):
                 bOpen = True
-            self.m_objSerialPort.close()
-            self.m_hSerialPortLock.release()
+            objSerialPort.close()
 
         return bOpen
 
-    def ConnectPort(self, sUserPort, nBaudRate):
+    def ConnectPort(self, sUserPort, nBaudRate, bValidatePort=True):
         """Connect serial port and start init sequence if AutoConfigure property is set. Connect automatically
         if sUserPort is None and there is only one available serial port, otherwise show an error message
 
         Parameters:
-            sUserPort -- Serial port name, can take any form accepted by OS
-            nBaudRate -- Usually 500000 or 2400, can be -1 to not define it and take default setting
+            sUserPort     -- Serial port name, can take any form accepted by OS
+            nBaudRate     -- Usually 500000 or 2400, can be -1 to not define it and take default setting
+            bValidatePort -- True to only accept ports found by GetConnectedPorts, False to open sUserPort directly,
+                             for instance a pseudo-terminal used by RFEDeviceSimulator
         Returns:
 		    Boolean True if port is open, otherwise False
 		"""
         bConnected = False
+        bOpened = False
         if(self.m_nVerboseLevel > 0):
             sErrorText = "User COM port: "
             if(sUserPort):
@@ -1394,14 +2005,25 @@ class RFECommunicator(object):
             
         try:
             self.m_hSerialPortLock.acquire()
-            if(sUserPort):                              
+            if(sUserPort and not bValidatePort):
+                sPortName = sUserPort
+                bConnected = True
+            elif(sUserPort):                              
                 for sPort in self.m_arrValidCP2102Ports:
                     if(sUserPort == sPort.device):
                         sPortName = sUserPort
                         bConnected = True
+                if (not bConnected and self.m_objDeviceCache and self.m_objDeviceCache.IsKnownPort(sUserPort)):
+                    sPortName = sUserPort
+                    bConnected = True
             elif (len(self.m_arrValidCP2102Ports) == 1):
                 sPortName = self.m_arrValidCP2102Ports[0].device
                 bConnected = True
+            elif(len(self.m_arrValidCP2102Ports) > 1 and self.GetPortRank(self.m_arrValidCP2102Ports[0].device) > self.GetPortRank(self.m_arrValidCP2102Ports[1].device)):
+                #ports are sorted by rank, a single CP210x port is preferred over the others
+                sPortName = self.m_arrValidCP2102Ports[0].device
+                bConnected = True
+                print("Automatically selected best ranked port " + sPortName)
             elif(len(self.m_arrValidCP2102Ports) == 2):
                 for objPort in self.m_arrValidCP2102Ports:
                     if (objPort.device == "/dev/ttyAMA0"):
@@ -1410,6 +2032,10 @@ class RFECommunicator(object):
                     sPortName = self.m_arrValidCP2102Ports[0].device
                     bConnected = True
                     print("Automatically selected port" + sPortName +" - ttyAMA0 ignored")
+            elif(not self.m_arrValidCP2102Ports and self.m_objDeviceCache and self.m_objDeviceCache.LastPort):
+                sPortName = self.m_objDeviceCache.LastPort
+                bConnected = True
+                print("Automatically selected last cached port " + sPortName)
          
             if(bConnected):
                 self.m_objSerialPort.baudrate = nBaudRate
@@ -1417,20 +2043,18 @@ class RFECommunicator(object):
                 self.m_objSerialPort.bytesize = serial.EIGHTBITS   
                 self.m_objSerialPort.stopbits= serial.STOPBITS_ONE 
                 self.m_objSerialPort.Parity = serial.PARITY_NONE   
-                self.m_objSerialPort.timeout = 100  
+                self.m_objSerialPort.timeout = RFE_Common.CONST_READ_TIMEOUT_SEC    #only the receive thread reads, it must not block for long
 
                 self.m_objSerialPort.open()
 
                 self.m_bPortConnected = True
-                self.m_LastCaptureTime = datetime.now()
+                self.m_hPortConnectedEvent.set()
+                self.m_objSweepRate.Restart()
+                self.m_objStats.Reset()
                 self.m_bHoldMode = False
 
                 print("Connected: " + str(self.m_objSerialPort.port) + ", " + str(self.m_objSerialPort.baudrate) + " bauds")
-
-                time.sleep(0.5)
-                if (self.m_bAutoConfigure):
-                    self.SendCommand_RequestConfigData()
-                    time.sleep(0.5)
+                bOpened = True
             else:             
                 print("Error: select a different COM port")
 
@@ -1438,14 +2062,132 @@ class RFECommunicator(object):
             print("ERROR ConnectPort: " + str(obEx))
         finally:
             self.m_hSerialPortLock.release()
+
+        if (bOpened):
+            if (self.m_objDeviceManager):
+                #not holding the port lock, the manager thread takes it to read the port while this call waits for it
+                self.m_objDeviceManager.AddPort(self)
+            if (self.m_objDeviceCache):
+                #the serial number is received before the configuration, so cached calibration data is restored before it is requested
+                self.SendCommand_RequestSerialNumber()
+            if (self.m_bAutoConfigure):
+                #no need to wait for the answer here, use WaitForModel to know when the configuration is received
+                self.SendCommand_RequestConfigData()
         return self.m_objSerialPort.is_open   
         
+    def ConnectReplayFile(self, sFileName, bRealtime=True):
+        """Connect to a byte stream recorded with StartRecording instead of a device. Recorded bytes are processed 
+        by the receive thread and ProcessReceivedString exactly as if they were coming from the device, and commands 
+        sent are ignored. Use ClosePort to end the replay
+
+        Parameters:
+            sFileName -- Name of the recording file
+            bRealtime -- True to replay with original timing, False to replay as fast as possible
+        Returns:
+		    Boolean True if the replay started, otherwise False
+		"""
+        bConnected = False
+        try:
+            objReplayPort = RFEStreamReplayPort(sFileName, bRealtime)
+            if (self.m_objSerialPort.is_open):
+                print("Error: close the current port before replaying a file")
+            else:
+                self.SetSerialPort(objReplayPort)
+                objReplayPort.open()
+
+                self.m_bPortConnected = True
+                self.m_hPortConnectedEvent.set()
+                self.m_objSweepRate.Restart()
+                self.m_objStats.Reset()
+                self.m_bHoldMode = False
+                bConnected = True
+
+                print("Connected: replay " + sFileName + ", " + str(len(objReplayPort.m_arrRecords)) + " records")
+                if (self.m_objDeviceManager):
+                    self.m_objDeviceManager.AddPort(self)
+        except Exception as obEx:
+            print("ERROR ConnectReplayFile: " + str(obEx))
+        return bConnected
+
+    def SetSerialPort(self, objSerialPort):
+        """Replace the serial port object used by the communicator and the receive thread
+
+        Parameters:
+            objSerialPort -- serial.Serial or compatible object, such as RFEStreamReplayPort
+		"""
+        self.m_hSerialPortLock.acquire()
+        try:
+            self.m_objSerialPort = objSerialPort
+            if (self.m_objThread):
+                self.m_objThread.m_objSerialPort = objSerialPort
+        finally:
+            self.m_hSerialPortLock.release()
+
+    def StartRecording(self, sFileName):
+        """Start storing all bytes received from and sent to the device in a file, with their timestamps, so they can
+        be replayed later with ConnectReplayFile. Any recording in progress is stopped first
+
+        Parameters:
+            sFileName -- Name of the recording file, it is overwritten if exists
+        Returns:
+		    Boolean True if recording started, otherwise False
+		"""
+        self.StopRecording()
+        try:
+            self.m_objStreamRecorder = RFEStreamRecorder(sFileName)
+        except Exception as obEx:
+            print("Error in RFCommunicator - StartRecording(): " + str(obEx))
+        return (self.m_objStreamRecorder is not None)
+
+    def StopRecording(self):
+        """Stop the recording started with StartRecording and close the file
+		"""
+        objRecorder = self.m_objStreamRecorder
+        self.m_objStreamRecorder = None
+        if (objRecorder):
+            objRecorder.Close()
+
+    def StartArchive(self, sFolder, nWidth=0):
+        """Start writing every sweep added to SweepData in an RFESweepArchive, so captures larger than RAM are kept:
+        once SweepData holds its max number of sweeps in RAM the oldest ones are read from the archive instead. An 
+        existing archive in the folder is opened to add more sweeps. Any archive in use is stopped first. It requires
+        NumPy
+
+        Parameters:
+            sFolder -- Folder of the archive files, it is created if it does not exist
+            nWidth  -- Data points stored for every sweep, see RFESweepArchive.Open. With 0, the data points of the 
+                       first sweep archived, a configuration with more data points continues in a new segment
+        Returns:
+		    Boolean True if the archive is in use, otherwise False
+		"""
+        self.StopArchive()
+        objArchive = RFESweepArchive()
+        if (not objArchive.Open(sFolder, nWidth)):
+            return False
+        self.m_SweepDataContainer.Archive = objArchive
+        if (self.m_SweepDataContainer.Archive is None):
+            objArchive.Close()
+            return False
+        return True
+
+    def StopArchive(self):
+        """Stop writing sweeps in the archive started with StartArchive and close it, the sweeps which were only in the
+        archive are not in SweepData anymore and it keeps the last sweeps from then on, see RFESweepDataCollection.Archive
+		"""
+        objArchive = self.m_SweepDataContainer.Archive
+        if (objArchive):
+            self.m_SweepDataContainer.Archive = None
+            objArchive.Close()
+
     def ClosePort(self):
         """ Close port and initialize some settings
 
         Returns:
             Boolean True if serial port was closed, False otherwise
 		"""
+        if (self.m_objDeviceManager):
+            #the manager thread must not wait for the port lock held below
+            self.m_objDeviceManager.RemovePort(self)
         try:
             self.m_hSerialPortLock.acquire()
 
@@ -1472,7 +2214,8 @@ class RFECommunicator(object):
                 self.SendCommand_ScreenON()
                 self.SendCommand_DisableScreenDump()
 
-                #Close the port
+                #Close the port once all commands are written
+                self.m_objCommandWriter.Flush()
                 print("Disconnected.")
                 self.m_objSerialPort.close()
 
@@ -1484,34 +2227,46 @@ class RFECommunicator(object):
             self.m_hSerialPortLock.release()
 
         self.m_bPortConnected = False  #to be double safe in case of exception
+        self.m_hPortConnectedEvent.clear()
         self.m_eMainBoardModel = RFE_Common.eModel.MODEL_NONE
         self.m_eExpansionBoardModel = RFE_Common.eModel.MODEL_NONE
         self.m_eActiveModel = RFE_Common.eModel.MODEL_NONE;
         #Restore input stage when device is disconnected to not consider InputStage attenuation
         self.m_eInputStage = RFE_Common.eInputStage.Direct;
 
-        self.m_LastCaptureTime = datetime(2000, 1, 1, 0, 0, 0, 000)
+        self.m_objSweepRate.Reset()
 
         self.m_sSerialNumber = ""
         self.m_sExpansionSerialNumber = ""
         self.m_nRetriesCalibration = 0
         self.m_arrSpectrumAnalyzerEmbeddedCalibrationOffsetDB = None
         self.m_arrSpectrumAnalyzerExpansionCalibrationOffsetDB = None
+        self.m_dicCachedDevice = None
+
+        if (self.IsReplay):
+            #replay finished, next connection will use a real port again
+            self.SetSerialPort(serial.Serial())
 
         return (not self.m_objSerialPort.is_open)
 #endregion 
 
 #region SendCommands
-    def UpdateDeviceConfig(self, fStartMHZ, fEndMHZ, fTopDBM=0, fBottomDBM=-120, fRBW_KHZ=0.0):
-        """Send a new configuration to the connected device
+    def UpdateDeviceConfig(self, fStartMHZ, fEndMHZ, fTopDBM=0, fBottomDBM=-120, fRBW_KHZ=0.0, fTimeoutSec=RFE_Common.CONST_CONFIG_TIMEOUT_SEC):
+        """Send a new configuration to the connected device and wait until the device confirms it sending back the 
+        matching configuration, so another command can be sent right away. The time it took is available in ConfigSettleSec. 
+        It can be called from a callback of a device of RFEDeviceManager, see WaitForCondition
 
         Parameters:
-            fStartMHZ  -- New start frequency, in MHZ, must be in valid range for the device
-            fEndMHZ    -- New stop frequency, in MHZ, must be in valid range for the device
-            fTopDBM    -- Optional, only impact visual not real data
-            fBottomDBM -- Optional, only impact visual not real data
-            fRBW_KHZ   -- Reserved future firmware support 
+            fStartMHZ   -- New start frequency, in MHZ, must be in valid range for the device
+            fEndMHZ     -- New stop frequency, in MHZ, must be in valid range for the device
+            fTopDBM     -- Optional, only impact visual not real data
+            fBottomDBM  -- Optional, only impact visual not real data
+            fRBW_KHZ    -- Reserved future firmware support 
+            fTimeoutSec -- Optional, max time to wait for the device to confirm the configuration, 0 to not wait
+        Returns:
+            Boolean True if the device confirmed the new configuration, False otherwise
 		"""
+        bConfirmed = False
         if (self.m_bPortConnected):
             # #[32]C2-F:Sssssss,Eeeeeee,tttt,bbbb
             nStartKhz = int(fStartMHZ * 1000)
@@ -1538,16 +2293,26 @@ class RFECommunicator(object):
                 else:
                     print("Ignored RBW " + fRBW_KHZ + "Khz")
 
+            nConfigsProcessed = self.m_nConfigsProcessed
+            fStartTime = time.monotonic()
             self.SendCommand(sData)
 
-            #wait some time for the unit to process changes, otherwise may get a different command too soon
-            time.sleep(0.5)
+            #wait for the unit to process changes, otherwise may get a different command too soon
+            bConfirmed = self.WaitForCondition(lambda: ((self.m_nConfigsProcessed > nConfigsProcessed) and 
+                                                        self.IsFrequencyRange(nStartKhz / 1000.0, nEndKhz / 1000.0)), fTimeoutSec)
+            self.m_fConfigSettleSec = time.monotonic() - fStartTime
+        return bConfirmed
 
     def SendCommand_RequestConfigData(self):
         """Request RF Explorer SA device to send configuration data and start sending feed back
 		"""
         self.SendCommand("C0")
 
+    def SendCommand_RequestSerialNumber(self):
+        """Request RF Explorer device to send its serial number, available in SerialNumber when received
+        """
+        self.SendCommand("Cn")
+
     def SendCommand_Realtime(self):
         """Set RF Explorer SA devince in Calculator:Normal, this is useful to
         minimize spikes and spurs produced by unwanted signals
@@ -1679,15 +2444,22 @@ class RFECommunicator(object):
         self.SendCommand("CJ" + chr(int((nDataPoints - 16)/ 16)))
 
     def SendCommand(self, sCommand):
-        """Format and send command - for instance to reboot just use "r", the '#' decorator and byte length char will be included within
+        """Format and send command - for instance to reboot just use "r", the '#' decorator and byte length char will be included within.
+        The command is queued and written by the command writer thread, so it can be called from any thread and returns 
+        without waiting for the port. A frequency or sweep points command not written yet is discarded if a newer one is sent
          
         Parameters: www.rf-explorer.com/API 
             sCommand -- Unformatted command from http://www.rf-explorer.com/API
+        Returns:
+            concurrent.futures.Future Completed with True when the command is written, False if it was superseded by a 
+            newer command, or with the exception raised by the port
 		"""
         sCompleteCommand = "#" + chr(len(sCommand) + 2) + sCommand
-        self.m_objSerialPort.write(sCompleteCommand.encode('latin_1'))
+        arrCompleteCommand = sCompleteCommand.encode('latin_1')
+        objFuture = self.m_objCommandWriter.QueueCommand(sCommand, arrCompleteCommand)
         if self.m_nVerboseLevel>5:
             print("RFE Command: #(" + str(len(sCompleteCommand)) + ")" + sCommand + " [" + " ".join("{:02X}".format(ord(c)) for c in sCompleteCommand) + "]")
+        return objFuture
         
     def SendCommand_SpectrumAnalyzerMode(self):
         """Set RF Explorer Spectrum Analyzer device working in SA mode
@@ -1710,6 +2482,12 @@ class RFECommunicator(object):
         #we use this method to internally restore capture buffers to empty status
         self.SendCommand("Cr")
 
+    def ResetTraces(self):
+        """Use this function to re-initialize the max hold, min hold and average traces calculated by this library from
+        the sweeps received, see Traces. It can be called from any thread, the traces restart with the next sweep
+		"""
+        self.m_SweepDataContainer.Traces.Reset()
+
     def SendCommand_WifiAnalyzer(self):
         """ Set RF Explorer Spectrum Analyzer device working in Wifi Analyzer mode depending on its WiFi band 
         """
@@ -1739,6 +2517,8 @@ class RFECommunicator(object):
 		"""
         self.Close()
 
+        self.StopRecording()
+        self.StopArchive()
         if (not self.m_bDisposed):
             if (bDisposing):
                 if (self.m_objSerialPort):
@@ -1752,12 +2532,17 @@ class RFECommunicator(object):
     def Close(self):
         """End thread and close port
 		"""
+        self.StopDispatcher()
         if (self.m_bRunReceiveThread):
             #print("Close(): close thread")
             self.m_bRunReceiveThread = False
+            self.m_hPortConnectedEvent.set()    #wake up the receive thread so it can finish
             time.sleep(1)
             self.m_objThread = None
         self.ClosePort()
+        self.m_objCommandWriter.Stop()
+        if (self.m_objDeviceManager):
+            self.m_objDeviceManager.RemoveDevice(self)
     
     def RFGenTrackStepMHZ(self):
         """Configured tracking step size in MHZ
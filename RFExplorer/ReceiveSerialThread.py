@@ -22,25 +22,32 @@
 #Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
 #=============================================================================
 
+import logging
 import threading
 import time
 
 from RFExplorer import RFE_Common 
+from RFExplorer.RFELogging import TRACE, RFELazyString, g_objReceiveLog, g_objSweepLog
 from RFExplorer.RFEConfiguration import RFEConfiguration
+from RFExplorer.RFEProtocolFramer import RFEProtocolFramer
 from RFExplorer.RFESweepData import RFESweepData
 
 class ReceiveSerialThread(threading.Thread):
     """The secondary thread used to get data from USB/RS232 COM port
     """
-    def __init__(self,objRFECommunicator, objQueue, objSerialPort, hQueueLock, hSerialPortLock):
+    def __init__(self,objRFECommunicator, objQueue, objSerialPort, hSerialPortLock):
         threading.Thread.__init__(self)
         self.variable = RFE_Common.CONST_MAX_AMPLITUDE_DBM
         self.m_objRFECommunicator = objRFECommunicator
         self.m_objQueue = objQueue
         self.m_objSerialPort = objSerialPort
-        self.m_hQueueLock = hQueueLock
         self.m_hSerialPortLock = hSerialPortLock
         self.m_objCurrentConfiguration = None
+        self.m_objFramer = RFEProtocolFramer()
+        self.m_arrPendingObjects = []       #objects created from the bytes being processed, see PublishObjects
+        self.m_nFirstByteNS = None          #time.monotonic_ns() the first byte returned by the last ReadSerialPort was read, if read alone
+        self.m_nLastReadNS = 0              #time.monotonic_ns() the last ReadSerialPort or ReadAvailableBytes finished reading
+        self.m_nTotalSpectrumDataDumps = 0
 
     def run(self):
         #print("Starting Thread")
@@ -51,206 +58,227 @@ class ReceiveSerialThread(threading.Thread):
         pass
         #print("destroying thread object")
 
+    def QueueObject(self, objNew):
+        """Add any received object to the batch sent to the RFECommunicator queue by PublishObjects
+
+        Parameters:
+            objNew -- Object to queue, a string, RFEConfiguration or RFESweepData
+        """
+        self.m_arrPendingObjects.append(objNew)
+
+    def PublishObjects(self):
+        """Send all objects created from the last bytes received to the RFECommunicator queue at once, so the queue
+        lock is taken and the consumer woken up once per read instead of once per object
+        """
+        if (not self.m_arrPendingObjects):
+            return
+        arrObjects = self.m_arrPendingObjects
+        self.m_arrPendingObjects = []
+        fnKeepWaiting = None
+        if (threading.current_thread() is self):
+            #only this thread may wait for the consumer, RFEDeviceManager and RFEAsyncCommunicator process what they queue
+            fnKeepWaiting = lambda: self.m_objRFECommunicator.RunReceiveThread and self.m_objRFECommunicator.PortConnected
+        if (self.m_objRFECommunicator.PipelineStats):
+            nQueuedNS = time.monotonic_ns()
+            for objNew in arrObjects:
+                if (isinstance(objNew, RFESweepData)):
+                    objNew.m_nQueuedNS = nQueuedNS
+        self.m_objQueue.put_many(arrObjects, fnKeepWaiting)
+
+    def ReadSerialPort(self):
+        """Read all bytes available in the serial port. Unless the communicator ReadPolicy is POLLING, it blocks
+        on the port until new bytes arrive or CONST_READ_TIMEOUT_SEC expires. The time bytes were read is kept in 
+        m_nFirstByteNS and m_nLastReadNS
+
+        Returns:
+            Bytes New data read from the port, empty if nothing was received
+        """
+        eReadPolicy = self.m_objRFECommunicator.ReadPolicy
+        objNewBytes = b""
+        self.m_nFirstByteNS = None
+        self.m_hSerialPortLock.acquire()
+        try:
+            if (self.m_objSerialPort.is_open and (eReadPolicy != RFE_Common.eReadPolicy.POLLING) and (self.m_objSerialPort.in_waiting == 0)):
+                #the port timeout is CONST_READ_TIMEOUT_SEC, so this returns as soon as one byte arrives or the timeout expires
+                objNewBytes = self.m_objSerialPort.read(1)
+                if (objNewBytes):
+                    self.m_nFirstByteNS = time.monotonic_ns()
+        except Exception as obEx:
+            g_objReceiveLog.error("Serial port Exception: %s", obEx)
+        finally:
+            self.m_hSerialPortLock.release()
+
+        if (objNewBytes and (eReadPolicy == RFE_Common.eReadPolicy.LOW_CPU)):
+            #let more bytes arrive so they are processed together
+            time.sleep(RFE_Common.CONST_READ_COALESCE_SEC)
+
+        self.m_hSerialPortLock.acquire()
+        try:
+            if (self.m_objSerialPort.is_open): 
+                #print("port open")
+                nBytes = self.m_objSerialPort.in_waiting
+                if (nBytes > 0):
+                    objNewBytes += self.m_objSerialPort.read(nBytes)
+        except Exception as obEx:
+            g_objReceiveLog.error("Serial port Exception: %s", obEx)
+        finally:
+            self.m_hSerialPortLock.release()
+        self.m_nLastReadNS = time.monotonic_ns()
+        return objNewBytes
+
     def ReceiveThreadfunc(self):
         """Where all data coming from the device are processed and queued
 		"""
-        nBytes = 0
-        nTotalSpectrumDataDumps = 0
         while self.m_objRFECommunicator.RunReceiveThread:
-            strReceived = ""
+            self.m_objFramer.Reset()
             while (self.m_objRFECommunicator.PortConnected and self.m_objRFECommunicator.RunReceiveThread):
-                sNewText = ""
-                self.m_hSerialPortLock.acquire()
-                try:
-                    if (self.m_objSerialPort.is_open): 
-                        #print("port open")
-                        nBytes = self.m_objSerialPort.in_waiting
-                        if (nBytes > 0):
-                            sNewText = self.m_objSerialPort.read(nBytes).decode("latin_1")
-                except Exception as obEx:
-                    print("Serial port Exception: " + str(obEx))
-                finally:
-                    self.m_hSerialPortLock.release()
-                if (len(sNewText) > 0):
-                    strReceived += str(sNewText)
-                    if(self.m_objRFECommunicator.VerboseLevel > 9):
-                        print(strReceived.encode('utf-8')) 
-                    sNewText = ""
-                if (len(strReceived) > 66*1024):
-                    #Safety code, some error prevented the string from being processed in several loop cycles.Reset it.
-                    if(self.m_objRFECommunicator.VerboseLevel > 5):
-                        print("Received string truncated (" + strReceived + ")")
-                    strReceived = ""
-                nLen = len(strReceived)
-                if (nLen > 1):
-                    if (self.m_objRFECommunicator.VerboseLevel > 9): 
-                        print(strReceived)
-                    if (strReceived[0] == '#'):
-                        nEndPos = strReceived.find("\r\n")
-                        if (nEndPos >= 0):
-                            sNewLine = strReceived[:nEndPos]
-                            sLeftOver = strReceived[nEndPos + 2:]
-                            strReceived = sLeftOver
-                            #print(sNewLine)
+                objNewBytes = self.ReadSerialPort()
+                if (objNewBytes):
+                    objRecorder = self.m_objRFECommunicator.StreamRecorder
+                    if (objRecorder):
+                        objRecorder.Record(RFE_Common.eStreamDirection.RX, objNewBytes)
+                    if (g_objReceiveLog.isEnabledFor(TRACE)):
+                        g_objReceiveLog.log(TRACE, "%r", bytes(objNewBytes))
+                    self.ProcessReceivedBytes(objNewBytes, self.m_nLastReadNS, self.m_nFirstByteNS)
+                if ((self.m_objRFECommunicator.ReadPolicy == RFE_Common.eReadPolicy.POLLING) and (self.m_objRFECommunicator.Mode != RFE_Common.eMode.MODE_TRACKING)):
+                    time.sleep(0.01)
+            #wait for the port to be connected, ConnectPort and Close wake us up immediately
+            self.m_objRFECommunicator.m_hPortConnectedEvent.wait(0.5)
+        #print("ReceiveThreadfunc(): closing thread...")
 
-                            if ((len(sNewLine) > 5) and ((sNewLine[:6] == "#C2-F:") or sNewLine.startswith("#C2-f:") or (sNewLine[:4] == "#C3-") and (sNewLine[4] != 'M') or sNewLine.startswith("#C4-F:")) or sNewLine.startswith("#C5-")):
-                                if (self.m_objRFECommunicator.VerboseLevel > 5):
-                                    print("Received Config:" + sNewLine)
+    def ReadAvailableBytes(self, bReady):
+        """Read and process all bytes waiting in the port without blocking. Used instead of running this thread when 
+        the port is read by RFEDeviceManager or RFEAsyncCommunicator
 
-                                #Standard configuration expected
-                                objNewConfiguration = RFEConfiguration(None)
-                                #print("sNewLine: "+ sNewLine)
-                                if (objNewConfiguration.ProcessReceivedString(sNewLine)):
-                                    self.m_objCurrentConfiguration = RFEConfiguration(objNewConfiguration)
-                                    self.m_hQueueLock.acquire() 
-                                    self.m_objQueue.put(objNewConfiguration)
-                                    self.m_hQueueLock.release() 
-                            else:
-                                self.m_hQueueLock.acquire() 
-                                self.m_objQueue.put(sNewLine)
-                                self.m_hQueueLock.release() 
-                    elif (strReceived[0] == '$'):
-                        if (nLen > 4 and (strReceived[1] == 'C')):
-                            nSize = 2 #account for cr+lf
-                            #calibration data
-                            if (strReceived[2] == 'c') or (strReceived[2] == 'd'): 
-                                nSize+=int(ord(strReceived[3])) + 4
-                            elif (strReceived[2] == 'b'): 
-                                nSize+=(int(ord(strReceived[4])) + 1) * 16 + 10
-                            if (nSize > 2 and nLen >= nSize):
-                                nEndPos = strReceived.find("\r\n")
-                                sNewLine = strReceived[:nEndPos]
-                                sLeftOver = strReceived[nEndPos:]
-                                strReceived = sLeftOver
-                                #print(" [" + " ".join("{:02X}".format(ord(c)) for
-                                #c in sNewLine) + "]")
-                                self.m_hQueueLock.acquire() 
-                                self.m_objQueue.put(sNewLine)
-                                self.m_hQueueLock.release() 
-                        elif (nLen > 2 and ((strReceived[1] == 'q') or (strReceived[1] == 'Q'))):
-                            #this is internal calibration data dump
-                            nReceivedLength = int(ord(strReceived[2]))
-                            nExtraLength = 3
-                            if (strReceived[1] == 'Q'):
-                                nReceivedLength += int(0x100 * strReceived[3])
-                                nExtraLength = 4
+        Parameters:
+            bReady -- True if the port was reported ready to read, so it is read even if no bytes are waiting to detect
+                      a disconnected device
+        Returns:
+            Boolean False if the port failed and must not be read anymore, True otherwise
+        """
+        objNewBytes = b""
+        bOk = True
+        self.m_hSerialPortLock.acquire()
+        try:
+            if (self.m_objSerialPort.is_open):
+                nBytes = self.m_objSerialPort.in_waiting
+                if (nBytes > 0):
+                    objNewBytes = self.m_objSerialPort.read(nBytes)
+                elif (bReady):
+                    objNewBytes = self.m_objSerialPort.read(1)     #raises if the device was disconnected
+        except Exception as obEx:
+            g_objReceiveLog.error("Serial port Exception: %s", obEx)
+            bOk = False
+        finally:
+            self.m_hSerialPortLock.release()
+        self.m_nLastReadNS = time.monotonic_ns()
 
-                            bLengthOK = (len(strReceived) >= (nExtraLength + nReceivedLength + 2))
-                            if (bLengthOK):
-                                self.m_hQueueLock.acquire() 
-                                self.m_objQueue.put(strReceived)
-                                self.m_hQueueLock.release()
-                                strReceived = strReceived[(nExtraLength + nReceivedLength + 2):]
-                        elif (nLen > 1 and (strReceived[1] == 'D')):
-                            #This is dump screen data
-                            if (self.m_objRFECommunicator.VerboseLevel > 5):
-                                print("Received $D" + len(strReceived))
+        if (objNewBytes):
+            objRecorder = self.m_objRFECommunicator.StreamRecorder
+            if (objRecorder):
+                objRecorder.Record(RFE_Common.eStreamDirection.RX, objNewBytes)
+            if (g_objReceiveLog.isEnabledFor(TRACE)):
+                g_objReceiveLog.log(TRACE, "%r", bytes(objNewBytes))
+            self.ProcessReceivedBytes(objNewBytes, self.m_nLastReadNS)
+        return bOk
 
-                            if (len(strReceived) >= (4 + 128 * 8)):
-                                pass 
-                        elif (nLen > 3 and ((strReceived[1] == "S") or (strReceived[1] == 's') or (strReceived[1] == 'z'))):
-                            #Standard spectrum analyzer data
-                            nReceivedLength = int(ord(strReceived[2]))
-                            nSizeChars = 3
-                            if (strReceived[1] == 's'):
-                                if (nReceivedLength == 0):
-                                    nReceivedLength = 256
-                                nReceivedLength *= 16
-                            elif (strReceived[1] == 'z'):
-                                nReceivedLength *= 256
-                                nReceivedLength += int(ord(strReceived[3]))
-                                nSizeChars+=1
-                            if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                print("Spectrum data: " + str(nReceivedLength) + " " + str(nLen))
-                            bLengthOK = (nLen >= (nSizeChars + nReceivedLength + 2))    #OK if received data >= header command($S,$s or $z) + data length + end of line('\n\r')
-                            bFullStringOK = False
-                            if (bLengthOK): ## Ok if data length are ok and end of line('\r\n') is in the correct place
-                                            ## (at the end).  Prevents corrupted data
-                                bFullStringOK = (ord(strReceived[nSizeChars + nReceivedLength:][0]) == ord('\r')) and (ord(strReceived[nSizeChars + nReceivedLength:][1]) == ord('\n'))
-                            if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                print("bLengthOK " + str(bLengthOK) + "bFullStringOK " + str(bFullStringOK) + " " + str(ord(strReceived[nSizeChars + nReceivedLength:][1])) + " - " + strReceived[nSizeChars + nReceivedLength:])
-                            
-                            bEEOT = False
-                            if (bLengthOK==False or ((bLengthOK==True) and (bFullStringOK == False))):
-                                #Check if not all bytes were received but EEOT is detected.
-                                nIndexEEOT = strReceived.find(RFE_Common.CONST_EEOT) 
-                                if (nIndexEEOT != -1):
-                                    bEEOT = True
-                                    if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                        print("EEOT detected")
-                                    #If EEOT detected, remove from received string so we ignore the partially received data
-                                    strReceived = strReceived[(nIndexEEOT + len(RFE_Common.CONST_EEOT)):]
+    def ProcessReceivedBytes(self, objNewBytes, nArrivalNS=None, nFirstByteNS=None):
+        """Frame new bytes received from the device and process all the frames completed with them
 
-                            if (bFullStringOK):
-                                nTotalSpectrumDataDumps+=1
-                                if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                    print("Full dump received: " + str(nTotalSpectrumDataDumps))
+        Parameters:
+            objNewBytes  -- Bytes-like object with new data received from the device
+            nArrivalNS   -- time.monotonic_ns() when the bytes were read, None to use the current time
+            nFirstByteNS -- time.monotonic_ns() when the first byte was read, if it was read before the others
+        """
+        objStats = self.m_objRFECommunicator.PipelineStats
+        if (objStats is None):
+            for objFrame in self.m_objFramer.ProcessBytes(objNewBytes, nArrivalNS, nFirstByteNS):
+                self.ProcessFrame(objFrame)
+        else:
+            objStats.AddRead(len(objNewBytes))
+            nStartNS = time.perf_counter_ns()
+            nProcessNS = 0
+            for objFrame in self.m_objFramer.ProcessBytes(objNewBytes, nArrivalNS, nFirstByteNS):
+                nFrameStartNS = time.perf_counter_ns()
+                objStats.AddFrame(objFrame.Type)
+                self.ProcessFrame(objFrame)
+                nProcessNS += time.perf_counter_ns() - nFrameStartNS
+            objStats.AddFraming(time.perf_counter_ns() - nStartNS - nProcessNS)
+        self.PublishObjects()
 
-                                #So we are here because received the full set of chars expected, and all them are apparently of valid characters
-                                if (nReceivedLength <= RFE_Common.CONST_MAX_SPECTRUM_STEPS):
-                                    sNewLine = "$S" + strReceived[nSizeChars:(nSizeChars + nReceivedLength)]
-                                    if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                        print("New line:\n" + " [" + "".join("{:02X}".format(ord(c)) for c in sNewLine) + "]")
-                                    if (self.m_objCurrentConfiguration):
-                                        nSweepDataPoints = self.m_objCurrentConfiguration.FreqSpectrumSteps + 1
-                                        objSweep = RFESweepData(self.m_objCurrentConfiguration.fStartMHZ, self.m_objCurrentConfiguration.fStepMHZ, nSweepDataPoints)
-                                        nInputStageOffset = 0
-                                        #IoT module calculate this offset internally, this avoid add offset twice if is IoT (MWSUB3G), same as 2.4G+
-                                        if ((self.m_objRFECommunicator.InputStage != RFE_Common.eInputStage.Direct) and self.m_objRFECommunicator.IsAnalyzerEmbeddedCal() and (self.m_objRFECommunicator.IsMWSUB3G == False) and (self.m_objRFECommunicator.ActiveModel != RFE_Common.eModel.MODEL_2400_PLUS)):
-                                                nInputStageOffset = int(self.m_objRFECommunicator.InputStageAttenuationDB)                                  
-                                        if (objSweep.ProcessReceivedString(sNewLine, (self.m_objCurrentConfiguration.fOffset_dB + nInputStageOffset), self.m_objRFECommunicator.UseByteBLOB, self.m_objRFECommunicator.UseStringBLOB)):
-                                            if (self.m_objRFECommunicator.VerboseLevel > 5):
-                                                print(objSweep.Dump())
-                                            if (nSweepDataPoints > 5): #check this is not an incomplete scan (perhaps from a stopped SNA tracking step)
-                                                #Normal spectrum analyzer sweep data
-                                                self.m_hQueueLock.acquire() 
-                                                self.m_objQueue.put(objSweep)
-                                                self.m_hQueueLock.release()
-                                        elif (self.m_objRFECommunicator.VerboseLevel > 5):  
-                                            self.m_hQueueLock.acquire() 
-                                            self.m_objQueue.put(sNewLine)
-                                            self.m_hQueueLock.release()
-                                    else:
-                                        if (self.m_objRFECommunicator.VerboseLevel > 5):
-                                            print("Configuration not available yet. $S string ignored.")
-                                else:
-                                    self.m_hQueueLock.acquire() 
-                                    self.m_objQueue.put("Ignored $S of size " + str(nReceivedLength) + " expected " + str(self.m_objCurrentConfiguration.FreqSpectrumSteps))
-                                    self.m_hQueueLock.release()
-                                strReceived = strReceived[(nSizeChars + nReceivedLength + 2):]
-                                if (self.m_objRFECommunicator.VerboseLevel > 5):
-                                    sText = "New String: "
-                                    nLength = len(strReceived)
-                                    if (nLength > 10):
-                                        nLength = 10
-                                    if (nLength > 0):
-                                        sText += strReceived[:nLength]
-                                    print(sText.encode('utf-8'))
-                            elif (bLengthOK and bEEOT == False):
-                                #So we are here because the string doesn't end with the expected chars, but has the right length.
-                                #The most likely cause is a truncated string was received, and some chars are from next string, not
-                                #this one therefore we truncate the line to avoid being much larger, and start over again next time.
-                                nPosNextLine = strReceived.index("\r\n")
-                                if (nPosNextLine >= 0):
-                                    strReceived = strReceived[nPosNextLine + 2:] 
-                            elif (bEEOT == False):
-                                if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                    print("incomplete sweep")
-                                pass
-                    else:
-                        nEndPos = strReceived.find("\r\n")
-                        if (nEndPos >= 0):
-                            sNewLine = strReceived[:nEndPos]
-                            sLeftOver = strReceived[nEndPos + 2:]
-                            strReceived = sLeftOver
-                            self.m_hQueueLock.acquire() 
-                            self.m_objQueue.put(sNewLine)
-                            self.m_hQueueLock.release() 
-                            if (self.m_objRFECommunicator.VerboseLevel > 9):
-                                print("sNewLine: " + sNewLine)
-                        elif (self.m_objRFECommunicator.VerboseLevel > 5):
-                            print("DEBUG partial:" + strReceived)
-                if(self.m_objRFECommunicator.Mode != RFE_Common.eMode.MODE_TRACKING):
-                    time.sleep(0.01)
-            time.sleep(0.5)
-        #print("ReceiveThreadfunc(): closing thread...")
+    def ProcessFrame(self, objFrame):
+        """Process a single frame found in the received data and queue the resulting objects
+
+        Parameters:
+            objFrame -- RFEFrame object to process
+        """
+        eType = objFrame.Type
+        if (eType == RFE_Common.eFrameType.SWEEP):
+            self.m_nTotalSpectrumDataDumps+=1
+            if (g_objReceiveLog.isEnabledFor(TRACE)):
+                g_objReceiveLog.log(TRACE, "Full dump received: %d", self.m_nTotalSpectrumDataDumps)
+            self.ProcessSweepData(objFrame.Data, objFrame.FirstByteNS, objFrame.LastByteNS)
+        elif (eType == RFE_Common.eFrameType.TEXT_LINE):
+            sNewLine = objFrame.GetString()
+            if ((len(sNewLine) > 5) and ((sNewLine[:6] == "#C2-F:") or sNewLine.startswith("#C2-f:") or (sNewLine[:4] == "#C3-") and (sNewLine[4] != 'M') or sNewLine.startswith("#C4-F:")) or sNewLine.startswith("#C5-")):
+                g_objReceiveLog.debug("Received Config:%s", sNewLine)
+
+                #Standard configuration expected
+                objNewConfiguration = RFEConfiguration(None)
+                #print("sNewLine: "+ sNewLine)
+                if (objNewConfiguration.ProcessReceivedString(sNewLine)):
+                    self.m_objCurrentConfiguration = RFEConfiguration(objNewConfiguration)
+                    self.QueueObject(objNewConfiguration)
+            else:
+                self.QueueObject(sNewLine)
+                if (g_objReceiveLog.isEnabledFor(TRACE)):
+                    g_objReceiveLog.log(TRACE, "sNewLine: %s", sNewLine)
+        elif ((eType == RFE_Common.eFrameType.CALIBRATION_DUMP) or (eType == RFE_Common.eFrameType.CALIBRATION_DATA)):
+            self.QueueObject(objFrame.GetString())
+        elif (eType == RFE_Common.eFrameType.SCREEN_DUMP):
+            #screen dump is not supported, just discard it
+            g_objReceiveLog.debug("Received $D%d", len(objFrame.Data))
+        elif (eType == RFE_Common.eFrameType.EEOT):
+            if (g_objReceiveLog.isEnabledFor(TRACE)):
+                g_objReceiveLog.log(TRACE, "EEOT detected")
+        elif (eType == RFE_Common.eFrameType.CORRUPTED):
+            g_objReceiveLog.debug("Corrupted sweep data discarded: %d bytes", len(objFrame.Data))
+        elif (eType == RFE_Common.eFrameType.OVERFLOW):
+            if (g_objReceiveLog.isEnabledFor(logging.DEBUG)):
+                g_objReceiveLog.debug("Received string truncated (%s)", objFrame.GetString())
+
+    def ProcessSweepData(self, objData, nFirstByteNS=None, nLastByteNS=None):
+        """Create a new sweep from the raw amplitude bytes received and queue it
+
+        Parameters:
+            objData      -- Bytes-like object, usually a zero-copy memoryview of the receive buffer, with one byte per data point
+            nFirstByteNS -- time.monotonic_ns() when the first byte of the sweep frame was read, None if not known
+            nLastByteNS  -- time.monotonic_ns() when the last byte of the sweep frame was read
+        """
+        if (g_objSweepLog.isEnabledFor(TRACE)):
+            g_objSweepLog.log(TRACE, "New line:\n [2453%s]", RFELazyString(lambda objData: objData.hex().upper(), objData))
+        if (self.m_objCurrentConfiguration):
+            nSweepDataPoints = self.m_objCurrentConfiguration.FreqSpectrumSteps + 1
+            objSweep = RFESweepData(self.m_objCurrentConfiguration.fStartMHZ, self.m_objCurrentConfiguration.fStepMHZ, nSweepDataPoints)
+            if (nFirstByteNS is not None):
+                objSweep.SetArrivalTime(nFirstByteNS, nLastByteNS)
+            nInputStageOffset = 0
+            #IoT module calculate this offset internally, this avoid add offset twice if is IoT (MWSUB3G), same as 2.4G+
+            if ((self.m_objRFECommunicator.InputStage != RFE_Common.eInputStage.Direct) and self.m_objRFECommunicator.IsAnalyzerEmbeddedCal() and (self.m_objRFECommunicator.IsMWSUB3G == False) and (self.m_objRFECommunicator.ActiveModel != RFE_Common.eModel.MODEL_2400_PLUS)):
+                    nInputStageOffset = int(self.m_objRFECommunicator.InputStageAttenuationDB)                                  
+            nStartNS = time.perf_counter_ns()
+            bDecoded = objSweep.ProcessReceivedBytes(objData, (self.m_objCurrentConfiguration.fOffset_dB + nInputStageOffset), self.m_objRFECommunicator.UseByteBLOB, self.m_objRFECommunicator.UseStringBLOB, self.m_objRFECommunicator.UseNumPy)
+            objStats = self.m_objRFECommunicator.PipelineStats
+            if (objStats):
+                objStats.AddDecode(time.perf_counter_ns() - nStartNS)
+            if (bDecoded):
+                if (g_objSweepLog.isEnabledFor(logging.DEBUG)):
+                    g_objSweepLog.debug("%s", RFELazyString(objSweep.Dump))
+                if (nSweepDataPoints > 5): #check this is not an incomplete scan (perhaps from a stopped SNA tracking step)
+                    #Normal spectrum analyzer sweep data
+                    self.QueueObject(objSweep)
+            elif (g_objSweepLog.isEnabledFor(logging.DEBUG)):
+                #the communicator reports the sweep it could not decode
+                self.QueueObject("$S" + bytes(objData).decode("latin_1"))
+        else:
+            g_objSweepLog.debug("Configuration not available yet. $S string ignored.")